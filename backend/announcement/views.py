@@ -1,7 +1,7 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from rest_framework.response import Response
 from .serializers import AnnouncementSerializer
 from .models import Announcement
@@ -17,7 +17,7 @@ def get_announcements(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def create_announcement(request):
 
@@ -28,7 +28,7 @@ def create_announcement(request):
     return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['PUT'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def edit_announcement(request, announcement_id):
     
@@ -44,7 +44,7 @@ def edit_announcement(request, announcement_id):
     return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['DELETE'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def delete_announcement(request, announcement_id):
 
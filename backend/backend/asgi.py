@@ -18,6 +18,7 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
 from ticket.routing import websocket_urlpatterns
+from leaderboard.routing import websocket_urlpatterns as scoreboard_websocket_urlpatterns
 from ticket.middleware import TokenAuthMiddleware
 
 application = ProtocolTypeRouter({
@@ -25,7 +26,7 @@ application = ProtocolTypeRouter({
     "websocket": AllowedHostsOriginValidator(
         TokenAuthMiddleware(
             URLRouter(
-                websocket_urlpatterns
+                websocket_urlpatterns + scoreboard_websocket_urlpatterns
             )
         )
     ),
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     'log',
     'writeup',
     'announcement',
+    'leaderboard',
 ]
 
 MIDDLEWARE = [
@@ -60,6 +61,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Closes challenge routes outside the event window (see challenge.middleware)
+    'challenge.middleware.EventPhaseMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -159,11 +162,23 @@ MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
 
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': ('knox.auth.TokenAuthentication',),
+    'DEFAULT_AUTHENTICATION_CLASSES': ('user.authentication.CachedTokenAuthentication',),
 }
 
 from datetime import timedelta
 REST_KNOX = {
     'USER_SERIALIZER': 'user.serializers.UserSerializer',
     "TOKEN_TTL": timedelta(hours=48),
-}
\ No newline at end of file
+}
+# Incorrect flag submissions are logged write-behind (see log.buffer):
+# flushed with bulk_create every SUBMISSION_LOG_FLUSH_MS or once SUBMISSION_LOG_BATCH_SIZE are waiting
+SUBMISSION_LOG_FLUSH_MS = 500
+SUBMISSION_LOG_BATCH_SIZE = 500
+# Authenticated tokens are cached per process (see user.authentication):
+# an entry lives AUTH_TOKEN_CACHE_TTL seconds at most, AUTH_TOKEN_CACHE_SIZE entries are kept. 0 disables it
+AUTH_TOKEN_CACHE_TTL = 60
+AUTH_TOKEN_CACHE_SIZE = 10000
+# Login password checks run in a process pool (see user.login), half the cores by default.
+# Past LOGIN_MAX_PENDING queued or running checks, login answers 503 with Retry-After. 0 workers checks inline
+LOGIN_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+LOGIN_MAX_PENDING = LOGIN_WORKERS * 16
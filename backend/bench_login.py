@@ -0,0 +1,58 @@
+import os
+import django
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+'''
+Login throughput benchmark: password checks per second with the configured hasher, on the
+request thread and through user.login.LoginPool with 1..N workers, plus how long a saturated
+pool takes to refuse a login. Run it from backend/: python3 bench_login.py [logins]
+'''
+
+import sys
+from django.contrib.auth.hashers import make_password
+from user.login import LoginBusy, LoginPool, verify
+
+LOGINS = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+PASSWORD = 'Password123#!@'
+ENCODED = make_password(PASSWORD)
+CORES = os.cpu_count() or 1
+
+def run(check, threads):
+    """Logins per second for LOGINS checks issued from the given number of request threads."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as requests:
+        results = list(requests.map(lambda _: check(PASSWORD, ENCODED), range(LOGINS)))
+    assert all(valid for valid, must_update in results)
+    return LOGINS / (time.perf_counter() - start)
+
+print(f"{ENCODED.split('$')[0]}, {LOGINS} logins, {CORES} core(s)")
+
+rate = run(verify, 8)
+print(f"inline (8 request threads): {rate:7.2f} logins/s")
+
+for workers in sorted({1, max(1, CORES // 2), CORES}):
+    pool = LoginPool(workers=workers, max_pending=LOGINS)
+    pool.verify(PASSWORD, ENCODED)  # start the workers outside the measurement
+    rate = run(pool.verify, 8)
+    print(f"pool, {workers} worker(s):      {rate:7.2f} logins/s, {rate / workers:6.2f} per core")
+    pool.shutdown()
+
+# A full pool answers right away instead of queueing
+pool = LoginPool(workers=1, max_pending=1)
+pool.verify(PASSWORD, ENCODED)
+worker = threading.Thread(target=pool.verify, args=(PASSWORD, ENCODED))
+worker.start()
+while pool.pending == 0:
+    time.sleep(0.001)
+start = time.perf_counter()
+try:
+    pool.verify(PASSWORD, ENCODED)
+except LoginBusy as e:
+    print(f"saturated pool refused in {(time.perf_counter() - start) * 1000:.3f} ms, Retry-After {e.retry_after}s")
+worker.join()
+pool.shutdown()
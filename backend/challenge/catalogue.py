@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import CatalogueVersion, Challenge, ChallengeSolve
+
+'''
+Cached challenge catalogue.
+
+Challenge metadata only changes when admins edit challenges, categories or attachments
+(or when dynamic scoring moves a challenge's point), so the serialized rows are kept per
+CatalogueVersion and per role: players never see flags, admins get the full detail.
+Every such change bumps the version, readers fetch it (one tiny query) and reuse the rows
+cached for it. Per-team solve state is overlaid on the cached rows at request time.
+'''
+
+CATALOGUE_KEY = 'challenge:catalogue:{variant}:{version}'
+CATALOGUE_TIMEOUT = 60 * 60
+
+def current_version():
+    version = CatalogueVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+    return version or 0
+
+def invalidate_catalogue():
+    """Bump the catalogue version. Call inside the transaction that changed the challenges."""
+    updated = CatalogueVersion.objects.filter(pk=1).update(version=F('version') + 1, updated_at=timezone.now())
+    if not updated:
+        CatalogueVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+def build_catalogue(admin):
+    from .serializers import AdminChallengeDetailSerializer, ChallengeCatalogueSerializer
+    
+    challenges = Challenge.objects.select_related('category').prefetch_related('attachments', 'flags').order_by('id')
+    serializer_class = AdminChallengeDetailSerializer if admin else ChallengeCatalogueSerializer
+    return [dict(row) for row in serializer_class(challenges, many=True).data]
+
+def get_catalogue(admin=False):
+    """Serialized challenge rows for players (admin=False) or admins, rebuilt only after a change."""
+    # Read the version before the rows so a concurrent edit can only make them newer than their key
+    key = CATALOGUE_KEY.format(variant='admin' if admin else 'player', version=current_version())
+    rows = cache.get(key)
+    if rows is None:
+        rows = build_catalogue(admin)
+        cache.set(key, rows, CATALOGUE_TIMEOUT)
+    return rows
+
+def board_rows(user, frozen=None):
+    """
+    The catalogue for the user's role with solve_count and whether the user's team, or the user
+    when teamless, solved each challenge. With the frozen scoreboard (leaderboard.freeze), counts
+    stop at freeze_time and points are the values at freeze_time.
+    """
+    from leaderboard.freeze import frozen_challenge_points
+    
+    solves = ChallengeSolve.objects.all()
+    if frozen is not None:
+        solves = solves.filter(solved_at__lte=frozen.freeze_time)
+    counts = dict(solves.order_by().values('challenge').annotate(count=Count('id')).values_list('challenge', 'count'))
+    
+    own_solves = ChallengeSolve.objects.filter(user__team=user.team_id) if user.team_id else ChallengeSolve.objects.filter(user=user)
+    solved = set(own_solves.values_list('challenge_id', flat=True))
+    
+    rows = get_catalogue(admin=user.role == 'admin')
+    points = frozen_challenge_points(frozen, [row['id'] for row in rows]) if frozen is not None else {}
+    return [
+        {**row, 'point': points.get(row['id'], row['point']), 'solve_count': counts.get(row['id'], 0), 'solved': row['id'] in solved}
+        for row in rows
+    ]
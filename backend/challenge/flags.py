@@ -0,0 +1,60 @@
+import hmac
+import re
+import time
+
+from .models import Challenge, ChallengeFlag
+
+'''
+Flag matching.
+
+A challenge accepts Challenge.flag exactly as typed plus any ChallengeFlag rows, which are
+static, case-insensitive or regex (matched against the whole submission). Matchers are compiled
+once per process and kept per challenge with the flag_version they were built from, so a
+submission only reads that version and never re-parses patterns.
+'''
+
+# challenge id -> (flag_version, FlagMatcher)
+_matchers = {}
+
+def compile_regex(pattern):
+    """Compiled flag pattern, ValueError when it is not a valid regex."""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regex flag: {e}")
+
+class FlagMatcher:
+    def __init__(self, flags):
+        """flags: (content, type) pairs as stored in ChallengeFlag."""
+        self.static = [content.encode() for content, type in flags if type == 'static']
+        self.case_insensitive = [content.casefold().encode() for content, type in flags if type == 'case_insensitive']
+        self.patterns = [compile_regex(content) for content, type in flags if type == 'regex']
+
+    def match(self, submitted):
+        submitted_bytes = submitted.encode()
+        folded = submitted.casefold().encode()
+        # Compare against every static flag so the timing does not tell which one came close
+        matched = False
+        for flag in self.static:
+            matched |= hmac.compare_digest(submitted_bytes, flag)
+        for flag in self.case_insensitive:
+            matched |= hmac.compare_digest(folded, flag)
+        return matched or any(pattern.fullmatch(submitted) for pattern in self.patterns)
+
+def build_matcher(challenge_id):
+    flag = Challenge.objects.values_list('flag', flat=True).get(pk=challenge_id)
+    extra = ChallengeFlag.objects.filter(challenge_id=challenge_id).values_list('content', 'type')
+    return FlagMatcher([(flag, 'static'), *extra])
+
+def get_matcher(challenge_id, flag_version):
+    entry = _matchers.get(challenge_id)
+    if entry is None or entry[0] != flag_version:
+        entry = _matchers[challenge_id] = (flag_version, build_matcher(challenge_id))
+    return entry[1]
+
+def check_flag(challenge, submitted):
+    """True when `submitted` is accepted for the challenge, which only needs id and flag_version loaded."""
+    return get_matcher(challenge.pk, challenge.flag_version).match(submitted)
+
+def flags_changed(challenge_id):
+    Challenge.objects.filter(pk=challenge_id).update(flag_version=time.time_ns())
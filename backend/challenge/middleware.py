@@ -0,0 +1,54 @@
+from django.http import JsonResponse
+from user.authentication import CachedTokenAuthentication
+from rest_framework import exceptions
+
+from .phase import current_phase, PRE_START, FINISHED
+
+'''
+Gates route groups by event phase before the view runs, so before DRF authentication
+and any query. Only a blocked request that carries a token is authenticated, to let
+admins through as the views used to.
+'''
+
+NOT_STARTED = "CTF NOT STARTED YET."
+ENDED = "CTF FINISHED."
+
+# Phases a route group is closed in, with the error returned
+CHALLENGE_READS = {PRE_START: NOT_STARTED}
+SUBMISSIONS = {PRE_START: NOT_STARTED, FINISHED: ENDED}
+
+# URL name -> gate
+PHASE_GATES = {
+    'get_categories': CHALLENGE_READS,
+    'get_challenges_by_category': CHALLENGE_READS,
+    'get_all_challenges': CHALLENGE_READS,
+    'get_challenge_detail': CHALLENGE_READS,
+    'get_challenge_solvers': CHALLENGE_READS,
+    'submit_flag': SUBMISSIONS,
+}
+
+def is_admin(request):
+    if not request.headers.get('Authorization'):
+        return False
+    try:
+        authenticated = CachedTokenAuthentication().authenticate(request)
+    except exceptions.AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].role == 'admin'
+
+class EventPhaseMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        gate = PHASE_GATES.get(request.resolver_match.url_name)
+        if gate is None:
+            return None
+        error = gate.get(current_phase())
+        if error is None or is_admin(request):
+            return None
+        # Same body and status the views used to answer with
+        return JsonResponse({"error": error}, status=200)
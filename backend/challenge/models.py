@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils import timezone
+import time
 
 class Category(models.Model):
     name = models.CharField(max_length=30, unique=True)
@@ -15,15 +16,36 @@ class Challenge(models.Model):
     difficulty = models.IntegerField()
     description = models.CharField(max_length=2000)
     point = models.IntegerField(default=501)
+    # Value before any decay; `point` is the current value (see challenge.scoring)
+    initial_point = models.IntegerField(null=True, blank=True)
     author = models.ForeignKey('user.User', on_delete=models.CASCADE, related_name="challenge")
     solved_by = models.ManyToManyField('user.User', through='ChallengeSolve', related_name="solved_challenges")
     rating = models.FloatField(default=0.0)
+    # Last change to the detail view's content: fields, reviews, attachments, deleted solves
+    updated_at = models.DateTimeField(auto_now=True)
+    # Last new solve and the point decay it caused, kept apart so the frozen detail ignores it
+    solves_changed_at = models.DateTimeField(null=True, blank=True)
+    # Changes whenever the accepted flags may have changed, keys the compiled matchers (see challenge.flags)
+    flag_version = models.BigIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        if self.initial_point is None:
+            self.initial_point = self.point
+        self.flag_version = time.time_ns()
+        super().save(*args, **kwargs)
 
     def update_average_rating(self):
         avg = self.reviews.aggregate(avg_rating=models.Avg('rating'))['avg_rating']
         self.rating = avg if avg is not None else 0.0
         self.save()
     
+    def touch(self, field='updated_at'):
+        """Mark the challenge as changed (field: updated_at or solves_changed_at) without saving its other fields."""
+        now = timezone.now()
+        setattr(self, field, now)
+        Challenge.objects.filter(pk=self.pk).update(**{field: now})
+
+
     def solve_count(self):
         return self.solved_by.count()
 
@@ -50,10 +72,41 @@ class ChallengeSolve(models.Model):
 
     class Meta:
         unique_together = ('user', 'challenge')
+        # Solver lists page through one challenge's solves in solve order
+        indexes = [models.Index(fields=['challenge', 'solved_at'], name='challengesolve_solvers_idx')]
     
     def __str__(self):
         return f"{self.user.username} solved {self.challenge.title} at {self.solved_at}"
 
+class TeamSolve(models.Model):
+    """
+    The first solve of a challenge by a team, derived from ChallengeSolve of its current members.
+    UNIQUE(team, challenge) lets concurrent submissions of teammates race safely: one insert wins.
+    """
+    team = models.ForeignKey('team.Team', on_delete=models.CASCADE, related_name="team_solves")
+    challenge = models.ForeignKey('Challenge', on_delete=models.CASCADE, related_name="team_solves")
+    user = models.ForeignKey('user.User', on_delete=models.CASCADE, related_name="team_solves")
+    solved_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'challenge'], name='teamsolve_team_challenge_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.team} solved {self.challenge.title} at {self.solved_at}"
+
+class ChallengeFlag(models.Model):
+    """An additional accepted flag, on top of Challenge.flag which is always accepted as typed."""
+    TYPE_CHOICES = [('static', 'Static'), ('case_insensitive', 'Case-insensitive'), ('regex', 'Regex')]
+    
+    challenge = models.ForeignKey('Challenge', on_delete=models.CASCADE, related_name="flags")
+    content = models.CharField(max_length=500)
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='static')
+
+    def __str__(self):
+        return f"{self.challenge.title} - {self.type} flag"
+
 class ChallengeAttachment(models.Model):
     challenge = models.ForeignKey('Challenge', on_delete=models.CASCADE, related_name="attachments")
     file = models.FileField(upload_to='challenge_attachments/')
@@ -61,3 +114,13 @@ class ChallengeAttachment(models.Model):
 
     def __str__(self):
         return f"{self.challenge.title} - {self.name}"
+
+class CatalogueVersion(models.Model):
+    """
+    Single row holding a counter bumped whenever challenge metadata changes (see challenge.catalogue).
+    """
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Catalogue v{self.version}"
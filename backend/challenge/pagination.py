@@ -0,0 +1,44 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import ChallengeSolve
+
+'''
+Keyset pagination over a challenge's solves in solve order (solved_at ASC, id ASC).
+A cursor is the (solved_at, id) key of the last solve already sent.
+'''
+
+def encode_cursor(solve):
+    payload = [solve.solved_at.isoformat(), solve.id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor):
+    """(solved_at, id) from a cursor, ValueError when it is malformed."""
+    try:
+        solved_at, solve_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        solved_at = parse_datetime(solved_at)
+        if solved_at is None:
+            raise ValueError
+        return solved_at, int(solve_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.")
+
+def solvers_page(challenge, cursor_key, limit, until=None):
+    """
+    One page of the challenge's solves with their users, and the cursor of the next page (None on the last one).
+    `until` hides solves made after it (the scoreboard freeze).
+    """
+    solves = ChallengeSolve.objects.filter(challenge=challenge).select_related('user__team')
+    if until is not None:
+        solves = solves.filter(solved_at__lte=until)
+    if cursor_key is not None:
+        solved_at, solve_id = cursor_key
+        solves = solves.filter(Q(solved_at__gt=solved_at) | Q(solved_at=solved_at, id__gt=solve_id))
+    
+    # One extra row tells whether another page follows
+    solves = list(solves.order_by('solved_at', 'id')[:limit + 1])
+    next_cursor = encode_cursor(solves[limit - 1]) if len(solves) > limit else None
+    return solves[:limit], next_cursor
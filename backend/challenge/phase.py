@@ -0,0 +1,55 @@
+import time
+
+from utils import get_config
+
+'''
+Event phases: pre_start -> running -> frozen (when a freeze_time is set) -> finished.
+Route gates (challenge.middleware) close on pre_start and finished only: frozen is the scoreboard
+freeze, which leaderboard.freeze applies, and is open like running.
+
+The boundaries are turned into a list of transition timestamps once per config.yml version,
+so telling the current phase is a comparison against the next transition.
+config.yml itself is looked at again at most every CONFIG_RECHECK seconds.
+'''
+
+PRE_START = 'pre_start'
+RUNNING = 'running'
+FROZEN = 'frozen'
+FINISHED = 'finished'
+
+CONFIG_RECHECK = 1.0
+
+def transitions(config):
+    """[(timestamp, phase entered at that timestamp), ...] in time order."""
+    steps = [(config.start_time.timestamp(), RUNNING)]
+    if config.freeze_time is not None and config.start_time <= config.freeze_time <= config.end_time:
+        steps.append((config.freeze_time.timestamp(), FROZEN))
+    # finished is strictly after end_time, like check_if_ctf_is_finished
+    steps.append((config.end_time.timestamp() + 1e-6, FINISHED))
+    return steps
+
+class PhaseClock:
+    def __init__(self):
+        self.config = None
+        self.steps = []
+        self.checked_at = float('-inf')
+
+    def phase(self, now=None):
+        now = time.time() if now is None else now
+        if now - self.checked_at >= CONFIG_RECHECK:
+            config = get_config()
+            if config is not self.config:
+                self.config, self.steps = config, transitions(config)
+            self.checked_at = now
+        
+        phase = PRE_START
+        for timestamp, entered in self.steps:
+            if now < timestamp:
+                break
+            phase = entered
+        return phase
+
+clock = PhaseClock()
+
+def current_phase():
+    return clock.phase()
@@ -0,0 +1,147 @@
+import math
+import threading
+import time
+
+from utils import RATE_LIMIT_BUCKETS, get_rate_limit_config
+
+'''
+Token-bucket rate limiting of flag submissions.
+
+Every submission takes one token from each of its buckets: the user's, the team's, and the
+team's bucket for that challenge. A bucket holds up to `burst` tokens and regains `per_minute`
+of them per minute. A submission is only let through when all its buckets have a token, and
+then takes from all of them at once, so a rejected attempt costs nothing.
+
+Limits come from the `rate_limit` section of config.yml, validated when it is loaded
+(utils.validate_rate_limit). The memory backend keeps buckets per
+process (single worker deployments), the redis backend shares them between every worker.
+Buckets are keyed with ids already on request.user, so a rejection needs no database query.
+'''
+
+DEFAULT_MESSAGE = "Too many submissions, try again later."
+
+class MemoryBackend:
+    # Drop buckets that have refilled completely once there are this many
+    PRUNE_THRESHOLD = 10000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (tokens, updated, full_at)
+        self.buckets = {}
+
+    def consume(self, limits, now=None):
+        """
+        limits: (key, burst, per_second) triples. Takes one token from every bucket and returns 0,
+        or takes nothing and returns the seconds until all of them have a token again.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            levels = []
+            wait = 0
+            for key, burst, per_second in limits:
+                tokens, updated, full_at = self.buckets.get(key, (burst, now, now))
+                tokens = min(burst, tokens + (now - updated) * per_second)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / per_second)
+            if wait:
+                return wait
+            
+            for tokens, (key, burst, per_second) in zip(levels, limits):
+                tokens -= 1
+                self.buckets[key] = (tokens, now, now + (burst - tokens) / per_second)
+            if len(self.buckets) > self.PRUNE_THRESHOLD:
+                # A full bucket is the same as no bucket
+                self.buckets = {key: bucket for key, bucket in self.buckets.items() if bucket[2] > now}
+            return 0
+
+# Same algorithm as MemoryBackend.consume, atomic inside Redis.
+# KEYS: bucket keys; ARGV: now, then burst and per_second for each key.
+CONSUME_SCRIPT = '''
+local now = tonumber(ARGV[1])
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local burst = tonumber(ARGV[i * 2])
+    local per_second = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or burst
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * per_second)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / per_second)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    local burst = tonumber(ARGV[i * 2])
+    local per_second = tonumber(ARGV[i * 2 + 1])
+    redis.call('HSET', key, 'tokens', levels[i] - 1, 'updated', now)
+    redis.call('EXPIRE', key, math.ceil(burst / per_second) + 1)
+end
+return '0'
+'''
+
+class RedisBackend:
+    KEY_PREFIX = 'ratelimit:'
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(CONSUME_SCRIPT)
+
+    def consume(self, limits, now=None):
+        now = time.time() if now is None else now
+        keys = [self.KEY_PREFIX + key for key, burst, per_second in limits]
+        args = [now]
+        for key, burst, per_second in limits:
+            args += [burst, per_second]
+        return float(self.script(keys=keys, args=args))
+
+# (backend name, redis url) -> backend, buckets must outlive a single request
+_backends = {}
+
+def get_backend(config):
+    name = config.get('backend', 'memory')
+    url = config.get('redis_url') if name == 'redis' else None
+    backend = _backends.get((name, url))
+    if backend is None:
+        if name == 'memory':
+            backend = MemoryBackend()
+        elif name == 'redis':
+            backend = RedisBackend(url)
+        else:
+            raise ValueError(f"Unknown rate limit backend '{name}'.")
+        _backends[(name, url)] = backend
+    return backend
+
+def submission_limits(config, user_id, team_id, challenge_id):
+    keys = {
+        'user': f'submit:user:{user_id}',
+        'team': f'submit:team:{team_id}',
+        'challenge': f'submit:team:{team_id}:challenge:{challenge_id}',
+    }
+    limits = []
+    for bucket in RATE_LIMIT_BUCKETS:
+        limit = (config.get('submit') or {}).get(bucket)
+        if not limit or (bucket != 'user' and team_id is None):
+            continue
+        limits.append((keys[bucket], float(limit['burst']), float(limit['per_minute']) / 60))
+    return limits
+
+def check_submission_rate(user, challenge_id):
+    """
+    None when the submission may go on, otherwise (message, retry_after_seconds) for the 429.
+    Reads only user.id and user.team_id, which the authenticated user already carries.
+    """
+    config = get_rate_limit_config()
+    limits = submission_limits(config, user.id, user.team_id, challenge_id)
+    if not limits:
+        return None
+    wait = get_backend(config).consume(limits)
+    if not wait:
+        return None
+    return config.get('message', DEFAULT_MESSAGE), math.ceil(wait)
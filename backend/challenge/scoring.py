@@ -0,0 +1,110 @@
+import math
+
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
+
+from utils import get_scoring_config
+from .models import Challenge, ChallengeSolve
+from .catalogue import invalidate_catalogue
+
+'''
+Challenge value functions, selected with `scoring.function` in config.yml.
+
+Every function gets the challenge's initial value, the configured minimum and decay,
+and the number of solves beyond the first one (the first solver always gets the full value).
+'''
+
+def static(initial, minimum, decay, solves):
+    return initial
+
+def linear(initial, minimum, decay, solves):
+    return max(minimum, initial - decay * solves)
+
+def logarithmic(initial, minimum, decay, solves):
+    # Reaches `minimum` after `decay` extra solves, dropping fastest for the first ones
+    if decay <= 0 or solves >= decay:
+        return minimum
+    value = initial - (initial - minimum) * math.log1p(solves) / math.log1p(decay)
+    return max(minimum, math.ceil(value))
+
+SCORING_FUNCTIONS = {
+    'static': static,
+    'linear': linear,
+    'logarithmic': logarithmic,
+}
+
+def get_scoring_function(config=None):
+    config = get_scoring_config() if config is None else config
+    name = config.get('function', 'static')
+    if name not in SCORING_FUNCTIONS:
+        raise ValueError(f"Unknown scoring function '{name}', expected one of {', '.join(SCORING_FUNCTIONS)}.")
+    return SCORING_FUNCTIONS[name]
+
+def challenge_value(initial, solve_count, config=None):
+    config = get_scoring_config() if config is None else config
+    function = get_scoring_function(config)
+    minimum = min(int(config.get('minimum_point', 0)), initial)
+    decay = int(config.get('decay', 0))
+    return function(initial, minimum, decay, max(solve_count - 1, 0))
+
+def solve_value(points=None):
+    """
+    Expression for the value of a ChallengeSolve's challenge: its current point, or the value
+    given by `points` ({challenge id: value}, e.g. the frozen scoreboard's) where there is one.
+    """
+    if not points:
+        return F('challenge__point')
+    by_value = {}
+    for challenge_id, point in points.items():
+        by_value.setdefault(point, []).append(challenge_id)
+    return Case(*[When(challenge__in=ids, then=Value(point)) for point, ids in by_value.items()], default=F('challenge__point'))
+
+def initial_value(challenge):
+    # Challenges created before initial_point existed start from their current value
+    return challenge.point if challenge.initial_point is None else challenge.initial_point
+
+def refresh_challenge_value(challenge, credited_point=None, config=None, timestamp=None):
+    """
+    Re-evaluate the challenge's value from its solve count and push the difference
+    to every team that holds a solve of it, with one set-based UPDATE.
+    
+    credited_point is what the teams' totals currently count for this challenge
+    (defaults to challenge.point). Call inside the transaction that changed the solves,
+    with the challenge row locked, so concurrent solves apply their deltas in turn.
+    The new totals go to the timeline at `timestamp` (default now).
+    Returns True when team totals were touched.
+    """
+    from leaderboard.scoring import apply_point_change
+    
+    config = get_scoring_config() if config is None else config
+    credited_point = challenge.point if credited_point is None else credited_point
+    
+    if get_scoring_function(config) is static:
+        new_point = initial_value(challenge)
+    else:
+        solve_count = ChallengeSolve.objects.filter(challenge=challenge).count()
+        new_point = challenge_value(initial_value(challenge), solve_count, config)
+    
+    if new_point != challenge.point:
+        challenge.point, challenge.solves_changed_at = new_point, timezone.now()
+        Challenge.objects.filter(pk=challenge.pk).update(point=new_point, solves_changed_at=challenge.solves_changed_at)
+        invalidate_catalogue()
+    
+    if new_point == credited_point:
+        return False
+    apply_point_change(challenge, new_point - credited_point, timestamp)
+    return True
+
+def refresh_all_challenge_values(config=None):
+    """Bring every challenge's `point` in line with the scoring config. Team totals are not touched."""
+    config = get_scoring_config() if config is None else config
+    changed = []
+    for challenge in Challenge.objects.annotate(solve_count=Count('challengesolve')).only('id', 'point', 'initial_point'):
+        new_point = challenge_value(initial_value(challenge), challenge.solve_count, config)
+        if new_point != challenge.point:
+            challenge.point, challenge.updated_at = new_point, timezone.now()
+            changed.append(challenge)
+    Challenge.objects.bulk_update(changed, ['point', 'updated_at'])
+    if changed:
+        invalidate_catalogue()
+    return len(changed)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
-from .models import Category, Challenge, ChallengeSolve, ChallengeAttachment, ChallengeReview
-from user.serializers import UserListSerializer
+from django.db.models import Count, Prefetch, Q, Value
+from .models import Category, Challenge, ChallengeSolve, ChallengeAttachment, ChallengeReview, ChallengeFlag
+from .flags import compile_regex, flags_changed
+from .scoring import initial_value
+from user.models import User
 
 
 class ChallengeReviewSerializer(serializers.ModelSerializer):
@@ -17,6 +20,20 @@ class ChallengeReviewSerializer(serializers.ModelSerializer):
         return value
 
 
+def categories_with_counts(user):
+    """
+    Categories annotated with total_chall and total_solved_by_team (solves by the user's team,
+    0 when teamless) in one grouped query.
+    """
+    categories = Category.objects.annotate(total_chall=Count('challenge', distinct=True))
+    if not user.team_id:
+        return categories.annotate(total_solved_by_team=Value(0))
+    return categories.annotate(total_solved_by_team=Count(
+        'challenge__challengesolve',
+        filter=Q(challenge__challengesolve__user__team=user.team_id),
+        distinct=True,
+    ))
+
 class CategorySerializer(serializers.ModelSerializer):
     total_chall = serializers.SerializerMethodField()
     total_solved_by_team = serializers.SerializerMethodField()
@@ -25,6 +42,10 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['name', 'total_chall', 'total_solved_by_team', 'id']
     
     def get_total_solved_by_team(self, instance):
+        # Querysets built with categories_with_counts() already carry it
+        if hasattr(instance, 'total_solved_by_team'):
+            return instance.total_solved_by_team
+        
         request = self.context.get('request')
         if not request or not hasattr(request.user, 'team'):
             return 0
@@ -34,9 +55,11 @@ class CategorySerializer(serializers.ModelSerializer):
         if not team:
             return 0
         
-        return ChallengeSolve.objects.filter(challenge__category=instance, user__in=team.members.all()).count()
+        return ChallengeSolve.objects.filter(challenge__category=instance, user__team=team).count()
     
     def get_total_chall(self, instance):
+        if hasattr(instance, 'total_chall'):
+            return instance.total_chall
         return Challenge.objects.filter(category=instance).count()
 
 
@@ -46,15 +69,89 @@ class ChallengeAttachmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'file']
 
 
-class ChallengeListSerializer(serializers.ModelSerializer):
+def prefetch_challenge_relations(queryset, frozen=None):
+    """
+    Load everything the challenge serializers nest in a fixed number of queries:
+    solvers, attachments, and reviews with their authors.
+    With the frozen scoreboard (leaderboard.freeze), solvers are those of the solves made by
+    freeze_time.
+    """
+    solvers = User.objects.only('id', 'username')
+    if frozen is None:
+        solved_by = Prefetch('solved_by', queryset=solvers)
+    else:
+        # solved_by cannot be filtered on its own join with ChallengeSolve, go through the solves
+        solves = ChallengeSolve.objects.filter(solved_at__lte=frozen.freeze_time).order_by('solved_at', 'id')
+        solved_by = Prefetch('challengesolve_set', queryset=solves.prefetch_related(Prefetch('user', queryset=solvers)), to_attr='frozen_solves')
+    return queryset.select_related('category').prefetch_related(
+        solved_by,
+        'attachments',
+        'flags',
+        Prefetch('reviews', queryset=ChallengeReview.objects.select_related('user')),
+    )
+
+def visible_solvers(challenge):
+    """Solvers loaded by prefetch_challenge_relations: up to the freeze when it was given one."""
+    frozen_solves = getattr(challenge, 'frozen_solves', None)
+    if frozen_solves is None:
+        return challenge.solved_by.all()
+    return [solve.user for solve in frozen_solves]
+
+class SolverSerializer(serializers.ModelSerializer):
+    """
+    A solver nested in a challenge. No total_point: it moves with every solve anywhere, and the
+    challenge's ETag would have to follow the whole scoreboard.
+    """
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
+class FrozenPointMixin:
+    """With context['frozen'] (leaderboard.freeze), `point` is the challenge's value at freeze_time."""
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        frozen = self.context.get('frozen')
+        if frozen is not None:
+            data['point'] = frozen.point(instance.id, initial_value(instance))
+        return data
+
+class ChallengeListSerializer(FrozenPointMixin, serializers.ModelSerializer):
     category = serializers.StringRelatedField()
-    solved_by = UserListSerializer(many=True)
+    solved_by = serializers.SerializerMethodField()
     attachments = ChallengeAttachmentSerializer(many=True, read_only=True)
     reviews = ChallengeReviewSerializer(many=True, read_only=True)
     class Meta:
         model = Challenge
         fields = ['id', 'title', 'category', 'difficulty', 'point', 'rating', 'solved_by', 'description', 'attachments', 'reviews']
+    
+    def get_solved_by(self, instance):
+        return SolverSerializer(visible_solvers(instance), many=True).data
+
 
+class ChallengeAttachmentStubSerializer(serializers.ModelSerializer):
+    url = serializers.FileField(source='file', read_only=True)
+    class Meta:
+        model = ChallengeAttachment
+        fields = ['id', 'name', 'url']
+
+class ChallengeCatalogueSerializer(serializers.ModelSerializer):
+    """
+    Static part of a challenge board row, cached by challenge.catalogue.
+    Solve counts and the solved flag are overlaid per request.
+    """
+    category = serializers.StringRelatedField()
+    attachments = ChallengeAttachmentStubSerializer(many=True, read_only=True)
+    class Meta:
+        model = Challenge
+        fields = ['id', 'title', 'category', 'difficulty', 'point', 'rating', 'description', 'attachments']
+
+class ChallengeSolverSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='user.id', read_only=True)
+    username = serializers.CharField(source='user.username', read_only=True)
+    team = serializers.CharField(source='user.team.name', default=None, read_only=True)
+    class Meta:
+        model = ChallengeSolve
+        fields = ['id', 'username', 'team', 'solved_at']
 
 class ChallengeSolveSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
@@ -71,26 +168,62 @@ class ChallengeSolveSerializer(serializers.ModelSerializer):
             'category': instance.challenge.category.name
         }
 
-class ChallengeSerializer(serializers.ModelSerializer):
-    solved_by = UserListSerializer(many=True, read_only=True)
+class ChallengeSerializer(FrozenPointMixin, serializers.ModelSerializer):
+    solved_by = serializers.SerializerMethodField()
     reviews = ChallengeReviewSerializer(many=True, read_only=True)
     class Meta:
         model = Challenge
-        exclude = ['flag']
+        exclude = ['flag', 'flag_version']
+    
+    def get_solved_by(self, instance):
+        return SolverSerializer(visible_solvers(instance), many=True).data
+
 
+class ChallengeFlagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChallengeFlag
+        fields = ['id', 'content', 'type']
+    
+    def validate(self, attrs):
+        if attrs.get('type') == 'regex':
+            try:
+                compile_regex(attrs['content'])
+            except ValueError as e:
+                raise serializers.ValidationError({"content": str(e)})
+        return attrs
 
 class CreateChallengeSerializer(serializers.ModelSerializer):
     attachments = ChallengeAttachmentSerializer(many=True, required=False)
+    # Extra accepted flags, replaced as a whole when sent
+    flags = ChallengeFlagSerializer(many=True, required=False)
     class Meta:
         model = Challenge
-        exclude = ['rating', 'solved_by']
+        exclude = ['rating', 'solved_by', 'flag_version']
         read_only_fields = ['author']
     
     def create(self, validated_data):
         user = self.context.get('request').user
         validated_data['author'] = user
+        flags = validated_data.pop('flags', [])
         challenge = Challenge.objects.create(**validated_data)
+        ChallengeFlag.objects.bulk_create(ChallengeFlag(challenge=challenge, **flag) for flag in flags)
         return challenge
+    
+    def update(self, instance, validated_data):
+        # Setting a different point means setting a new initial value,
+        # resubmitting the current (possibly decayed) one must not reset it
+        point = validated_data.get('point')
+        if point is not None and point != instance.point and 'initial_point' not in validated_data:
+            validated_data['initial_point'] = point
+        
+        flags = validated_data.pop('flags', None)
+        instance = super().update(instance, validated_data)
+        if flags is not None:
+            instance.flags.all().delete()
+            ChallengeFlag.objects.bulk_create(ChallengeFlag(challenge=instance, **flag) for flag in flags)
+            # bulk_create sends no signals
+            flags_changed(instance.pk)
+        return instance
 
 class CategoryDetailSerializer(serializers.ModelSerializer):
     challenges = ChallengeSerializer(source='challenge', many=True, read_only=True)
@@ -101,8 +234,9 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
 
 class AdminChallengeDetailSerializer(serializers.ModelSerializer):
     attachments = ChallengeAttachmentSerializer(many=True, read_only=True)
+    flags = ChallengeFlagSerializer(many=True, read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     
     class Meta:
         model = Challenge
-        fields = ['id', 'title', 'category', 'category_name', 'difficulty', 'point', 'description', 'flag', 'attachments']
+        fields = ['id', 'title', 'category', 'category_name', 'difficulty', 'point', 'initial_point', 'description', 'flag', 'flags', 'attachments']
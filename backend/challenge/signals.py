@@ -0,0 +1,37 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Category, Challenge, ChallengeAttachment, ChallengeFlag, ChallengeReview, ChallengeSolve
+from .flags import flags_changed
+from .catalogue import invalidate_catalogue
+
+# Anything shown in the cached catalogue: challenge fields, category names, attachment stubs.
+# Point changes made with queryset updates (dynamic scoring) invalidate it in challenge.scoring.
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=ChallengeAttachment)
+@receiver(post_delete, sender=ChallengeAttachment)
+def catalogue_changed(sender, instance, **kwargs):
+    invalidate_catalogue()
+
+# The detail view's ETag follows Challenge.updated_at, which must move with its nested lists too.
+# New solves move solves_changed_at instead: the frozen detail must not change with them.
+# A deleted solve may be one from before the freeze, it counts as content.
+@receiver(post_save, sender=ChallengeSolve)
+def challenge_solved(sender, instance, **kwargs):
+    Challenge(pk=instance.challenge_id).touch('solves_changed_at')
+
+@receiver(post_delete, sender=ChallengeSolve)
+@receiver(post_save, sender=ChallengeReview)
+@receiver(post_delete, sender=ChallengeReview)
+@receiver(post_save, sender=ChallengeAttachment)
+@receiver(post_delete, sender=ChallengeAttachment)
+def challenge_detail_changed(sender, instance, **kwargs):
+    Challenge(pk=instance.challenge_id).touch()
+
+@receiver(post_save, sender=ChallengeFlag)
+@receiver(post_delete, sender=ChallengeFlag)
+def challenge_flags_changed(sender, instance, **kwargs):
+    flags_changed(instance.challenge_id)
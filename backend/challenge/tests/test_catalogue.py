@@ -0,0 +1,37 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.core.cache import cache
+from django.urls import reverse
+from unittest import mock
+from challenge import catalogue
+
+class ChallengeCatalogueTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.admin_token = self.login(self.admin)
+    
+    def get_board(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        res = self.client.get(reverse('get_all_challenges'), {'view': 'board'})
+        self.assertEqual(res.status_code, 200)
+        return {row['title']: row for row in res.json()}
+    
+    def test_catalogue_is_built_once_per_version(self):
+        with mock.patch('challenge.catalogue.build_catalogue', wraps=catalogue.build_catalogue) as build:
+            self.get_board(self.user1_token)
+            self.submit(self.user2_token, self.chall1, 'flag{one}')
+            board = self.get_board(self.user1_token)
+        self.assertEqual(build.call_count, 1)
+        # solve state is overlaid, not cached
+        self.assertEqual(board['chall1']['solve_count'], 1)
+    
+    def test_admin_edit_invalidates_catalogue(self):
+        self.get_board(self.user1_token)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token)
+        res = self.client.put(reverse('edit_challenge', kwargs={'challenge_id': self.chall1.id}), {'title': 'renamed'}, format='json')
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('renamed', self.get_board(self.user1_token))
+    
+    def test_players_and_admins_get_separate_variants(self):
+        self.assertNotIn('flag', self.get_board(self.user1_token)['chall1'])
+        self.assertEqual(self.get_board(self.admin_token)['chall1']['flag'], 'flag{one}')
@@ -0,0 +1,28 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.urls import reverse
+from challenge.models import Category, Challenge
+
+class CategoryCountsTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.crypto = Category.objects.create(name='crypto')
+        Challenge.objects.create(title='chall3', category=self.crypto, flag='flag{three}', difficulty=1, description='three', point=250, author=self.admin)
+    
+    def get_categories(self, token):
+        self.authenticate(token)
+        with self.assertNumQueries(1):
+            # annotated categories
+            res = self.client.get(reverse('get_categories'))
+        return {row['name']: (row['total_chall'], row['total_solved_by_team']) for row in res.json()}
+    
+    def test_counts_come_from_one_query(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        
+        self.assertEqual(self.get_categories(self.user1_token), {'web': (2, 2), 'crypto': (1, 0)})
+        self.assertEqual(self.get_categories(self.user2_token), {'web': (2, 1), 'crypto': (1, 0)})
+    
+    def test_teamless_user_has_no_team_solves(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.assertEqual(self.get_categories(self.user3_token), {'web': (2, 0), 'crypto': (1, 0)})
@@ -0,0 +1,72 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from user.models import User
+from team.models import Team
+
+class ChallengeBoardTest(TestSetUp):
+    def get_board(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        res = self.client.get(reverse('get_all_challenges'), {'view': 'board'})
+        self.assertEqual(res.status_code, 200)
+        return {row['title']: row for row in res.json()}
+    
+    def get_solvers(self, challenge, **params):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        return self.client.get(reverse('get_challenge_solvers', kwargs={'challenge_id': challenge.id}), params)
+    
+    def test_board_rows_carry_counts_and_team_solved_flag(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        teammate = User.objects.create_user(username='testuser4', email='testuser4@example.com', password='Password123#!@', team=self.team1)
+        
+        board = self.get_board(self.login(teammate))
+        self.assertEqual(board['chall1']['solve_count'], 2)
+        self.assertTrue(board['chall1']['solved'])
+        self.assertFalse(board['chall2']['solved'])
+        self.assertNotIn('solved_by', board['chall1'])
+        self.assertEqual(board['chall1']['attachments'], [])
+    
+    def test_board_queries_do_not_grow_with_solves(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(reverse('get_all_challenges'), {'view': 'board'})
+        
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        with CaptureQueriesContext(connection) as after:
+            self.client.get(reverse('get_all_challenges'), {'view': 'board'})
+        self.assertEqual(len(after), len(before))
+    
+    def test_solvers_are_paginated_in_solve_order(self):
+        self.user3.team = Team.objects.create(name='teamthree', token='token-three', leader=self.user3)
+        self.user3.save()
+        for token in (self.user1_token, self.user2_token, self.user3_token):
+            self.submit(token, self.chall1, 'flag{one}')
+        
+        res = self.get_solvers(self.chall1, limit=2)
+        self.assertEqual([row['username'] for row in res.json()['results']], ['testuser1', 'testuser2'])
+        self.assertEqual(res.json()['results'][0]['team'], 'teamone')
+        
+        res = self.get_solvers(self.chall1, limit=2, cursor=res.json()['next'])
+        self.assertEqual([row['username'] for row in res.json()['results']], ['testuser3'])
+        self.assertIsNone(res.json()['next'])
+    
+    def test_solvers_reject_bad_cursor(self):
+        self.assertEqual(self.get_solvers(self.chall1, cursor='nope').status_code, 400)
+    
+    def test_solves_after_freeze_stay_hidden_from_players(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        patcher = mock.patch('leaderboard.freeze.get_freeze_time', return_value=timezone.now())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        
+        self.assertEqual([row['username'] for row in self.get_solvers(self.chall1).json()['results']], ['testuser1'])
+        self.assertEqual(self.get_board(self.user3_token)['chall1']['solve_count'], 1)
+        self.assertEqual(self.get_board(self.login(self.admin))['chall1']['solve_count'], 2)
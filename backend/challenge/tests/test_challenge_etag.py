@@ -0,0 +1,59 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from leaderboard import freeze
+
+class ChallengeDetailETagTest(TestSetUp):
+    def get_detail(self, token, **headers):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        return self.client.get(reverse('get_challenge_detail', kwargs={'challenge_id': self.chall1.id}), **headers)
+    
+    def test_unchanged_challenge_revalidates_to_304(self):
+        res = self.get_detail(self.user1_token)
+        self.assertEqual(res.status_code, 200)
+        
+        res = self.get_detail(self.user1_token, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, 304)
+        
+        res = self.get_detail(self.user1_token, HTTP_IF_MODIFIED_SINCE=res['Last-Modified'])
+        self.assertEqual(res.status_code, 304)
+    
+    def test_solves_and_reviews_change_the_etag(self):
+        etag = self.get_detail(self.user1_token)['ETag']
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        res = self.get_detail(self.user1_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([user['username'] for user in res.json()['solved_by']], ['testuser2'])
+        
+        etag = res['ETag']
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user2_token)
+        self.client.post(reverse('create_challenge_review', kwargs={'challenge_id': self.chall1.id}), {'rating': 5}, format='json')
+        self.assertEqual(self.get_detail(self.user1_token, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+    
+    def test_solves_of_other_challenges_keep_the_etag(self):
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        res = self.get_detail(self.user1_token)
+        self.assertNotIn('total_point', res.json()['solved_by'][0])
+        
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.assertEqual(self.get_detail(self.user1_token, HTTP_IF_NONE_MATCH=res['ETag']).status_code, 304)
+    
+    def test_solves_after_the_freeze_keep_the_players_etag(self):
+        freeze._frozen.clear()
+        self.addCleanup(freeze._frozen.clear)
+        with mock.patch('leaderboard.freeze.get_freeze_time', return_value=timezone.now()):
+            admin_token = self.login(self.admin)
+            res = self.get_detail(self.user1_token)
+            admin_etag = self.get_detail(admin_token)['ETag']
+            self.submit(self.user2_token, self.chall1, 'flag{one}')
+            
+            after = self.get_detail(self.user1_token, HTTP_IF_NONE_MATCH=res['ETag'])
+            self.assertEqual(after.status_code, 304)
+            self.assertEqual(after['Last-Modified'], res['Last-Modified'])
+            self.assertEqual(self.get_detail(self.user1_token).json()['solved_by'], [])
+            # Admins follow the live challenge
+            self.assertEqual(self.get_detail(admin_token, HTTP_IF_NONE_MATCH=admin_etag).status_code, 200)
+    
+    def test_admin_and_player_etags_differ(self):
+        self.assertNotEqual(self.get_detail(self.user1_token)['ETag'], self.get_detail(self.login(self.admin))['ETag'])
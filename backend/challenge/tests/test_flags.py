@@ -0,0 +1,43 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.urls import reverse
+from challenge import flags
+from challenge.models import ChallengeFlag, ChallengeSolve
+
+class FlagMatchingTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        flags._matchers.clear()
+        self.addCleanup(flags._matchers.clear)
+    
+    def test_matcher_accepts_every_flag_type(self):
+        matcher = flags.FlagMatcher([('flag{one}', 'static'), ('FLAG{Two}', 'case_insensitive'), (r'flag\{[0-9]+\}', 'regex')])
+        for submitted in ('flag{one}', 'flag{two}', 'FLAG{TWO}', 'flag{1337}'):
+            self.assertTrue(matcher.match(submitted), submitted)
+        for submitted in ('FLAG{ONE}', 'flag{1337}x', 'flag{}', ''):
+            self.assertFalse(matcher.match(submitted), submitted)
+    
+    def test_submission_accepts_extra_flags(self):
+        ChallengeFlag.objects.create(challenge=self.chall1, content=r'flag\{o+ne\}', type='regex')
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{oooone}').status_code, 200)
+        self.assertTrue(ChallengeSolve.objects.filter(user=self.user1, challenge=self.chall1).exists())
+    
+    def test_matchers_are_compiled_once_per_flag_version(self):
+        self.submit(self.user1_token, self.chall1, 'wrong')
+        version, matcher = flags._matchers[self.chall1.id]
+        self.submit(self.user1_token, self.chall1, 'still wrong')
+        self.assertIs(flags._matchers[self.chall1.id][1], matcher)
+        
+        # a new accepted flag invalidates the compiled matcher
+        ChallengeFlag.objects.create(challenge=self.chall1, content='FLAG{ALT}', type='case_insensitive')
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{alt}').status_code, 200)
+        self.assertNotEqual(flags._matchers[self.chall1.id][0], version)
+    
+    def test_invalid_regex_is_rejected_on_edit(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.login(self.admin))
+        url = reverse('edit_challenge', kwargs={'challenge_id': self.chall1.id})
+        res = self.client.put(url, {'flags': [{'content': 'flag{(', 'type': 'regex'}]}, format='json')
+        self.assertEqual(res.status_code, 400)
+        
+        res = self.client.put(url, {'flags': [{'content': 'Flag{Edited}', 'type': 'case_insensitive'}]}, format='json')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{edited}').status_code, 200)
@@ -0,0 +1,63 @@
+from leaderboard.tests.test_setup import TestSetUp
+from datetime import datetime, timedelta
+from django.test import SimpleTestCase
+from django.urls import reverse
+from unittest import mock
+import pytz
+from challenge.phase import PhaseClock, PRE_START, RUNNING, FROZEN, FINISHED
+from utils import EventConfig
+
+class PhaseClockTest(SimpleTestCase):
+    def test_phases_follow_config_boundaries(self):
+        start = datetime(2025, 6, 1, 12, tzinfo=pytz.utc)
+        config = EventConfig(name='', start_time=start, end_time=start + timedelta(hours=10), freeze_time=start + timedelta(hours=8), time_zone=pytz.utc)
+        clock = PhaseClock()
+        with mock.patch('challenge.phase.get_config', return_value=config) as get_config:
+            at = lambda hours: clock.phase(now=(start + timedelta(hours=hours)).timestamp())
+            self.assertEqual(at(-1), PRE_START)
+            self.assertEqual(at(0), RUNNING)
+            self.assertEqual(at(9), FROZEN)
+            self.assertEqual(at(10), FROZEN)
+            self.assertEqual(at(11), FINISHED)
+        self.assertEqual(get_config.call_count, 5)
+    
+    def test_config_is_rechecked_at_most_every_second(self):
+        start = datetime(2025, 6, 1, 12, tzinfo=pytz.utc)
+        config = EventConfig(name='', start_time=start, end_time=start + timedelta(hours=10), freeze_time=None, time_zone=pytz.utc)
+        clock = PhaseClock()
+        with mock.patch('challenge.phase.get_config', return_value=config) as get_config:
+            for offset in (0, 0.2, 0.5, 0.9):
+                clock.phase(now=start.timestamp() + offset)
+        self.assertEqual(get_config.call_count, 1)
+
+class PhaseGateTest(TestSetUp):
+    def set_phase(self, phase):
+        patcher = mock.patch('challenge.middleware.current_phase', return_value=phase)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_players_are_turned_away_before_start_without_queries(self):
+        self.set_phase(PRE_START)
+        with self.assertNumQueries(0):
+            res = self.client.get(reverse('get_all_challenges'))
+        self.assertEqual(res.json(), {"error": "CTF NOT STARTED YET."})
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        self.assertEqual(self.client.get(reverse('get_categories')).json(), {"error": "CTF NOT STARTED YET."})
+    
+    def test_admins_pass_the_gate(self):
+        self.set_phase(PRE_START)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.login(self.admin))
+        res = self.client.get(reverse('get_all_challenges'))
+        self.assertEqual(res.status_code, 200)
+        self.assertIsInstance(res.json(), list)
+    
+    def test_submissions_close_when_finished(self):
+        self.set_phase(FINISHED)
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{one}').json(), {"error": "CTF FINISHED."})
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        self.assertEqual(self.client.get(reverse('get_all_challenges')).status_code, 200)
+    
+    def test_submissions_stay_open_while_frozen(self):
+        self.set_phase(FROZEN)
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{one}').status_code, 200)
@@ -0,0 +1,69 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.test import SimpleTestCase
+from unittest import mock, skipUnless
+from challenge import ratelimit
+from challenge.ratelimit import MemoryBackend, RedisBackend
+from log.models import Submission
+
+def redis_available():
+    try:
+        import redis
+        return redis.Redis.from_url('redis://localhost:6379/15', socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class MemoryBackendTest(SimpleTestCase):
+    def make_backend(self):
+        return MemoryBackend()
+    
+    def test_bucket_allows_burst_then_refills(self):
+        backend = self.make_backend()
+        limits = [('user:1', 2.0, 1.0)]
+        self.assertEqual(backend.consume(limits, now=100), 0)
+        self.assertEqual(backend.consume(limits, now=100), 0)
+        self.assertAlmostEqual(backend.consume(limits, now=100), 1.0)
+        self.assertEqual(backend.consume(limits, now=101), 0)
+    
+    def test_rejection_takes_from_no_bucket(self):
+        backend = self.make_backend()
+        backend.consume([('team:1', 1.0, 0.1)], now=100)
+        # the team bucket is empty, the user bucket must stay full
+        self.assertGreater(backend.consume([('user:1', 1.0, 0.1), ('team:1', 1.0, 0.1)], now=100), 0)
+        self.assertEqual(backend.consume([('user:1', 1.0, 0.1)], now=100), 0)
+
+@skipUnless(redis_available(), "needs a local redis-server")
+class RedisBackendTest(MemoryBackendTest):
+    def make_backend(self):
+        backend = RedisBackend('redis://localhost:6379/15')
+        backend.client.flushdb()
+        self.addCleanup(backend.client.flushdb)
+        return backend
+
+class SubmissionRateLimitTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        ratelimit._backends.clear()
+        self.addCleanup(ratelimit._backends.clear)
+        config = {'backend': 'memory', 'message': 'Slow down.', 'submit': {'challenge': {'burst': 2, 'per_minute': 1}}}
+        patcher = mock.patch('challenge.ratelimit.get_rate_limit_config', return_value=config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_excess_submissions_get_429_without_queries(self):
+        self.submit(self.user1_token, self.chall1, 'wrong')
+        self.submit(self.user1_token, self.chall1, 'wrong')
+        
+        with self.assertNumQueries(0):
+            # the token comes from the auth cache
+            res = self.submit(self.user1_token, self.chall1, 'wrong')
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res.json(), {"error": "Slow down."})
+        self.assertEqual(res['Retry-After'], '60')
+        self.submission_buffer.flush()
+        self.assertEqual(Submission.objects.count(), 2)
+    
+    def test_challenge_bucket_is_per_team_and_challenge(self):
+        for _ in range(3):
+            self.submit(self.user1_token, self.chall1, 'wrong')
+        self.assertEqual(self.submit(self.user1_token, self.chall2, 'wrong').status_code, 400)
+        self.assertEqual(self.submit(self.user2_token, self.chall1, 'wrong').status_code, 400)
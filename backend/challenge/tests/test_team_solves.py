@@ -0,0 +1,38 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.urls import reverse
+from challenge.models import ChallengeSolve, TeamSolve
+from leaderboard.scoring import claim_solve
+from user.models import User
+
+class TeamSolveTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.teammate = User.objects.create_user(username='testuser4', email='testuser4@example.com', password='Password123#!@', team=self.team1)
+        self.teammate_token = self.login(self.teammate)
+    
+    def test_solve_claims_the_team_slot(self):
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{one}').status_code, 200)
+        self.assertEqual(TeamSolve.objects.get(team=self.team1, challenge=self.chall1).user, self.user1)
+        
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{one}').json(), {"message": "You already solved this challenge."})
+        self.assertEqual(self.submit(self.teammate_token, self.chall1, 'flag{one}').json(), {"message": "Your team already solved this challenge."})
+    
+    def test_losing_a_race_records_nothing(self):
+        # The teammate's solve lands between this submission's check and its insert
+        self.assertIsNone(claim_solve(self.teammate, self.chall1.id))
+        self.assertEqual(claim_solve(self.user1, self.chall1.id), self.teammate.id)
+        
+        self.assertFalse(ChallengeSolve.objects.filter(user=self.user1).exists())
+        self.team1.refresh_from_db()
+        self.assertEqual((self.team1.total_point, self.team1.solve_count), (100, 1))
+    
+    def test_team_solves_follow_membership(self):
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user2_token)
+        self.client.post(reverse('leave_team'))
+        self.assertFalse(TeamSolve.objects.filter(team=self.team2).exists())
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user2_token)
+        self.client.post(reverse('join_team', kwargs={'token': self.team1.token}))
+        self.assertEqual(TeamSolve.objects.get(team=self.team1, challenge=self.chall1).user, self.user2)
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{one}').json(), {"message": "Your team already solved this challenge."})
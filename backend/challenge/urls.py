@@ -29,6 +29,8 @@ urlpatterns = [
     path('create/', views.create_challenge, name='create_challenge'),
     # GET details for a specific challenge by its ID
     path('<int:challenge_id>/', views.get_challenge_detail, name='get_challenge_detail'),
+    # GET solvers of a specific challenge, paginated
+    path('<int:challenge_id>/solvers/', views.get_challenge_solvers, name='get_challenge_solvers'),
     # PUT edit a specific challenge by its ID
     path('<int:challenge_id>/edit/', views.edit_challenge, name='edit_challenge'),
     # DELETE a specific challenge by its ID
@@ -1,18 +1,34 @@
 from rest_framework import status
 from rest_framework.response import Response
+from django.db import transaction
 import json
-from utils import check_if_ctf_is_finished, check_if_ctf_is_started
+from django.utils.http import http_date
+from utils import not_modified
 
 
-from .models import Category, Challenge, ChallengeSolve, ChallengeAttachment, ChallengeReview
+from django.db.models import OuterRef, Subquery
+from .models import Category, Challenge, ChallengeSolve, ChallengeAttachment, ChallengeReview, TeamSolve
 from log.serializers import SubmissionSerlializers
-from .serializers import ChallengeListSerializer, ChallengeSerializer, CategorySerializer, CategoryDetailSerializer, CreateChallengeSerializer, ChallengeSolveSerializer, AdminChallengeDetailSerializer, ChallengeReviewSerializer
-
-
-from knox.auth import TokenAuthentication
+from log.models import Submission
+from log.buffer import log_incorrect_submission
+from leaderboard.scoring import claim_solve, recompute_teams, teams_affected_by_challenge
+from .scoring import refresh_challenge_value
+from .serializers import ChallengeListSerializer, ChallengeSerializer, CategorySerializer, CategoryDetailSerializer, CreateChallengeSerializer, ChallengeSolveSerializer, AdminChallengeDetailSerializer, ChallengeReviewSerializer, prefetch_challenge_relations
+from .serializers import ChallengeSolverSerializer, categories_with_counts
+from .catalogue import board_rows, invalidate_catalogue
+from .flags import check_flag
+from .ratelimit import check_submission_rate
+from .pagination import decode_cursor, solvers_page
+from leaderboard.freeze import freeze_cutoff_for, frozen_scoreboard_for
+
+
+from user.authentication import CachedTokenAuthentication
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser 
 
+SOLVERS_DEFAULT_LIMIT = 50
+SOLVERS_MAX_LIMIT = 200
+
 # =================================================
 # CRUD Category
 # =================================================
@@ -20,24 +36,22 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_categories(request):
     """
     Retrieve all categories.
     """
-    if not check_if_ctf_is_started() and request.user.role != "admin":
-        return Response({"error": "CTF NOT STARTED YET."}, status=status.HTTP_200_OK)
     try:
             
-        categories = Category.objects.all()
+        categories = categories_with_counts(request.user)
         serializer = CategorySerializer(categories, many=True, context={"request":request})
         return Response(serializer.data, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser]) 
 def create_category(request):
     """
@@ -54,7 +68,7 @@ def create_category(request):
     return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['PUT'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def edit_categories(request, category_name):
     """
@@ -76,7 +90,7 @@ def edit_categories(request, category_name):
 
 
 @api_view(['DELETE'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser]) 
 def delete_categories(request, category_name):
     """
@@ -100,7 +114,7 @@ def delete_categories(request, category_name):
 # =================================================
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_challenges_by_categories(request, category_name):
     """
@@ -108,9 +122,6 @@ def get_challenges_by_categories(request, category_name):
     Uses CategoryDetailSerializer (as defined in your serializers.py, which serializes Challenge objects
     with specific fields: title, difficutly, point).
     """
-    if not check_if_ctf_is_started() and request.user.role != "admin":
-        return Response({"error": "CTF NOT STARTED YET."}, status=status.HTTP_200_OK)
-    
     try:
         category = Category.objects.get(name__iexact=category_name)
     except Category.DoesNotExist:
@@ -135,53 +146,106 @@ def get_challenges_by_categories(request, category_name):
 # =================================================
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_challenges(request):
     """
     Retrieve a list of all challenges.
     Uses ChallengeSerializer which excludes the flag.
+    ?view=board -> cached catalogue rows (see challenge.catalogue) with solve counts, the team's
+                   solved flag and attachment stubs, solvers are listed by /challenges/<id>/solvers/ instead
     """
     
-    if not check_if_ctf_is_started() and request.user.role != "admin":
-        return Response({"error": "CTF NOT STARTED YET."}, status=status.HTTP_200_OK)
-    
     try:
-        challenges = Challenge.objects.all()
-        serializer = ChallengeListSerializer(challenges, many=True)
+        if request.query_params.get('view') == 'board':
+            return Response(board_rows(request.user, frozen=frozen_scoreboard_for(request.user)), status=status.HTTP_200_OK)
+        
+        # While frozen, players see the solvers and values of the frozen scoreboard
+        frozen = frozen_scoreboard_for(request.user)
+        challenges = prefetch_challenge_relations(Challenge.objects.all(), frozen=frozen)
+        serializer = ChallengeListSerializer(challenges, many=True, context={'frozen': frozen})
         return Response(serializer.data, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_challenge_detail(request, challenge_id):
     """
     Retrieve details of a specific challenge by its ID.
     Uses ChallengeSerializer which excludes the flag.
+    Conditional: revalidate with If-None-Match (ETag) or If-Modified-Since to get a 304
+    without the nested solvers and reviews being serialized.
     """
     
-    if not check_if_ctf_is_started() and request.user.role != "admin":
-        return Response({"error": "CTF NOT STARTED YET."}, status=status.HTTP_200_OK)
-    
     try:
-        challenge = Challenge.objects.get(pk=challenge_id)
+        updated_at, solves_changed_at = Challenge.objects.values_list('updated_at', 'solves_changed_at').get(pk=challenge_id)
+        # Admins and players get different bodies for the same challenge state
+        etag = f'{challenge_id}-{int(updated_at.timestamp() * 1_000_000)}-{request.user.role}'
+        last_modified = updated_at
+        frozen = frozen_scoreboard_for(request.user)
+        # Frozen players see the solvers and value as of the freeze: only content edits change
+        # their body, solves made since must not show in the ETag or Last-Modified
+        if frozen is not None:
+            etag += f'-frozen{int(frozen.freeze_time.timestamp())}'
+        elif solves_changed_at is not None:
+            etag += f'-s{int(solves_changed_at.timestamp() * 1_000_000)}'
+            last_modified = max(updated_at, solves_changed_at)
+        etag = f'"{etag}"'
+        headers = {'ETag': etag, 'Last-Modified': http_date(last_modified.timestamp()), 'Cache-Control': 'no-cache'}
+        if not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        challenge = prefetch_challenge_relations(Challenge.objects.all(), frozen=frozen).get(pk=challenge_id)
         
       
         if request.user.role == "admin":
             serializer = AdminChallengeDetailSerializer(challenge)
         else:
-            serializer = ChallengeSerializer(challenge)
+            serializer = ChallengeSerializer(challenge, context={'frozen': frozen})
             
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers=headers)
     except Challenge.DoesNotExist:
         return Response({'error': f'Challenge with ID {challenge_id} not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({"error": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def get_challenge_solvers(request, challenge_id):
+    """
+    Solvers of a challenge in solve order, keyset-paginated.
+    ?limit=N[&cursor=...] -> {"results": [...], "next": cursor or null}
+    Solves made after the scoreboard freeze stay hidden from players.
+    """
+    
+    try:
+        limit = int(request.query_params.get('limit', SOLVERS_DEFAULT_LIMIT))
+    except ValueError:
+        return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, SOLVERS_MAX_LIMIT))
+    
+    cursor = request.query_params.get('cursor')
+    try:
+        cursor_key = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        challenge = Challenge.objects.get(pk=challenge_id)
+    except Challenge.DoesNotExist:
+        return Response({'error': f'Challenge with ID {challenge_id} not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    solves, next_cursor = solvers_page(challenge, cursor_key, limit, until=freeze_cutoff_for(request.user))
+    return Response({
+        'results': ChallengeSolverSerializer(solves, many=True).data,
+        'next': next_cursor,
+    }, status=status.HTTP_200_OK)
+
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser]) 
 def create_challenge(request):
     """
@@ -201,6 +265,7 @@ def create_challenge(request):
                 file=file,
                 name=attachment_name
             )
+        invalidate_catalogue()
         
         response_data = serializer.data.copy()
         response_data['attachments'] = [
@@ -219,7 +284,7 @@ def create_challenge(request):
     return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['PUT'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def edit_challenge(request, challenge_id):
     """
@@ -250,9 +315,13 @@ def edit_challenge(request, challenge_id):
                 pass  
         
   
+        old_point = challenge.point
         serializer = CreateChallengeSerializer(challenge, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
-            updated_challenge = serializer.save()
+            with transaction.atomic():
+                updated_challenge = serializer.save()
+                # A new initial value goes through the scoring function, teams still hold old_point
+                refresh_challenge_value(updated_challenge, credited_point=old_point)
             
           
             for file in files:
@@ -262,6 +331,7 @@ def edit_challenge(request, challenge_id):
                     file=file,
                     name=attachment_name
                 )
+            invalidate_catalogue()
             
          
             response_data = serializer.data.copy()
@@ -284,7 +354,7 @@ def edit_challenge(request, challenge_id):
         return Response({"error": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['DELETE'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def delete_challenge(request, challenge_id):
     """
@@ -298,7 +368,10 @@ def delete_challenge(request, challenge_id):
             return Response({"error": "You do not have permission to delete this challenge."}, status=status.HTTP_403_FORBIDDEN)
         
         challenge_title = challenge.title # For the success message
+        affected_teams = teams_affected_by_challenge(challenge)
         challenge.delete()
+        recompute_teams(affected_teams)
+        invalidate_catalogue()
         return Response({"success": f"Challenge '{challenge_title}' deleted successfully"}, status=status.HTTP_200_OK) # Or HTTP_204_NO_CONTENT
     except Challenge.DoesNotExist:
         return Response({"error": f"Challenge with ID {challenge_id} not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -306,22 +379,33 @@ def delete_challenge(request, challenge_id):
         return Response({"error": f"An unexpected error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def already_solved_response(user, team_solver):
+    if team_solver == user.id:
+        return Response({"message": "You already solved this challenge."}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"message": "Your team already solved this challenge."}, status=status.HTTP_400_BAD_REQUEST)
+
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def submit_flag(request, challenge_id):
     """
     SUBMIT FLEG
     """
-    if not check_if_ctf_is_started() and request.user.role != "admin":
-        return Response({"error": "CTF NOT STARTED YET."}, status=status.HTTP_200_OK)
+    # Throttled first: a rejection must not cost a query (see challenge.ratelimit)
+    limited = check_submission_rate(request.user, challenge_id)
+    if limited:
+        message, retry_after = limited
+        return Response({"error": message}, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(retry_after)})
     
         
     if not request.user.team:
         return Response({"message": f"You must join a team to submit a flag!"}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        challenge = Challenge.objects.get(pk=challenge_id)
+        # Matching only needs the flag version, the compiled matchers live in challenge.flags.
+        # The same query tells whether the team already holds a solve of it.
+        team_solver = TeamSolve.objects.filter(team=request.user.team_id, challenge=OuterRef('pk')).values('user')[:1]
+        challenge = Challenge.objects.only('id', 'flag_version').annotate(team_solver=Subquery(team_solver)).get(pk=challenge_id)
     except Challenge.DoesNotExist:
         return Response({"message": f"Challenge does not exists."}, status=status.HTTP_404_NOT_FOUND)
     
@@ -329,43 +413,33 @@ def submit_flag(request, challenge_id):
     if user_submitted_flag is None:
         return Response({"message": f"Specify the flag bro.."}, status=status.HTTP_400_BAD_REQUEST)
     
-    if ChallengeSolve.objects.filter(user=request.user, challenge=challenge).exists():
-        return Response({"message": "You already solved this challenge."}, status=status.HTTP_400_BAD_REQUEST)
-    
-    team_members = request.user.team.members.all()
-    if ChallengeSolve.objects.filter(user__in=team_members, challenge=challenge).exists():
-        return Response({"message": "Your team already solved this challenge."}, status=status.HTTP_400_BAD_REQUEST)
-    
-    if check_if_ctf_is_finished() and request.user.role != "admin":
-        return Response({"error": "CTF FINISHED."}, status=status.HTTP_200_OK)
-    
-    is_correct = challenge.flag == user_submitted_flag
-    status_value = 'correct' if is_correct else 'incorrect'
-    
-    from log.models import Submission
-    submission = Submission.objects.create(
-        challenge=challenge,
-        submitted_by=request.user,
-        flag=user_submitted_flag,
-        status=status_value,
-    )
+    if challenge.team_solver is not None:
+        return already_solved_response(request.user, challenge.team_solver)
     
-    if challenge.flag != user_submitted_flag:
+    user_submitted_flag = str(user_submitted_flag)
+    if not check_flag(challenge, user_submitted_flag):
+        log_incorrect_submission(challenge.pk, request.user.id, request.user.team_id, user_submitted_flag)
         return Response({"message": f"Wrong answer."}, status=status.HTTP_400_BAD_REQUEST)
     
-    ChallengeSolve.objects.create(user=request.user, challenge=challenge)
+    # The correct attempt is logged in the transaction of the solve, never buffered
+    with transaction.atomic():
+        Submission.objects.create(challenge=challenge, submitted_by=request.user, team_id=request.user.team_id, flag=user_submitted_flag, status='correct')
+        # A teammate may have solved it since the check above, the TeamSolve insert settles it
+        team_solver = claim_solve(request.user, challenge.pk)
+    if team_solver is not None:
+        return already_solved_response(request.user, team_solver)
     
     return Response({"success":"Correct."}, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def solved_by_me(request):
     """
     Delete a challenge by its ID.
     Only the author or an admin (conceptual) can delete.
     """
-    solves = ChallengeSolve.objects.filter(user=request.user)
+    solves = ChallengeSolve.objects.filter(user=request.user).select_related('user', 'challenge__category')
     if not solves.exists():
         return Response({"message": f"You have not solved any challenges yet."}, status=status.HTTP_404_NOT_FOUND)
     
@@ -373,7 +447,7 @@ def solved_by_me(request):
 
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def solved_by_team(request):
     if not request.user.team:
@@ -381,7 +455,7 @@ def solved_by_team(request):
     
     
     team_members = request.user.team.members.all()
-    solves = ChallengeSolve.objects.filter(user__in=team_members)
+    solves = ChallengeSolve.objects.filter(user__in=team_members).select_related('user', 'challenge__category')
     
     if not solves.exists():
         return Response({"message": f"Your team haven't solved any challenges"}, status=status.HTTP_404_NOT_FOUND)
@@ -389,7 +463,7 @@ def solved_by_team(request):
     return Response(ChallengeSolveSerializer(solves, many=True).data, status=status.HTTP_200_OK)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def create_challenge_review(request, challenge_id):
     """
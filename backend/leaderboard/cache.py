@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ScoreboardVersion
+
+'''
+Versioned scoreboard snapshots.
+
+Every write that changes the scoreboard bumps ScoreboardVersion in its own transaction,
+readers fetch the version (one tiny query) and reuse the JSON serialized for it.
+Snapshots are stored as ready-to-send bytes so a hit costs no serialization at all.
+'''
+
+SNAPSHOT_KEY = 'leaderboard:{name}:{version}'
+SNAPSHOT_TIMEOUT = 60 * 60
+
+def current_version():
+    version = ScoreboardVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+    return version or 0
+
+def current_state():
+    """(version, time of the last change) of the scoreboard, (0, None) before any change."""
+    state = ScoreboardVersion.objects.filter(pk=1).values_list('version', 'updated_at').first()
+    return state or (0, None)
+
+def bump_version():
+    """Increment the scoreboard version. Call inside the transaction that changed the data."""
+    updated = ScoreboardVersion.objects.filter(pk=1).update(version=F('version') + 1, updated_at=timezone.now())
+    if not updated:
+        ScoreboardVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+def get_snapshot(name, version, build):
+    """
+    Return the bytes cached for (name, version), calling build() to produce them on a miss.
+    Old versions are never read again and simply expire.
+    """
+    key = SNAPSHOT_KEY.format(name=name, version=version)
+    content = cache.get(key)
+    if content is None:
+        content = build()
+        cache.set(key, content, SNAPSHOT_TIMEOUT)
+    return content
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytz
+from django.db.models import Count, Max, Sum
+from rest_framework.renderers import JSONRenderer
+
+from team.models import Team
+from challenge.models import Category, ChallengeSolve
+from challenge.scoring import solve_value
+
+'''
+Per-category standings.
+
+Every category board comes out of a single GROUP BY (team, category) over ChallengeSolve,
+so they are built together and cached together under the scoreboard version.
+A board only lists the teams with at least one solve in that category.
+'''
+
+def build_category_boards(until=None, points=None):
+    """
+    {lowercased category name: JSON bytes of its board}. For the frozen scoreboard, `until` limits
+    the solves and `points` ({challenge id: value}) values them as at freeze_time.
+    """
+    solves = ChallengeSolve.objects.filter(user__team__isnull=False)
+    if until is not None:
+        solves = solves.filter(solved_at__lte=until)
+    groups = (
+        solves
+        .order_by()
+        .values('user__team', 'challenge__category')
+        .annotate(total_point=Sum(solve_value(points)), solve_count=Count('id'), last_solve=Max('solved_at'))
+    )
+    
+    boards = {category_id: [] for category_id in Category.objects.values_list('id', flat=True)}
+    for group in groups:
+        boards.setdefault(group['challenge__category'], []).append(group)
+    
+    names = dict(Team.objects.filter(pk__in={group['user__team'] for group in groups}).values_list('id', 'name'))
+    categories = dict(Category.objects.values_list('id', 'name'))
+    
+    never = datetime.max.replace(tzinfo=pytz.utc)
+    rendered = {}
+    for category_id, groups in boards.items():
+        groups.sort(key=lambda group: (-group['total_point'], group['last_solve'] or never, group['user__team']))
+        rows = []
+        for position, group in enumerate(groups):
+            previous = groups[position - 1] if position else None
+            same_score = previous and (previous['total_point'], previous['last_solve']) == (group['total_point'], group['last_solve'])
+            rows.append({
+                'id': group['user__team'],
+                'name': names.get(group['user__team']),
+                'total_point': group['total_point'],
+                'solve_count': group['solve_count'],
+                'rank': rows[-1]['rank'] if same_score else position + 1,
+            })
+        rendered[categories[category_id].lower()] = JSONRenderer().render(rows)
+    return rendered
@@ -0,0 +1,52 @@
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+
+from .cache import current_version, get_snapshot
+from .live import SCOREBOARD_GROUP, SCOREBOARD_ADMIN_GROUP
+from .freeze import frozen_scoreboard_for
+
+class ScoreboardConsumer(AsyncWebsocketConsumer):
+    """
+    Sends the full scoreboard once on connect, then the deltas broadcast by leaderboard.live
+    ({"type": "delta", "version": ..., "teams": [{id, name, total_point, solve_count, last_solve, rank}]}).
+    Deltas leave out the teams that were overtaken: clients re-rank their rows (see leaderboard.live).
+    A client seeing a version gap can simply reconnect or refetch /leaderboard/.
+    While the scoreboard is frozen, players get the frozen snapshot and no deltas.
+    """
+    async def connect(self):
+        if not self.scope['user'].is_authenticated:
+            await self.close()
+            return
+        
+        self.groups_joined = [SCOREBOARD_GROUP]
+        if self.scope['user'].role == 'admin':
+            self.groups_joined.append(SCOREBOARD_ADMIN_GROUP)
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+        await self.send_snapshot()
+
+    async def disconnect(self, close_code):
+        for group in getattr(self, 'groups_joined', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def send_snapshot(self):
+        version, content = await self.get_snapshot()
+        # The cached snapshot is already JSON, wrap it without parsing it again
+        await self.send(text_data=f'{{"type": "snapshot", "version": {version}, "teams": {content.decode()}}}')
+
+    async def scoreboard_delta(self, event):
+        await self.send(text_data=event['text'])
+
+    async def scoreboard_refresh(self, event):
+        await self.send_snapshot()
+
+    @database_sync_to_async
+    def get_snapshot(self):
+        from .views import build_scoreboard
+        
+        frozen = frozen_scoreboard_for(self.scope['user'])
+        if frozen is not None:
+            return '"frozen"', frozen.content
+        version = current_version()
+        return version, get_snapshot('scoreboard', version, build_scoreboard)
@@ -0,0 +1,207 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pytz
+from django.core.cache import cache
+from django.db.models import Count, Q
+from rest_framework.renderers import JSONRenderer
+
+from utils import get_freeze_time, get_scoring_config
+from team.models import Team
+from challenge.models import Challenge, ChallengeSolve
+from challenge.scoring import challenge_value, get_scoring_function, initial_value, static
+from .timeline import top_series
+
+'''
+Scoreboard freeze.
+
+From `ctf.freeze_time` on, players see the standings as of that moment while admins keep
+the live scoreboard. The frozen standings are computed once (from solves up to freeze_time),
+kept in process memory and in the cache, and never change again: serving them costs no query.
+Challenges are counted at their value at freeze_time (the scoring function at the solve count
+of that moment), so dynamic scoring decaying values afterwards does not move the standings,
+and every process computes the same ones whenever it first needs them.
+'''
+
+FROZEN_KEY = 'leaderboard:frozen:{timestamp}'
+FROZEN_TIMEOUT = 7 * 24 * 60 * 60
+# Derived responses memoized per frozen scoreboard, least recently used go first
+FROZEN_BLOBS_SIZE = 256
+
+# freeze_time -> FrozenScoreboard, so a warm process does not even hit the cache
+_frozen = {}
+
+class FrozenScoreboard:
+    def __init__(self, freeze_time, rows, points):
+        self.freeze_time = freeze_time
+        # challenge id -> value at freeze_time, for the challenges that existed when it was built
+        self.points = points
+        self.etag = f'"frozen-{int(freeze_time.timestamp())}"'
+        self.rows = rows
+        self.positions = {row['id']: position for position, row in enumerate(rows)}
+        self.content = JSONRenderer().render([self.public(row) for row in rows])
+        self.blobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Cached without the memo and its lock
+        state = dict(self.__dict__)
+        del state['blobs'], state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.blobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def public(row):
+        return {key: row[key] for key in ('id', 'name', 'total_point', 'solve_count', 'last_solve', 'rank')}
+
+    def point(self, challenge_id, initial):
+        """Value of a challenge at freeze_time; one added since had no solve by then."""
+        point = self.points.get(challenge_id)
+        return challenge_value(initial, 0) if point is None else point
+
+    def team(self, team_id):
+        position = self.positions.get(team_id)
+        return None if position is None else self.rows[position]
+
+    def blob(self, name, build):
+        """
+        Memoized data derived from the frozen standings (pages, timelines, category boards...).
+        Names must come from a bounded set (positions, team ids), not from raw client input.
+        """
+        with self.lock:
+            content = self.blobs.get(name)
+            if content is not None:
+                self.blobs.move_to_end(name)
+                return content
+        content = build()
+        with self.lock:
+            self.blobs[name] = content
+            while len(self.blobs) > FROZEN_BLOBS_SIZE:
+                self.blobs.popitem(last=False)
+        return content
+
+    def start(self, cursor_key):
+        """Position of the first row after the cursor's team, 0 without a cursor."""
+        if cursor_key is None:
+            return 0
+        return self.positions.get(cursor_key[2], len(self.rows) - 1) + 1
+
+    def page(self, cursor_key, limit):
+        start = self.start(cursor_key)
+        rows = self.rows[start:start + limit]
+        has_next = start + limit < len(self.rows)
+        return [self.public(row) for row in rows], rows[-1] if has_next and rows else None
+
+    def around(self, team_id, radius):
+        position = self.positions.get(team_id)
+        if position is None:
+            return [], None
+        rows = self.rows[max(0, position - radius):position + radius + 1]
+        return [self.public(row) for row in rows], self.rows[position]['rank']
+
+def frozen_points(freeze_time, config=None):
+    """{challenge id: value at freeze_time} for every challenge, unsolved ones at their starting value."""
+    config = get_scoring_config() if config is None else config
+    fixed = get_scoring_function(config) is static
+    challenges = Challenge.objects.annotate(
+        frozen_solves=Count('challengesolve', filter=Q(challengesolve__solved_at__lte=freeze_time)),
+    ).only('id', 'point', 'initial_point')
+    return {
+        challenge.id: initial_value(challenge) if fixed else challenge_value(initial_value(challenge), challenge.frozen_solves, config)
+        for challenge in challenges
+    }
+
+def build_frozen_rows(freeze_time, points):
+    """Standings counting only the solves made up to freeze_time, in scoreboard order with RANK() semantics."""
+    teams = {team_id: {'id': team_id, 'name': name, 'total_point': 0, 'solve_count': 0, 'last_solve': None} for team_id, name in Team.objects.values_list('id', 'name')}
+    solves = ChallengeSolve.objects.filter(solved_at__lte=freeze_time, user__team__isnull=False).values_list('user__team', 'challenge', 'solved_at')
+    for team_id, challenge_id, solved_at in solves.iterator(chunk_size=2000):
+        team = teams[team_id]
+        team['total_point'] += points[challenge_id]
+        team['solve_count'] += 1
+        team['last_solve'] = solved_at if team['last_solve'] is None else max(team['last_solve'], solved_at)
+    
+    never = datetime.max.replace(tzinfo=pytz.utc)
+    teams = sorted(teams.values(), key=lambda team: (-team['total_point'], team['last_solve'] or never, team['id']))
+    
+    rows = []
+    for position, team in enumerate(teams):
+        previous = rows[-1] if rows else None
+        same_score = previous and (previous['total_point'], previous['last_solve']) == (team['total_point'], team['last_solve'])
+        team['rank'] = previous['rank'] if same_score else position + 1
+        rows.append(team)
+    return rows
+
+def get_frozen_scoreboard(freeze_time):
+    scoreboard = _frozen.get(freeze_time)
+    if scoreboard is None:
+        key = FROZEN_KEY.format(timestamp=int(freeze_time.timestamp()))
+        scoreboard = cache.get(key)
+        if scoreboard is None:
+            points = frozen_points(freeze_time)
+            scoreboard = FrozenScoreboard(freeze_time, build_frozen_rows(freeze_time, points), points)
+            cache.set(key, scoreboard, FROZEN_TIMEOUT)
+        _frozen[freeze_time] = scoreboard
+    return scoreboard
+
+def is_frozen():
+    freeze_time = get_freeze_time()
+    return freeze_time is not None and datetime.now(pytz.utc) >= freeze_time
+
+def freeze_cutoff_for(user):
+    """Freeze time hiding later solves from this user, None for admins or while the scoreboard is live."""
+    if user.role == 'admin':
+        return None
+    freeze_time = get_freeze_time()
+    if freeze_time is None or datetime.now(pytz.utc) < freeze_time:
+        return None
+    return freeze_time
+
+def frozen_scoreboard_for(user):
+    """The frozen scoreboard this user must see, None for admins or while the scoreboard is live."""
+    freeze_time = freeze_cutoff_for(user)
+    return get_frozen_scoreboard(freeze_time) if freeze_time else None
+
+def frozen_challenge_points(frozen, challenge_ids):
+    """{challenge id: value at freeze_time} for challenge_ids, reading only those added since the freeze."""
+    points = {pk: frozen.points[pk] for pk in challenge_ids if pk in frozen.points}
+    missing = set(challenge_ids) - points.keys()
+    for challenge in Challenge.objects.filter(pk__in=missing).only('id', 'point', 'initial_point') if missing else ():
+        points[challenge.id] = frozen.point(challenge.id, initial_value(challenge))
+    return points
+
+def total_point_args(frozen):
+    """Keyword arguments of User.objects.with_total_point() agreeing with the frozen standings (none while live)."""
+    return {} if frozen is None else {'until': frozen.freeze_time, 'points': frozen.points}
+
+def frozen_for_serializer(serializer):
+    """
+    Frozen scoreboard for the user behind the serializer's request (None for admins,
+    while live, or without a request). Looked up once per serializer run.
+    """
+    context = serializer.context
+    if 'frozen_scoreboard' not in context:
+        request = context.get('request')
+        context['frozen_scoreboard'] = frozen_scoreboard_for(request.user) if request else None
+    return context['frozen_scoreboard']
+
+def frozen_team_row(serializer, instance):
+    """Frozen standings row of the team, None when live or the team was created after the freeze."""
+    frozen = frozen_for_serializer(serializer)
+    return frozen.team(instance.id) if frozen else None
+
+def frozen_timeline(scoreboard, top, max_points):
+    rows = scoreboard.rows[:top]
+    series = top_series([row['id'] for row in rows], max_points, until=scoreboard.freeze_time)
+    return JSONRenderer().render([
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'points': [{'time': timestamp, 'score': score} for timestamp, score in series[row['id']]],
+        } for row in rows
+    ])
@@ -0,0 +1,64 @@
+import json
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from team.models import Team
+from .cache import current_version
+from .ranking import rank_map, team_rank
+from .freeze import is_frozen
+
+'''
+Live scoreboard fan-out (see consumers.ScoreboardConsumer).
+
+Writers schedule a broadcast for after their transaction commits; the message is
+serialized once here and every socket in the group forwards the same text.
+
+A delta only carries the teams whose score changed, not the teams they overtook. Clients
+keep the snapshot's rows, replace the changed ones and rank locally with the scoreboard
+order (see leaderboard.ranking): total_point desc, then last_solve asc, teams without a
+solve last, equal (total_point, last_solve) sharing a rank. Every row has last_solve for that.
+'''
+
+SCOREBOARD_GROUP = 'scoreboard'
+# Admin sockets are in both groups; while the scoreboard is frozen only they get updates
+SCOREBOARD_ADMIN_GROUP = 'scoreboard_admin'
+
+def _group_send(message):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    group = SCOREBOARD_ADMIN_GROUP if is_frozen() else SCOREBOARD_GROUP
+    async_to_sync(channel_layer.group_send)(group, message)
+
+def broadcast_scores(team_ids):
+    """One group message with the new score and rank of each given team."""
+    from team.serializers import TeamListSerializer
+    
+    teams = list(Team.objects.filter(pk__in=team_ids))
+    if not teams:
+        return
+    
+    # A single team is ranked through the index, several at once in one window query
+    ranks = rank_map() if len(teams) > 1 else {teams[0].id: team_rank(teams[0])}
+    for team in teams:
+        team.rank = ranks.get(team.id)
+    # Same rows as the snapshot, no request so never the frozen values (only admins get deltas then)
+    text = json.dumps({
+        'type': 'delta',
+        'version': current_version(),
+        'teams': TeamListSerializer(teams, many=True).data,
+    })
+    _group_send({'type': 'scoreboard.delta', 'text': text})
+
+def broadcast_refresh():
+    """Teams appeared or disappeared: every socket gets the current snapshot again."""
+    _group_send({'type': 'scoreboard.refresh'})
+
+def schedule_scores(team_ids):
+    team_ids = list(team_ids)
+    transaction.on_commit(lambda: broadcast_scores(team_ids))
+
+def schedule_refresh():
+    transaction.on_commit(broadcast_refresh)
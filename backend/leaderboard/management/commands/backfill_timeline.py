@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from leaderboard.timeline import backfill
+from leaderboard.cache import bump_version
+
+
+class Command(BaseCommand):
+    help = "Rebuild the score-over-time store (ScorePoint) from existing ChallengeSolve rows."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = backfill()
+            bump_version()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} score point(s)."))
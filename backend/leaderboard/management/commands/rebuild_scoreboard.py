@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from leaderboard.scoring import recompute_teams
+from challenge.scoring import refresh_all_challenge_values
+
+
+class Command(BaseCommand):
+    help = "Re-apply the scoring function to every challenge, then recompute every team's materialized total_point, solve_count and last_solve from ChallengeSolve."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            challenges = refresh_all_challenge_values()
+            updated = recompute_teams()
+        self.stdout.write(self.style.SUCCESS(f"Updated {challenges} challenge value(s), rebuilt scoreboard for {updated} team(s)."))
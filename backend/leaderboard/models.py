@@ -0,0 +1,29 @@
+from django.db import models
+
+class ScoreboardVersion(models.Model):
+    """
+    Single row holding a monotonically increasing counter.
+    Bumped every time the scoreboard data changes (see leaderboard.cache).
+    """
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Scoreboard v{self.version}"
+
+class ScorePoint(models.Model):
+    """
+    One point of a team's score-over-time graph: the team's cumulative score right after `timestamp`.
+    Appended as solves are recorded (see leaderboard.timeline), never computed on read.
+    """
+    team = models.ForeignKey('team.Team', on_delete=models.CASCADE, related_name='score_points')
+    timestamp = models.DateTimeField()
+    score = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['team', 'timestamp'], name='scorepoint_team_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.team} had {self.score} at {self.timestamp}"
@@ -0,0 +1,96 @@
+import base64
+import json
+
+from django.db.models import Count, F, Q
+from django.utils.dateparse import parse_datetime
+
+from team.models import Team
+from .ranking import ahead_of
+from .scoring import scoreboard_queryset
+
+'''
+Keyset pagination over the scoreboard order (total_point DESC, last_solve ASC NULLS LAST, id ASC).
+
+A cursor is the (total_point, last_solve, id) key of the last row already sent,
+so every page is an index range scan no matter how deep it is.
+Ranks of a page are derived from its first row instead of ranking the whole table.
+'''
+
+def team_key(team):
+    return (team.total_point, team.last_solve, team.id)
+
+def encode_cursor(team):
+    return encode_key(*team_key(team))
+
+def encode_key(total_point, last_solve, team_id):
+    payload = [total_point, last_solve.isoformat() if last_solve else None, team_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor):
+    """(total_point, last_solve, id) from a cursor, ValueError when it is malformed."""
+    try:
+        total_point, last_solve, team_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if last_solve is not None:
+            last_solve = parse_datetime(last_solve)
+            if last_solve is None:
+                raise ValueError
+        return int(total_point), last_solve, int(team_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.")
+
+def after_key(total_point, last_solve, team_id):
+    """Q matching the rows that come after the key in scoreboard order."""
+    if last_solve is None:
+        tail = Q(last_solve__isnull=True, id__gt=team_id)
+    else:
+        tail = Q(last_solve__gt=last_solve) | Q(last_solve__isnull=True) | Q(last_solve=last_solve, id__gt=team_id)
+    return Q(total_point__lt=total_point) | (Q(total_point=total_point) & tail)
+
+def before_key(total_point, last_solve, team_id):
+    """Q matching the rows that come before the key in scoreboard order."""
+    if last_solve is None:
+        tail = Q(last_solve__isnull=False) | Q(last_solve__isnull=True, id__lt=team_id)
+    else:
+        tail = Q(last_solve__lt=last_solve) | Q(last_solve=last_solve, id__lt=team_id)
+    return Q(total_point__gt=total_point) | (Q(total_point=total_point) & tail)
+
+def assign_ranks(teams):
+    """
+    Set `rank` on a contiguous slice of the scoreboard with a single COUNT query:
+    the first row's rank and position come from the database, the rest follow from the order.
+    """
+    if not teams:
+        return teams
+    
+    first = teams[0]
+    counts = Team.objects.aggregate(
+        ahead=Count('id', filter=ahead_of(first.total_point, first.last_solve)),
+        before=Count('id', filter=before_key(*team_key(first))),
+    )
+    first.rank = counts['ahead'] + 1
+    for position, team in enumerate(teams[1:], start=counts['before'] + 1):
+        previous = teams[position - counts['before'] - 1]
+        same_score = (team.total_point, team.last_solve) == (previous.total_point, previous.last_solve)
+        team.rank = previous.rank if same_score else position + 1
+    return teams
+
+def page(cursor_key, limit):
+    """One page after cursor_key (None for the top), and the cursor for the next page."""
+    teams = scoreboard_queryset()
+    if cursor_key is not None:
+        teams = teams.filter(after_key(*cursor_key))
+    
+    teams = list(teams[:limit + 1])
+    next_cursor = encode_cursor(teams[limit - 1]) if len(teams) > limit else None
+    return assign_ranks(teams[:limit]), next_cursor
+
+def around(team, radius):
+    """The team plus up to `radius` teams on either side of it."""
+    key = team_key(team)
+    above = list(
+        Team.objects
+        .filter(before_key(*key))
+        .order_by('total_point', F('last_solve').desc(nulls_first=True), '-id')[:radius]
+    )
+    below = list(scoreboard_queryset().filter(Q(pk=team.pk) | after_key(*key))[:radius + 1])
+    return assign_ranks(above[::-1] + below)
@@ -0,0 +1,58 @@
+from django.db.models import F, Q, Window
+from django.db.models.functions import Rank
+from rest_framework.serializers import ListSerializer
+
+from team.models import Team
+
+'''
+Ranking on top of the materialized Team totals (see scoring.py).
+
+Order: total_point DESC, last_solve ASC (earlier last solve wins the tie),
+teams without any solve go last. Ties on both share a rank, like SQL RANK().
+'''
+
+RANK_ORDER = [F('total_point').desc(), F('last_solve').asc(nulls_last=True)]
+
+def with_rank(queryset):
+    """Annotate `rank` on every row with RANK() OVER (...), computed in the same query."""
+    return queryset.annotate(rank=Window(expression=Rank(), order_by=RANK_ORDER))
+
+def rank_map():
+    """{team_id: rank} for all teams, one query."""
+    return dict(with_rank(Team.objects.order_by()).values_list('id', 'rank'))
+
+def ahead_of(total_point, last_solve):
+    """Q matching the teams strictly ahead of a (total_point, last_solve) score."""
+    ahead = Q(total_point__gt=total_point)
+    if last_solve is None:
+        ahead |= Q(total_point=total_point, last_solve__isnull=False)
+    else:
+        ahead |= Q(total_point=total_point, last_solve__lt=last_solve)
+    return ahead
+
+def team_rank(team):
+    """
+    Rank of a single team: 1 + number of teams strictly ahead of it.
+    The filter is a range over the (total_point, last_solve) index, so it does not
+    touch the rest of the table like a full ranking would.
+    """
+    return Team.objects.filter(ahead_of(team.total_point, team.last_solve)).count() + 1
+
+def resolve_rank(serializer, instance):
+    """
+    Rank lookup shared by the team serializers:
+    - rows annotated by with_rank() already carry it
+    - list serializations compute the whole rank map once and keep it in the context
+    - a single object falls back to team_rank()
+    """
+    rank = getattr(instance, 'rank', None)
+    if rank is not None:
+        return rank
+    
+    if isinstance(serializer.parent, ListSerializer):
+        context = serializer.context
+        if 'ranks' not in context:
+            context['ranks'] = rank_map()
+        return context['ranks'].get(instance.id)
+    
+    return team_rank(instance)
@@ -0,0 +1,143 @@
+from django.db.models import F, Sum, Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from team.models import Team
+from django.db import transaction
+
+from challenge.models import Challenge, ChallengeSolve, TeamSolve
+from challenge.scoring import refresh_challenge_value
+from .cache import bump_version
+from .timeline import append_point, append_current_scores
+from .live import schedule_scores, schedule_refresh
+
+'''
+Team scores are materialized on the Team row (total_point, solve_count, last_solve)
+so the scoreboard never has to aggregate ChallengeSolve per team.
+
+claim_solve()    -> the submit path: TeamSolve insert-or-conflict, ChallengeSolve, record_solve
+record_solve()   -> called in the same transaction as the ChallengeSolve insert
+recompute_teams() -> set-based rebuild, used when membership / challenges change
+                     (TeamSolve rows are re-derived along with the totals)
+apply_point_change() -> set-based delta when a solved challenge changes value
+'''
+
+def claim_solve(user, challenge_id):
+    """
+    Record a correct submission of the user's team in one transaction.
+    The TeamSolve insert either wins the team's (team, challenge) slot or finds it taken,
+    so teammates submitting at the same moment cannot both score.
+    Returns None when the solve was recorded, otherwise the id of the user holding the slot.
+    """
+    with transaction.atomic():
+        # Lock the challenge so concurrent solves re-evaluate its value one after another
+        challenge = Challenge.objects.select_for_update().get(pk=challenge_id)
+        team_solve, created = TeamSolve.objects.get_or_create(team=user.team, challenge=challenge, defaults={'user': user})
+        if not created:
+            return team_solve.user_id
+        solve = ChallengeSolve.objects.create(user=user, challenge=challenge, solved_at=team_solve.solved_at)
+        record_solve(user.team, challenge, solve.solved_at)
+    return None
+
+def record_solve(team, challenge, solved_at):
+    """
+    Add a freshly inserted solve to the team's materialized totals, then let the
+    scoring function re-evaluate the challenge (dynamic scoring shifts every solver).
+    Must be called inside the transaction that created the ChallengeSolve,
+    with the challenge row locked.
+    """
+    updated = Team.objects.filter(pk=team.pk).update(
+        total_point=F('total_point') + challenge.point,
+        solve_count=F('solve_count') + 1,
+        last_solve=solved_at,
+    )
+    rescored = refresh_challenge_value(challenge, timestamp=solved_at)
+    bump_version()
+    if not rescored:
+        # Otherwise apply_point_change already recorded and announced every solver, this team included
+        total_point = Team.objects.filter(pk=team.pk).values_list('total_point', flat=True).get()
+        append_point(team.pk, solved_at, total_point)
+        schedule_scores([team.pk])
+    return updated
+
+def _team_solves(aggregate):
+    # Correlated subquery: one aggregate over the solves of the outer team's members
+    solves = (
+        ChallengeSolve.objects
+        .filter(user__team=OuterRef('pk'))
+        .order_by()
+        .values('user__team')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+    return Subquery(solves)
+
+def sync_team_solves(team_ids=None):
+    """Re-derive TeamSolve (first solve per team and challenge) from the members' ChallengeSolve rows."""
+    team_solves = TeamSolve.objects.all() if team_ids is None else TeamSolve.objects.filter(team__in=team_ids)
+    team_solves.delete()
+    
+    solves = ChallengeSolve.objects.filter(user__team__isnull=False)
+    if team_ids is not None:
+        solves = solves.filter(user__team__in=team_ids)
+    first = {}
+    for team_id, challenge_id, user_id, solved_at in solves.order_by('-solved_at', '-id').values_list('user__team', 'challenge', 'user', 'solved_at').iterator(chunk_size=2000):
+        # Latest first, so the earliest solve is the one left in the dict
+        first[team_id, challenge_id] = TeamSolve(team_id=team_id, challenge_id=challenge_id, user_id=user_id, solved_at=solved_at)
+    TeamSolve.objects.bulk_create(first.values(), batch_size=1000)
+
+def recompute_teams(team_ids=None):
+    """
+    Re-derive the materialized totals from ChallengeSolve with a single UPDATE.
+    team_ids=None rebuilds every team. For specific teams the new totals are also
+    appended to the timeline, since membership changes move the score without a solve.
+    """
+    sync_team_solves(team_ids)
+    teams = Team.objects.all() if team_ids is None else Team.objects.filter(pk__in=team_ids)
+    updated = teams.update(
+        total_point=Coalesce(_team_solves(Sum('challenge__point')), 0),
+        solve_count=Coalesce(_team_solves(Count('id')), 0),
+        last_solve=_team_solves(Max('solved_at')),
+    )
+    if team_ids is not None:
+        append_current_scores(team_ids, timezone.now())
+        schedule_scores(team_ids)
+    else:
+        schedule_refresh()
+    bump_version()
+    return updated
+
+def apply_point_change(challenge, delta, timestamp=None):
+    """
+    Shift the totals of every team holding a solve of `challenge` by `delta` per solve,
+    in a single UPDATE (no per-team round trips, however many teams solved it).
+    The new totals of those teams are appended to the timeline at `timestamp` (default now).
+    """
+    solves = (
+        ChallengeSolve.objects
+        .filter(challenge=challenge, user__team=OuterRef('pk'))
+        .order_by()
+        .values('user__team')
+        .annotate(value=Count('id'))
+        .values('value')
+    )
+    updated = Team.objects.filter(
+        pk__in=ChallengeSolve.objects.filter(challenge=challenge).values('user__team')
+    ).update(total_point=F('total_point') + Subquery(solves) * delta)
+    team_ids = teams_affected_by_challenge(challenge)
+    append_current_scores(team_ids, timestamp or timezone.now())
+    bump_version()
+    schedule_scores(team_ids)
+    return updated
+
+def teams_affected_by_challenge(challenge):
+    """Ids of the teams whose members solved the given challenge."""
+    return list(
+        ChallengeSolve.objects
+        .filter(challenge=challenge, user__team__isnull=False)
+        .values_list('user__team', flat=True)
+        .distinct()
+    )
+
+def scoreboard_queryset():
+    return Team.objects.order_by('-total_point', F('last_solve').asc(nulls_last=True), 'id')
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from team.models import Team
+from challenge.models import Category, Challenge
+from .cache import bump_version
+from .live import schedule_refresh
+
+# Teams appearing, disappearing or being renamed change the scoreboard too.
+# Score changes go through leaderboard.scoring, which bumps the version itself.
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def team_changed(sender, instance, **kwargs):
+    bump_version()
+    schedule_refresh()
+
+# Category boards depend on the category list and on which category each challenge is in
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+def category_changed(sender, instance, **kwargs):
+    bump_version()
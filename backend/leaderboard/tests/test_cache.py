@@ -0,0 +1,45 @@
+from .test_setup import TestSetUp
+from django.core.cache import cache
+from leaderboard.cache import current_version
+
+class LeaderboardSnapshotTest(TestSetUp):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+    
+    def get_leaderboard(self, **headers):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        return self.client.get(self.leaderboard_url, **headers)
+    
+    def test_response_carries_version_etag(self):
+        res = self.get_leaderboard()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res['ETag'], f'"{current_version()}"')
+    
+    def test_matching_if_none_match_returns_304(self):
+        etag = self.get_leaderboard()['ETag']
+        res = self.get_leaderboard(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+    
+    def test_solve_bumps_version_and_refreshes_snapshot(self):
+        res1 = self.get_leaderboard()
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        
+        res2 = self.get_leaderboard(HTTP_IF_NONE_MATCH=res1['ETag'])
+        self.assertEqual(res2.status_code, 200)
+        self.assertNotEqual(res1['ETag'], res2['ETag'])
+        self.assertEqual(res2.json()[0]['total_point'], 100)
+    
+    def test_wrong_flag_keeps_version(self):
+        version = current_version()
+        self.submit(self.user1_token, self.chall1, 'flag{wrong}')
+        self.assertEqual(current_version(), version)
+    
+    def test_snapshot_hit_does_not_query_teams(self):
+        self.get_leaderboard()
+        self.authenticate(self.user3_token)
+        # the version read only
+        with self.assertNumQueries(1):
+            res = self.client.get(self.leaderboard_url)
+        self.assertEqual(res.status_code, 200)
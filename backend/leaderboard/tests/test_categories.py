@@ -0,0 +1,45 @@
+from .test_setup import TestSetUp
+from django.core.cache import cache
+from django.urls import reverse
+from challenge.models import Category, Challenge
+from leaderboard.categories import build_category_boards
+
+class CategoryLeaderboardTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.crypto = Category.objects.create(name='crypto')
+        self.chall3 = Challenge.objects.create(title='chall3', category=self.crypto, flag='flag{three}', difficulty=1, description='three', point=250, author=self.admin)
+    
+    def get_board(self, name, **headers):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        return self.client.get(reverse('category_leaderboard', kwargs={'category_name': name}), **headers)
+    
+    def test_boards_are_built_with_one_grouped_query(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall3, 'flag{three}')
+        # grouped aggregate, category ids, team names, category names
+        with self.assertNumQueries(4):
+            boards = build_category_boards()
+        self.assertEqual(set(boards), {'web', 'crypto'})
+    
+    def test_category_board_ranks_only_that_category(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.submit(self.user2_token, self.chall3, 'flag{three}')
+        
+        web = self.get_board('Web').json()
+        self.assertEqual([(row['name'], row['total_point'], row['rank']) for row in web], [('teamone', 400, 1)])
+        crypto = self.get_board('crypto').json()
+        self.assertEqual([(row['name'], row['total_point'], row['rank']) for row in crypto], [('teamtwo', 250, 1)])
+    
+    def test_board_is_versioned_like_the_scoreboard(self):
+        res = self.get_board('web')
+        self.assertEqual(res.json(), [])
+        self.assertEqual(self.get_board('web', HTTP_IF_NONE_MATCH=res['ETag']).status_code, 304)
+        
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.assertEqual(self.get_board('web', HTTP_IF_NONE_MATCH=res['ETag']).status_code, 200)
+    
+    def test_unknown_category(self):
+        self.assertEqual(self.get_board('pwn').status_code, 404)
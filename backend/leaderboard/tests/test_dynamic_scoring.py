@@ -0,0 +1,87 @@
+from .test_setup import TestSetUp
+from unittest import mock
+from django.urls import reverse
+from challenge.scoring import challenge_value, linear, logarithmic
+from team.models import Team
+
+LINEAR = {'function': 'linear', 'minimum_point': 50, 'decay': 20}
+
+class ScoringFunctionTest(TestSetUp):
+    def test_first_solver_gets_the_initial_value(self):
+        for function in ('static', 'linear', 'logarithmic'):
+            self.assertEqual(challenge_value(500, 1, {'function': function, 'minimum_point': 100, 'decay': 10}), 500)
+    
+    def test_decay_never_goes_below_minimum(self):
+        self.assertEqual(linear(500, 100, 50, 100), 100)
+        self.assertEqual(logarithmic(500, 100, 10, 10), 100)
+        self.assertEqual(logarithmic(500, 100, 10, 500), 100)
+    
+    def test_logarithmic_is_monotonic(self):
+        values = [logarithmic(500, 100, 30, solves) for solves in range(40)]
+        self.assertEqual(values, sorted(values, reverse=True))
+    
+    def test_unknown_function_is_rejected(self):
+        with self.assertRaises(ValueError):
+            challenge_value(500, 1, {'function': 'quadratic'})
+
+class DynamicScoringTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        config = mock.patch('challenge.scoring.get_scoring_config', return_value=LINEAR)
+        config.start()
+        self.addCleanup(config.stop)
+        
+        self.team3 = Team.objects.create(name='teamthree', token='token-three', leader=self.user3)
+        self.user3.team = self.team3
+        self.user3.save()
+    
+    def totals(self):
+        return {team.id: team.total_point for team in Team.objects.all()}
+    
+    def test_every_solver_is_rescored_on_new_solve(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.assertEqual(self.totals()[self.team1.id], 100)
+        
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.submit(self.user3_token, self.chall1, 'flag{one}')
+        
+        self.chall1.refresh_from_db()
+        self.assertEqual(self.chall1.point, 60)
+        self.assertEqual(self.chall1.initial_point, 100)
+        totals = self.totals()
+        self.assertEqual([totals[self.team1.id], totals[self.team2.id], totals[self.team3.id]], [60, 60, 60])
+    
+    def test_timeline_ends_at_the_decayed_totals(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.submit(self.user3_token, self.chall1, 'flag{one}')
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        series = self.client.get(reverse('leaderboard_timeline')).json()
+        ends = {team['id']: team['points'][-1]['score'] for team in series}
+        self.assertEqual(ends, {team_id: total for team_id, total in self.totals().items() if total})
+        self.assertEqual(ends[self.team1.id], 360)
+    
+    def test_admin_edit_of_initial_value_rescales_solvers(self):
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.login(self.admin))
+        res = self.client.put(reverse('edit_challenge', kwargs={'challenge_id': self.chall2.id}), {'point': 500}, format="json")
+        self.assertEqual(res.status_code, 200)
+        
+        self.chall2.refresh_from_db()
+        self.assertEqual((self.chall2.initial_point, self.chall2.point), (500, 480))
+        self.assertEqual(self.totals()[self.team1.id], 480)
+    
+    def test_resubmitting_current_value_keeps_initial_value(self):
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.chall2.refresh_from_db()
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.login(self.admin))
+        self.client.put(reverse('edit_challenge', kwargs={'challenge_id': self.chall2.id}), {'point': self.chall2.point, 'description': 'new'}, format="json")
+        
+        self.chall2.refresh_from_db()
+        self.assertEqual((self.chall2.initial_point, self.chall2.point), (300, 280))
@@ -0,0 +1,145 @@
+from .test_setup import TestSetUp
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from leaderboard import freeze
+
+class ScoreboardFreezeTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        freeze._frozen.clear()
+        self.addCleanup(freeze._frozen.clear)
+        self.admin_token = self.login(self.admin)
+        
+        # team2 leads before the freeze, team1 overtakes it afterwards
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        patcher = mock.patch('leaderboard.freeze.get_freeze_time', return_value=timezone.now())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+    
+    def get_leaderboard(self, token, **params):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        return self.client.get(self.leaderboard_url, params)
+    
+    def test_players_see_standings_at_freeze_time(self):
+        res = self.get_leaderboard(self.user3_token)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([(row['name'], row['total_point'], row['rank']) for row in res.json()], [('teamtwo', 100, 1), ('teamone', 0, 2)])
+        self.assertTrue(res['ETag'].startswith('"frozen-'))
+    
+    def test_admins_keep_the_live_scoreboard(self):
+        res = self.get_leaderboard(self.admin_token)
+        self.assertEqual([row['name'] for row in res.json()], ['teamone', 'teamtwo'])
+        self.assertEqual(res.json()[0]['total_point'], 300)
+    
+    def test_frozen_scoreboard_is_served_without_scoreboard_queries(self):
+        self.get_leaderboard(self.user3_token)
+        self.authenticate(self.user3_token)
+        with self.assertNumQueries(0):
+            self.client.get(self.leaderboard_url)
+        with self.assertNumQueries(0):
+            self.client.get(self.leaderboard_url, {'limit': 1})
+    
+    def test_frozen_around_me_and_pages(self):
+        res = self.get_leaderboard(self.user1_token, around='me', k=1)
+        self.assertEqual(res.json()['rank'], 2)
+        
+        page1 = self.get_leaderboard(self.user3_token, limit=1).json()
+        page2 = self.get_leaderboard(self.user3_token, limit=1, cursor=page1['next']).json()
+        self.assertEqual([page1['results'][0]['name'], page2['results'][0]['name']], ['teamtwo', 'teamone'])
+        self.assertIsNone(page2['next'])
+    
+    def test_frozen_pages_are_memoized_by_position(self):
+        from leaderboard.pagination import encode_key
+        self.get_leaderboard(self.user3_token, limit=1)
+        scoreboard = freeze.get_frozen_scoreboard(freeze.get_freeze_time())
+        before = len(scoreboard.blobs)
+        # Cursors differing only in their score, or naming unknown teams, land on the same pages
+        for total_point in range(20):
+            self.get_leaderboard(self.user3_token, limit=1, cursor=encode_key(total_point, None, self.team2.id))
+            self.get_leaderboard(self.user3_token, limit=1, cursor=encode_key(total_point, None, 10_000 + total_point))
+        self.assertEqual(len(scoreboard.blobs), before + 2)
+        
+        with mock.patch.object(freeze, 'FROZEN_BLOBS_SIZE', 2):
+            for limit in range(1, 6):
+                self.get_leaderboard(self.user3_token, limit=limit)
+            self.assertEqual(len(scoreboard.blobs), 2)
+    
+    def test_team_views_show_frozen_rank(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        res = self.client.get('/teams/me/')
+        self.assertEqual((res.json()['rank'], res.json()['total_point']), (2, 0))
+        self.assertEqual(res.json()['solves'], [])
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token)
+        res = self.client.get(f'/teams/{self.team1.id}/')
+        self.assertEqual((res.json()['rank'], res.json()['total_point']), (1, 300))
+    
+    def test_member_and_solver_totals_agree_with_the_freeze(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        team = self.client.get(f'/teams/{self.team1.id}/').json()
+        self.assertEqual((team['total_point'], team['members'][0]['total_point']), (0, 0))
+        
+        users = {row['username']: row['total_point'] for row in self.client.get('/users/').json()}
+        self.assertEqual((users['testuser1'], users['testuser2']), (0, 100))
+        
+        res = self.client.get('/challenges/')
+        challenges = {row['title']: [user['username'] for user in row['solved_by']] for row in res.json()}
+        self.assertEqual(challenges, {'chall1': ['testuser2'], 'chall2': []})
+        detail = self.client.get(f'/challenges/{self.chall2.id}/').json()
+        self.assertEqual(detail['solved_by'], [])
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token)
+        team = self.client.get(f'/teams/{self.team1.id}/').json()
+        self.assertEqual((team['total_point'], team['members'][0]['total_point']), (300, 300))
+    
+    def test_standings_keep_the_values_at_freeze_time(self):
+        # chall1 decays once teamone solves it after the freeze
+        config = mock.patch('challenge.scoring.get_scoring_config', return_value={'function': 'linear', 'minimum_point': 50, 'decay': 20})
+        config.start()
+        self.addCleanup(config.stop)
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.team2.refresh_from_db()
+        self.assertEqual(self.team2.total_point, 80)
+        
+        with mock.patch('leaderboard.freeze.get_scoring_config', return_value={'function': 'linear', 'minimum_point': 50, 'decay': 20}):
+            res = self.get_leaderboard(self.user3_token)
+        self.assertEqual([(row['name'], row['total_point']) for row in res.json()], [('teamtwo', 100), ('teamone', 0)])
+        team = self.client.get(f'/teams/{self.team2.id}/').json()
+        self.assertEqual((team['total_point'], team['members'][0]['total_point']), (100, 100))
+        board = self.client.get(reverse('category_leaderboard', kwargs={'category_name': 'web'})).json()
+        self.assertEqual([(row['name'], row['total_point']) for row in board], [('teamtwo', 100)])
+    
+    def test_challenges_show_their_value_at_freeze_time(self):
+        linear = {'function': 'linear', 'minimum_point': 50, 'decay': 20}
+        config = mock.patch('challenge.scoring.get_scoring_config', return_value=linear)
+        config.start()
+        self.addCleanup(config.stop)
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        
+        with mock.patch('leaderboard.freeze.get_scoring_config', return_value=linear):
+            self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+            board = {row['title']: (row['point'], row['solve_count']) for row in self.client.get('/challenges/', {'view': 'board'}).json()}
+            listed = {row['title']: row['point'] for row in self.client.get('/challenges/').json()}
+            detail = self.client.get(f'/challenges/{self.chall1.id}/').json()
+        self.assertEqual(board['chall1'], (100, 1))
+        self.assertEqual(listed['chall1'], 100)
+        self.assertEqual(detail['point'], 100)
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token)
+        board = {row['title']: row['point'] for row in self.client.get('/challenges/', {'view': 'board'}).json()}
+        self.assertEqual(board['chall1'], 80)
+    
+    def test_live_deltas_only_reach_admins_while_frozen(self):
+        from leaderboard.live import SCOREBOARD_ADMIN_GROUP
+        
+        with mock.patch('leaderboard.live.async_to_sync') as async_to_sync:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.submit(self.user1_token, self.chall1, 'flag{one}')
+        
+        group, message = async_to_sync.return_value.call_args.args
+        self.assertEqual(group, SCOREBOARD_ADMIN_GROUP)
+        self.assertEqual(message['type'], 'scoreboard.delta')
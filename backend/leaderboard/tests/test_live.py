@@ -0,0 +1,48 @@
+from .test_setup import TestSetUp
+import json
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from leaderboard.live import SCOREBOARD_GROUP
+
+class ScoreboardBroadcastTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.channel_layer = get_channel_layer()
+        self.channel_name = async_to_sync(self.channel_layer.new_channel)()
+        async_to_sync(self.channel_layer.group_add)(SCOREBOARD_GROUP, self.channel_name)
+        self.addCleanup(async_to_sync(self.channel_layer.group_discard), SCOREBOARD_GROUP, self.channel_name)
+    
+    def receive(self):
+        return async_to_sync(self.channel_layer.receive)(self.channel_name)
+    
+    def test_solve_broadcasts_one_delta_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.assertEqual(len(callbacks), 1)
+        
+        message = self.receive()
+        self.assertEqual(message['type'], 'scoreboard.delta')
+        delta = json.loads(message['text'])
+        self.team1.refresh_from_db()
+        last_solve = self.team1.last_solve.isoformat().replace('+00:00', 'Z')
+        self.assertEqual(delta['teams'], [{'id': self.team1.id, 'name': 'teamone', 'total_point': 100, 'solve_count': 1, 'last_solve': last_solve, 'rank': 1}])
+    
+    def test_deltas_carry_what_clients_need_to_rerank(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        rows = {row['id']: row for row in self.client.get(self.leaderboard_url).json()}
+        
+        for token, challenge, flag in ((self.user1_token, self.chall1, 'flag{one}'), (self.user2_token, self.chall2, 'flag{two}')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.submit(token, challenge, flag)
+            for row in json.loads(self.receive()['text'])['teams']:
+                rows[row['id']] = row
+        
+        # teamone was overtaken without a message of its own, ranking the rows locally agrees with the API
+        order = sorted(rows.values(), key=lambda row: (-row['total_point'], row['last_solve'] is None, row['last_solve'] or ''))
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        self.assertEqual([row['id'] for row in order], [row['id'] for row in self.client.get(self.leaderboard_url).json()])
+    
+    def test_wrong_flag_broadcasts_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.submit(self.user1_token, self.chall1, 'flag{wrong}')
+        self.assertEqual(len(callbacks), 0)
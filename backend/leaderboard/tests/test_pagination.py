@@ -0,0 +1,77 @@
+from .test_setup import TestSetUp
+from datetime import timedelta
+from django.utils import timezone
+from team.models import Team
+from user.models import User
+from leaderboard.pagination import page, around, encode_cursor, decode_cursor
+from leaderboard.ranking import rank_map
+from leaderboard.scoring import scoreboard_queryset
+
+class KeysetPaginationTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        # 25 teams with plenty of ties on both score and last solve time
+        now = timezone.now()
+        for i in range(25):
+            leader = User.objects.create_user(username=f'leader{i}', email=f'leader{i}@example.com', password='Password123#!@')
+            Team.objects.create(
+                name=f'team{i}', token=f'token{i}', leader=leader,
+                total_point=(i % 5) * 100,
+                last_solve=None if i % 5 == 0 else now - timedelta(minutes=i % 3),
+            )
+    
+    def walk(self, limit):
+        rows, cursor_key = [], None
+        while True:
+            teams, next_cursor = page(cursor_key, limit)
+            rows.extend(teams)
+            if next_cursor is None:
+                return rows
+            cursor_key = decode_cursor(next_cursor)
+    
+    def test_pages_cover_the_scoreboard_in_order(self):
+        expected = list(scoreboard_queryset().values_list('id', flat=True))
+        for limit in (1, 4, 7, 100):
+            self.assertEqual([team.id for team in self.walk(limit)], expected)
+    
+    def test_page_ranks_match_window_ranks(self):
+        ranks = rank_map()
+        for team in self.walk(6):
+            self.assertEqual(team.rank, ranks[team.id])
+    
+    def test_cursor_round_trip(self):
+        team = scoreboard_queryset().first()
+        self.assertEqual(decode_cursor(encode_cursor(team)), (team.total_point, team.last_solve, team.id))
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+    
+    def test_around_returns_neighbours(self):
+        ordered = list(scoreboard_queryset())
+        ranks = rank_map()
+        middle = ordered[12]
+        teams = around(middle, 3)
+        self.assertEqual([team.id for team in teams], [team.id for team in ordered[9:16]])
+        for team in teams:
+            self.assertEqual(team.rank, ranks[team.id])
+    
+    def test_around_me_endpoint(self):
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        res = self.client.get(self.leaderboard_url, {'around': 'me', 'k': 2})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['rank'], rank_map()[self.team1.id])
+        self.assertIn(self.team1.id, [row['id'] for row in res.json()['results']])
+        self.assertLessEqual(len(res.json()['results']), 5)
+    
+    def test_paginated_endpoint(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        res = self.client.get(self.leaderboard_url, {'limit': 10})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()['results']), 10)
+        
+        res2 = self.client.get(self.leaderboard_url, {'limit': 10, 'cursor': res.json()['next']})
+        self.assertGreaterEqual(res2.json()['results'][0]['rank'], res.json()['results'][-1]['rank'])
+        
+        res3 = self.client.get(self.leaderboard_url, {'cursor': 'garbage'})
+        self.assertEqual(res3.status_code, 400)
@@ -0,0 +1,44 @@
+from .test_setup import TestSetUp
+from team.models import Team
+from leaderboard.ranking import with_rank, rank_map, team_rank
+from leaderboard.scoring import scoreboard_queryset
+
+class RankingTest(TestSetUp):
+    def test_earlier_last_solve_wins_the_tie(self):
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        
+        ranks = rank_map()
+        self.assertEqual(ranks[self.team2.id], 1)
+        self.assertEqual(ranks[self.team1.id], 2)
+    
+    def test_single_team_rank_matches_window_rank(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        user3_team = Team.objects.create(name='teamthree', token='token-three', leader=self.user3)
+        
+        ranks = rank_map()
+        for team in Team.objects.all():
+            self.assertEqual(team_rank(team), ranks[team.id])
+        self.assertEqual(ranks[user3_team.id], 3)
+    
+    def test_teams_without_solves_share_the_last_rank(self):
+        ranks = rank_map()
+        self.assertEqual(ranks[self.team1.id], ranks[self.team2.id])
+    
+    def test_leaderboard_serialization_is_a_single_query(self):
+        from team.serializers import TeamListSerializer
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        Team.objects.create(name='teamthree', token='token-three', leader=self.user3)
+        
+        with self.assertNumQueries(1):
+            data = TeamListSerializer(with_rank(scoreboard_queryset()), many=True).data
+        self.assertEqual([row['rank'] for row in data], [1, 2, 2])
+    
+    def test_my_team_rank(self):
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        res = self.client.get('/teams/me/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['rank'], 2)
@@ -0,0 +1,65 @@
+from .test_setup import TestSetUp
+from django.core.management import call_command
+from io import StringIO
+from django.urls import reverse
+from team.models import Team
+from leaderboard.scoring import recompute_teams
+
+class MaterializedScoreTest(TestSetUp):
+    def test_correct_submission_updates_team_totals(self):
+        res = self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.assertEqual(res.status_code, 200)
+        
+        self.team1.refresh_from_db()
+        self.assertEqual(self.team1.total_point, 100)
+        self.assertEqual(self.team1.solve_count, 1)
+        self.assertIsNotNone(self.team1.last_solve)
+    
+    def test_wrong_submission_does_not_change_totals(self):
+        res = self.submit(self.user1_token, self.chall1, 'flag{wrong}')
+        self.assertEqual(res.status_code, 400)
+        
+        self.team1.refresh_from_db()
+        self.assertEqual(self.team1.total_point, 0)
+        self.assertEqual(self.team1.solve_count, 0)
+    
+    def test_rebuild_matches_incremental_totals(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        expected = {team.id: (team.total_point, team.solve_count, team.last_solve) for team in Team.objects.all()}
+        
+        Team.objects.update(total_point=0, solve_count=0, last_solve=None)
+        call_command('rebuild_scoreboard', stdout=StringIO())
+        rebuilt = {team.id: (team.total_point, team.solve_count, team.last_solve) for team in Team.objects.all()}
+        self.assertEqual(expected, rebuilt)
+        self.assertEqual(rebuilt[self.team1.id][0], 400)
+    
+    def test_joining_member_brings_solves_to_new_team(self):
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        
+        # user1 leaves (team1 is dropped) and joins team2
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        self.client.post(reverse('leave_team'), format="json")
+        res = self.client.post(reverse('join_team', kwargs={'token': self.team2.token}), format="json")
+        self.assertEqual(res.status_code, 200)
+        
+        self.team2.refresh_from_db()
+        self.assertEqual(self.team2.total_point, 300)
+        self.assertEqual(self.team2.solve_count, 1)
+    
+    def test_leaderboard_is_ordered_by_materialized_score(self):
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        res = self.client.get(self.leaderboard_url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([row['name'] for row in res.json()], ['teamone', 'teamtwo'])
+        self.assertEqual(res.json()[0]['total_point'], 300)
+    
+    def test_recompute_only_touches_given_teams(self):
+        Team.objects.filter(pk=self.team2.pk).update(total_point=999)
+        recompute_teams([self.team1.id])
+        self.team2.refresh_from_db()
+        self.assertEqual(self.team2.total_point, 999)
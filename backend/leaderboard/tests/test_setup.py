@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from unittest import mock
+from log.buffer import SubmissionBuffer
+from challenge.phase import RUNNING
+from challenge.models import Category, Challenge
+from team.models import Team
+from user.models import User
+from user.authentication import CachedTokenAuthentication, token_cache
+
+class TestSetUp(APITestCase):
+    def setUp(self):
+        self.leaderboard_url = reverse('leaderboard')
+        
+        # challenge routes are gated by the event phase from config.yml, pretend the CTF is running
+        phase = mock.patch('challenge.middleware.current_phase', return_value=RUNNING)
+        # and that no scoreboard freeze is configured
+        self.freeze_time = mock.patch('leaderboard.freeze.get_freeze_time', return_value=None)
+        # incorrect attempts stay buffered until a test flushes them, no background thread
+        self.submission_buffer = SubmissionBuffer(flush_ms=0)
+        submission_log = mock.patch('log.buffer.submission_buffer', self.submission_buffer)
+        for patcher in (phase, self.freeze_time, submission_log):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # authenticated tokens are cached per process, start every test cold
+        token_cache.clear()
+        # so are snapshots keyed by a version that restarts with every test's database
+        cache.clear()
+        
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='Password123#!@', role='admin', is_staff=True)
+        self.user1 = User.objects.create_user(username='testuser1', email='testuser1@example.com', password='Password123#!@')
+        self.user2 = User.objects.create_user(username='testuser2', email='testuser2@example.com', password='Password123#!@')
+        self.user3 = User.objects.create_user(username='testuser3', email='testuser3@example.com', password='Password123#!@')
+        
+        self.team1 = Team.objects.create(name='teamone', token='token-one', leader=self.user1)
+        self.team2 = Team.objects.create(name='teamtwo', token='token-two', leader=self.user2)
+        for user, team in ((self.user1, self.team1), (self.user2, self.team2)):
+            user.team = team
+            user.save()
+        
+        self.category = Category.objects.create(name='web')
+        self.chall1 = Challenge.objects.create(title='chall1', category=self.category, flag='flag{one}', difficulty=1, description='one', point=100, author=self.admin)
+        self.chall2 = Challenge.objects.create(title='chall2', category=self.category, flag='flag{two}', difficulty=2, description='two', point=300, author=self.admin)
+        
+        self.user1_token = self.login(self.user1)
+        self.user2_token = self.login(self.user2)
+        self.user3_token = self.login(self.user3)
+        
+        return super().setUp()
+    
+    def login(self, user):
+        res = self.client.post(reverse('login'), {'username': user.username, 'password': 'Password123#!@'}, format="json")
+        return res.json().get('token')
+    
+    def authenticate(self, token):
+        """Use token for the next requests, with its lookup already in the auth cache."""
+        CachedTokenAuthentication().authenticate_credentials(token.encode())
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+    
+    def submit(self, token, challenge, flag):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        return self.client.post(reverse('submit_flag', kwargs={'challenge_id': challenge.id}), {'flag': flag}, format="json")
+    
+    def tearDown(self):
+        return super().tearDown()
@@ -0,0 +1,45 @@
+from .test_setup import TestSetUp
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from leaderboard.models import ScorePoint
+from leaderboard.timeline import downsample
+
+class TimelineTest(TestSetUp):
+    def series(self, team):
+        return list(ScorePoint.objects.filter(team=team).order_by('timestamp', 'id').values_list('score', flat=True))
+    
+    def test_each_solve_appends_cumulative_point(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.assertEqual(self.series(self.team1), [100, 400])
+    
+    def test_backfill_rebuilds_the_same_series(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        
+        call_command('backfill_timeline', stdout=StringIO())
+        self.assertEqual(self.series(self.team1), [100, 400])
+        self.assertEqual(self.series(self.team2), [300])
+    
+    def test_downsample_keeps_bounds_and_last_score(self):
+        start = timezone.now()
+        points = [(start + timedelta(minutes=i), i * 10) for i in range(1000)]
+        thinned = downsample(points, 50)
+        self.assertLessEqual(len(thinned), 50)
+        self.assertEqual(thinned[0], points[0])
+        self.assertEqual(thinned[-1], points[-1])
+    
+    def test_timeline_endpoint_returns_top_teams(self):
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user3_token)
+        res = self.client.get(reverse('leaderboard_timeline'), {'top': 1})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()), 1)
+        self.assertEqual(res.json()[0]['name'], 'teamtwo')
+        self.assertEqual(res.json()[0]['points'][-1]['score'], 300)
@@ -0,0 +1,84 @@
+from team.models import Team
+from challenge.models import ChallengeSolve
+from .models import ScorePoint
+
+'''
+Score-over-time store.
+
+Each recorded solve appends (team, timestamp, cumulative score) to ScorePoint,
+so drawing the graph only reads the points of the top N teams and thins them out.
+'''
+
+BACKFILL_BATCH_SIZE = 2000
+
+def append_point(team_id, timestamp, score):
+    return ScorePoint.objects.create(team_id=team_id, timestamp=timestamp, score=score)
+
+def append_current_scores(team_ids, timestamp):
+    """Snapshot the current materialized totals of the given teams (e.g. after a membership change)."""
+    ScorePoint.objects.bulk_create([
+        ScorePoint(team_id=team_id, timestamp=timestamp, score=score)
+        for team_id, score in Team.objects.filter(pk__in=team_ids).values_list('id', 'total_point')
+    ])
+
+def downsample(points, max_points):
+    """
+    Keep at most max_points (timestamp, score) pairs, evenly spread over the series' time span.
+    Scores are step functions, so the last point of every bucket is the one worth keeping;
+    the very first point is kept as well so the line starts at the right place.
+    """
+    if len(points) <= max_points:
+        return points
+    
+    start, end = points[0][0], points[-1][0]
+    span = (end - start).total_seconds() or 1
+    buckets = {}
+    for timestamp, score in points[1:]:
+        bucket = min(int((timestamp - start).total_seconds() / span * (max_points - 1)), max_points - 2)
+        buckets[bucket] = (timestamp, score)
+    return [points[0]] + [buckets[key] for key in sorted(buckets)]
+
+def top_series(team_ids, max_points, until=None):
+    """
+    {team_id: [(timestamp, score), ...]} for the given teams, read in one ordered query.
+    `until` drops the points recorded after that time (frozen scoreboard).
+    """
+    series = {team_id: [] for team_id in team_ids}
+    rows = ScorePoint.objects.filter(team_id__in=series.keys())
+    if until is not None:
+        rows = rows.filter(timestamp__lte=until)
+    rows = rows.order_by('team_id', 'timestamp', 'id').values_list('team_id', 'timestamp', 'score')
+    for team_id, timestamp, score in rows:
+        series[team_id].append((timestamp, score))
+    return {team_id: downsample(points, max_points) for team_id, points in series.items()}
+
+def backfill():
+    """
+    Rebuild the whole store from ChallengeSolve in one streaming pass ordered by solve time.
+    Solves are credited to the solver's current team, same as the materialized totals.
+    Returns the number of points written.
+    """
+    ScorePoint.objects.all().delete()
+    
+    totals = {}
+    batch = []
+    written = 0
+    solves = (
+        ChallengeSolve.objects
+        .filter(user__team__isnull=False)
+        .order_by('solved_at', 'id')
+        .values_list('user__team', 'solved_at', 'challenge__point')
+        .iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    )
+    for team_id, solved_at, point in solves:
+        totals[team_id] = totals.get(team_id, 0) + point
+        batch.append(ScorePoint(team_id=team_id, timestamp=solved_at, score=totals[team_id]))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            ScorePoint.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    
+    if batch:
+        ScorePoint.objects.bulk_create(batch)
+        written += len(batch)
+    return written
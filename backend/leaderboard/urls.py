@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path('', views.leaderboard, name='leaderboard'),
+    path('timeline/', views.timeline, name='leaderboard_timeline'),
+    path('category/<str:category_name>/', views.category_leaderboard, name='category_leaderboard'),
 ]
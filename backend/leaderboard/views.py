@@ -1,26 +1,207 @@
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
+from rest_framework.renderers import JSONRenderer
 from rest_framework import status
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
+from utils import etag_matches
 
 ## Import models and serializers
 from team.models import Team
 from team.serializers import TeamListSerializer
+from .scoring import scoreboard_queryset
+from .ranking import with_rank
+from .cache import current_version, get_snapshot
+from .timeline import top_series
+from .pagination import decode_cursor, encode_key, page, around
+from .freeze import frozen_scoreboard_for, frozen_timeline, total_point_args
+from .categories import build_category_boards
 
 ## Imports authorization mechanism
 from rest_framework.decorators import authentication_classes, permission_classes
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+PAGE_DEFAULT_LIMIT = 50
+PAGE_MAX_LIMIT = 200
+AROUND_DEFAULT_RADIUS = 5
+AROUND_MAX_RADIUS = 50
 
+TIMELINE_DEFAULT_TEAMS = 10
+TIMELINE_MAX_TEAMS = 50
+TIMELINE_DEFAULT_POINTS = 100
+TIMELINE_MAX_POINTS = 500
+
+def build_scoreboard():
+    # Totals are materialized on Team, so ordering and RANK() come from a single query
+    teams = with_rank(scoreboard_queryset())
+    serializer = TeamListSerializer(teams, many=True)
+    return JSONRenderer().render(serializer.data)
+
+def build_page(cursor_key, limit):
+    teams, next_cursor = page(cursor_key, limit)
+    return JSONRenderer().render({
+        'results': TeamListSerializer(teams, many=True).data,
+        'next': next_cursor,
+    })
+
+def build_around(team_id, radius):
+    # Re-read the team: the copy loaded with request.user may predate the current version
+    team = Team.objects.get(pk=team_id)
+    teams = around(team, radius)
+    me = next(row for row in teams if row.id == team.id)
+    return JSONRenderer().render({
+        'results': TeamListSerializer(teams, many=True).data,
+        'rank': me.rank,
+    })
+
+def build_timeline(top, max_points):
+    teams = list(scoreboard_queryset()[:top])
+    series = top_series([team.id for team in teams], max_points)
+    return JSONRenderer().render([
+        {
+            'id': team.id,
+            'name': team.name,
+            'points': [{'time': timestamp, 'score': score} for timestamp, score in series[team.id]],
+        } for team in teams
+    ])
+
+def build_frozen_page(scoreboard, cursor_key, limit):
+    rows, last = scoreboard.page(cursor_key, limit)
+    return JSONRenderer().render({
+        'results': rows,
+        'next': encode_key(last['total_point'], last['last_solve'], last['id']) if last else None,
+    })
+
+def build_frozen_around(scoreboard, team_id, radius):
+    rows, rank = scoreboard.around(team_id, radius)
+    return JSONRenderer().render({'results': rows, 'rank': rank})
+
+def conditional_response(request, etag, get_content):
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(get_content(), content_type='application/json', status=status.HTTP_200_OK)
+    
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+def scoreboard_response(request, name, build, build_frozen, frozen_name=None):
+    """
+    Live: the response only changes when the scoreboard version does, so it is
+    serialized once per version and clients revalidate with If-None-Match.
+    Frozen (players only): served from the immutable frozen snapshot, no query at all,
+    memoized under frozen_name(frozen) when given, else under name.
+    """
+    frozen = frozen_scoreboard_for(request.user)
+    if frozen is not None:
+        blob_name = frozen_name(frozen) if frozen_name else name
+        return conditional_response(request, frozen.etag, lambda: frozen.blob(blob_name, lambda: build_frozen(frozen)))
+    
+    version = current_version()
+    return conditional_response(request, f'"{version}"', lambda: get_snapshot(name, version, build))
+
+# ==============================
+# ======== LEADERBOARD =========
+# ==============================
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def leaderboard(request):
-    teams = Team.objects.all()
-    serializer = TeamListSerializer(teams, many=True)
+    """
+    Full scoreboard by default.
+    ?limit=N[&cursor=...]  -> keyset-paginated pages: {"results": [...], "next": cursor or null}
+    ?around=me[&k=K]       -> the requester's team and the K teams on either side
+    """
+    if 'around' in request.query_params:
+        return leaderboard_around(request)
+    if 'limit' in request.query_params or 'cursor' in request.query_params:
+        return leaderboard_page(request)
+    return scoreboard_response(request, 'scoreboard', build_scoreboard, lambda frozen: frozen.content)
+
+def leaderboard_page(request):
+    try:
+        limit = int(request.query_params.get('limit', PAGE_DEFAULT_LIMIT))
+    except ValueError:
+        return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, PAGE_MAX_LIMIT))
     
-    # Sort serialized data in Python
-    sorted_data = sorted(serializer.data, key=lambda x: x['total_point'], reverse=True)
+    cursor = request.query_params.get('cursor')
+    try:
+        cursor_key = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Frozen pages are memoized by where they start: any cursor maps to one of len(rows) + 1 positions
+    return scoreboard_response(
+        request, f'page:{cursor}:{limit}',
+        lambda: build_page(cursor_key, limit),
+        lambda frozen: build_frozen_page(frozen, cursor_key, limit),
+        frozen_name=lambda frozen: f'page:{frozen.start(cursor_key)}:{limit}',
+    )
 
-    return Response(sorted_data, status=status.HTTP_200_OK)
+def leaderboard_around(request):
+    if request.query_params.get('around') != 'me':
+        return Response({"error": "Only around=me is supported."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    team = request.user.team
+    if team is None:
+        return Response({"error": "You haven't joined a team."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        radius = int(request.query_params.get('k', AROUND_DEFAULT_RADIUS))
+    except ValueError:
+        return Response({"error": "k must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    radius = max(0, min(radius, AROUND_MAX_RADIUS))
+    
+    return scoreboard_response(
+        request, f'around:{team.id}:{radius}',
+        lambda: build_around(team.id, radius),
+        lambda frozen: build_frozen_around(frozen, team.id, radius),
+    )
+
+# ==============================
+# ==== CATEGORY LEADERBOARD ====
+# ==============================
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def category_leaderboard(request, category_name):
+    # All category boards are built by one grouped aggregate and cached together
+    frozen = frozen_scoreboard_for(request.user)
+    if frozen is not None:
+        etag = frozen.etag
+        get_boards = lambda: frozen.blob('categories', lambda: build_category_boards(**total_point_args(frozen)))
+    else:
+        version = current_version()
+        etag = f'"{version}"'
+        get_boards = lambda: get_snapshot('categories', version, build_category_boards)
+    
+    key = category_name.lower()
+    boards = None if etag_matches(request, etag) else get_boards()
+    if boards is not None and key not in boards:
+        return Response({'error': f'Category "{category_name}" not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return conditional_response(request, etag, lambda: boards[key])
+
+# ==============================
+# ===== SCORE OVER TIME ========
+# ==============================
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def timeline(request):
+    try:
+        top = int(request.query_params.get('top', TIMELINE_DEFAULT_TEAMS))
+        max_points = int(request.query_params.get('points', TIMELINE_DEFAULT_POINTS))
+    except ValueError:
+        return Response({"error": "top and points must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    top = max(1, min(top, TIMELINE_MAX_TEAMS))
+    max_points = max(2, min(max_points, TIMELINE_MAX_POINTS))
+    
+    return scoreboard_response(
+        request, f'timeline:{top}:{max_points}',
+        lambda: build_timeline(top, max_points),
+        lambda frozen: frozen_timeline(frozen, top, max_points),
+    )
@@ -0,0 +1,94 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import Submission
+
+'''
+Write-behind logging of incorrect flag submissions.
+
+Attempts are appended to an in-process buffer and written with one bulk_create by a
+background thread every SUBMISSION_LOG_FLUSH_MS, or as soon as SUBMISSION_LOG_BATCH_SIZE rows
+are waiting. Whatever is still buffered is flushed when the process exits.
+Correct submissions do not go through here: they are created in the solve's transaction.
+'''
+
+logger = logging.getLogger(__name__)
+
+class SubmissionBuffer:
+    def __init__(self, flush_ms=None, batch_size=None):
+        """flush_ms=0 disables the background thread, rows are then only written by flush() or a full batch."""
+        self.flush_interval = (settings.SUBMISSION_LOG_FLUSH_MS if flush_ms is None else flush_ms) / 1000
+        self.batch_size = settings.SUBMISSION_LOG_BATCH_SIZE if batch_size is None else batch_size
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.rows = []
+        self.thread = None
+        self.pid = os.getpid()
+
+    def add(self, submission):
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked worker: the parent's rows and thread are not ours
+                self.rows, self.thread, self.pid = [], None, os.getpid()
+            self.rows.append(submission)
+            full = len(self.rows) >= self.batch_size
+            if self.flush_interval and self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='submission-log', daemon=True)
+                self.thread.start()
+        
+        if full:
+            if self.thread is not None:
+                self.wakeup.set()
+            else:
+                self.flush()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing the submission log failed")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write every buffered row, returns how many were written."""
+        with self.lock:
+            rows, self.rows = self.rows, []
+        if not rows:
+            return 0
+        
+        # A user or challenge deleted while its attempts waited would fail the whole batch
+        rows = self.still_referenced(rows)
+        Submission.objects.bulk_create(rows, batch_size=self.batch_size)
+        return len(rows)
+
+    @staticmethod
+    def still_referenced(rows):
+        from challenge.models import Challenge
+        from team.models import Team
+        from user.models import User
+        
+        challenge_ids = set(Challenge.objects.filter(pk__in={row.challenge_id for row in rows}).values_list('pk', flat=True))
+        user_ids = set(User.objects.filter(pk__in={row.submitted_by_id for row in rows}).values_list('pk', flat=True))
+        team_ids = set(Team.objects.filter(pk__in={row.team_id for row in rows if row.team_id is not None}).values_list('pk', flat=True))
+        for row in rows:
+            # A deleted team only loses its attempts' team, as SET_NULL would have done
+            if row.team_id not in team_ids:
+                row.team_id = None
+        return [row for row in rows if row.challenge_id in challenge_ids and row.submitted_by_id in user_ids]
+
+submission_buffer = SubmissionBuffer()
+atexit.register(submission_buffer.flush)
+
+def log_incorrect_submission(challenge_id, user_id, team_id, flag):
+    # One over-long flag must not fail the whole batch
+    flag = flag[:Submission._meta.get_field('flag').max_length]
+    submission_buffer.add(Submission(challenge_id=challenge_id, submitted_by_id=user_id, team_id=team_id, flag=flag, status='incorrect'))
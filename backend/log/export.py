@@ -0,0 +1,127 @@
+import csv
+import json
+import zlib
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from challenge.models import ChallengeSolve
+from .models import Submission
+from .pagination import ROW_FIELDS
+
+'''
+Streaming exports of the submissions log and of the solves, as CSV or NDJSON, optionally gzipped.
+
+Rows are read with .iterator(chunk_size=...), a server-side cursor on PostgreSQL, and encoded
+one chunk at a time, so memory stays flat however large the tables are. Under ASGI the view
+hands the chunks out through async_chunks, daphne would read a sync iterator whole first.
+'''
+
+CHUNK_SIZE = 2000
+# Bytes of encoded rows per chunk (handed to the compressor at once when gzipped)
+GZIP_BATCH = 64 * 1024
+# Chunks read per trip to the database thread when streaming to an ASGI server
+ASYNC_BATCH = 16
+
+def submission_rows():
+    # Buffered attempts get their ids when flushed, time is the order they were made in
+    return Submission.objects.order_by('submittion_time', 'id').values(
+        'id', 'challenge_id', 'submitted_by_id', 'team_id', 'flag', 'status', 'submittion_time', **ROW_FIELDS,
+    )
+
+def solve_rows():
+    return ChallengeSolve.objects.order_by('id').values(
+        'id', 'challenge_id', 'user_id', 'solved_at',
+        challenge_name=F('challenge__title'),
+        username=F('user__username'),
+        team_id=F('user__team'),
+        team_name=F('user__team__name'),
+    )
+
+EXPORTS = {
+    'submissions': submission_rows,
+    'solves': solve_rows,
+}
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Cells spreadsheets would read as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def csv_cell(value):
+    """Player-controlled text (flags, names) is quoted with ' when it could be taken for a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+class Line:
+    """File-like sink for csv.writer that hands back the line it was given."""
+    def write(self, value):
+        return value
+
+def csv_lines(rows):
+    writer = csv.writer(Line())
+    header = None
+    for row in rows:
+        if header is None:
+            header = list(row)
+            yield writer.writerow(header)
+        yield writer.writerow([csv_cell(row[field]) for field in header])
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+def byte_chunks(lines):
+    batch, size = [], 0
+    for line in lines:
+        data = line.encode()
+        batch.append(data)
+        size += len(data)
+        if size >= GZIP_BATCH:
+            yield b''.join(batch)
+            batch, size = [], 0
+    if batch:
+        yield b''.join(batch)
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
+async def async_chunks(chunks, batch=None):
+    """
+    The chunks of export_chunks as an async iterator, `batch` (default ASYNC_BATCH) at a time,
+    so the cursor is read while the response is being sent.
+    """
+    batch = batch or ASYNC_BATCH
+    # Not database_sync_to_async: it closes old connections around every call, which would drop
+    # the server-side cursor with CONN_MAX_AGE = 0. thread_sensitive keeps every read on the
+    # thread that ran the view and opened the cursor.
+    read = sync_to_async(lambda: list(islice(chunks, batch)), thread_sensitive=True)
+    while True:
+        items = await read()
+        for item in items:
+            yield item
+        if len(items) < batch:
+            return
+
+def export_chunks(name, format='csv', gzip=False):
+    """Bytes of the export, chunk by chunk. ValueError on an unknown export or format."""
+    if name not in EXPORTS:
+        raise ValueError(f"Unknown export '{name}', expected one of: {', '.join(EXPORTS)}.")
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format '{format}', expected one of: {', '.join(FORMATS)}.")
+    
+    rows = EXPORTS[name]().iterator(chunk_size=CHUNK_SIZE)
+    lines = csv_lines(rows) if format == 'csv' else ndjson_lines(rows)
+    chunks = byte_chunks(lines)
+    return gzip_chunks(chunks) if gzip else chunks
+
+def export_filename(name, format, gzip=False):
+    return f"{name}.{format}" + ('.gz' if gzip else '')
@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from log.export import EXPORTS, FORMATS, export_chunks
+
+
+class Command(BaseCommand):
+    help = "Stream the submissions log or the solves to a file (or stdout) as CSV or NDJSON, optionally gzipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=list(EXPORTS))
+        parser.add_argument('--format', choices=list(FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help="Compress the output.")
+        parser.add_argument('-o', '--output', help="File to write, stdout when omitted.")
+
+    def handle(self, *args, **options):
+        try:
+            chunks = export_chunks(options['name'], options['format'], options['gzip'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        if options['output']:
+            with open(options['output'], 'wb') as f:
+                written = sum(f.write(chunk) for chunk in chunks)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {written} byte(s) to {options['output']}."))
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
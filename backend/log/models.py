@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class Submission(models.Model):
     """
@@ -10,7 +11,20 @@ class Submission(models.Model):
     flag = models.CharField(max_length=255)
     status = models.CharField(max_length=30, choices=(('correct', 'Correct'), ('incorrect', 'Incorrect')))
     submitted_by = models.ForeignKey('user.User', on_delete=models.CASCADE, related_name='submissions')
-    submittion_time = models.DateTimeField(auto_now_add=True)
+    # The submitter's team when the attempt was made, so filtering by team needs no join
+    team = models.ForeignKey('team.Team', null=True, blank=True, on_delete=models.SET_NULL, related_name='submissions')
+    # Set when the attempt is made, not when a buffered row reaches the database (see log.buffer)
+    submittion_time = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        # The submissions log pages newest first, optionally filtered by one of these
+        indexes = [
+            models.Index(fields=['-submittion_time', '-id'], name='submission_time_idx'),
+            models.Index(fields=['challenge', '-submittion_time', '-id'], name='submission_challenge_time_idx'),
+            models.Index(fields=['submitted_by', '-submittion_time', '-id'], name='submission_user_time_idx'),
+            models.Index(fields=['team', '-submittion_time', '-id'], name='submission_team_time_idx'),
+            models.Index(fields=['status', '-submittion_time', '-id'], name='submission_status_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.submitted_by} - {self.challenge} - {self.status} at {self.submission_time}"
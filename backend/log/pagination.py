@@ -0,0 +1,53 @@
+import base64
+import json
+
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Submission
+
+'''
+Keyset pagination over the submissions log, newest first (submittion_time DESC, id DESC).
+A cursor is the (submittion_time, id) key of the last row already sent, so a page deep
+into millions of rows is still an index range scan.
+'''
+
+ROW_FIELDS = {
+    'challenge_name': F('challenge__title'),
+    'username': F('submitted_by__username'),
+    'team_name': F('team__name'),
+}
+
+def encode_cursor(row):
+    payload = [row['submittion_time'].isoformat(), row['id']]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor):
+    """(submittion_time, id) from a cursor, ValueError when it is malformed."""
+    try:
+        submitted_at, submission_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        submitted_at = parse_datetime(submitted_at)
+        if submitted_at is None:
+            raise ValueError
+        return submitted_at, int(submission_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.")
+
+def page(filters, cursor_key, limit):
+    """
+    One page of flat submission rows matching `filters` (a Q), and the cursor of the next page
+    (None on the last one).
+    """
+    submissions = Submission.objects.filter(filters)
+    if cursor_key is not None:
+        submitted_at, submission_id = cursor_key
+        submissions = submissions.filter(Q(submittion_time__lt=submitted_at) | Q(submittion_time=submitted_at, id__lt=submission_id))
+    
+    # One extra row tells whether another page follows
+    rows = list(
+        submissions
+        .order_by('-submittion_time', '-id')
+        .values('id', 'challenge_id', 'submitted_by_id', 'team_id', 'flag', 'status', 'submittion_time', **ROW_FIELDS)[:limit + 1]
+    )
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,87 @@
+from leaderboard.tests.test_setup import TestSetUp
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from log import export
+
+class ExportTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.submit(self.user1_token, self.chall1, 'wrong')
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.submission_buffer.flush()
+    
+    def export(self, name, **params):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.login(self.admin))
+        res = self.client.get(reverse('export_log', kwargs={'name': name}), params)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        return b''.join(res.streaming_content)
+    
+    def test_submissions_as_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('submissions').decode())))
+        self.assertEqual([(row['flag'], row['status'], row['username']) for row in rows], [
+            ('wrong', 'incorrect', 'testuser1'),
+            ('flag{one}', 'correct', 'testuser1'),
+            ('flag{two}', 'correct', 'testuser2'),
+        ])
+    
+    def test_csv_cells_cannot_be_formulas(self):
+        self.submit(self.user1_token, self.chall2, '=HYPERLINK("http://example.com")')
+        self.submit(self.user1_token, self.chall2, '-1+1')
+        self.submission_buffer.flush()
+        flags = [row['flag'] for row in csv.DictReader(io.StringIO(self.export('submissions').decode()))]
+        self.assertEqual(flags[-2:], ['\'=HYPERLINK("http://example.com")', "'-1+1"])
+        
+        rows = [json.loads(line) for line in self.export('submissions', output='ndjson').decode().splitlines()]
+        self.assertEqual(rows[-1]['flag'], '-1+1')
+    
+    def test_solves_as_gzipped_ndjson(self):
+        content = gzip.decompress(self.export('solves', output='ndjson', gzip='1'))
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([(row['challenge_name'], row['team_name']) for row in rows], [('chall1', 'teamone'), ('chall2', 'teamtwo')])
+    
+    def test_unknown_export_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.login(self.admin))
+        self.assertEqual(self.client.get(reverse('export_log', kwargs={'name': 'users'})).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export_log', kwargs={'name': 'solves'}), {'output': 'xml'}).status_code, 400)
+    
+    def test_management_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'solves.csv.gz')
+            call_command('export_log', 'solves', '--gzip', '-o', path, stderr=io.StringIO())
+            with gzip.open(path, 'rt') as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 2)
+    
+    async def test_asgi_response_is_read_while_sent(self):
+        # One line per chunk and per read, to see how far the export got
+        read = []
+        def chunks(*args):
+            for chunk in export.export_chunks(*args):
+                read.append(chunk)
+                yield chunk
+        
+        token = await sync_to_async(self.login)(self.admin)
+        with patch.object(export, 'GZIP_BATCH', 1), patch('log.views.export_chunks', chunks):
+            res = await AsyncClient().get(reverse('export_log', kwargs={'name': 'submissions'}), headers={'Authorization': 'Token ' + token})
+            self.assertEqual(res.status_code, 200)
+            content = res.__aiter__()
+            self.assertEqual(read, [])
+            
+            with patch.object(export, 'ASYNC_BATCH', 1):
+                header = await content.__anext__()
+            self.assertTrue(header.startswith(b'id,'))
+            self.assertLess(len(read), 4)
+            
+            rest = [chunk async for chunk in content]
+        self.assertEqual(len(rest), 3)
+        self.assertEqual([header] + rest, read)
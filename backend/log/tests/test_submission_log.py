@@ -0,0 +1,31 @@
+from leaderboard.tests.test_setup import TestSetUp
+from log.buffer import SubmissionBuffer
+from log.models import Submission
+
+class SubmissionLogTest(TestSetUp):
+    def test_incorrect_attempts_are_buffered_then_bulk_written(self):
+        self.submit(self.user1_token, self.chall1, 'wrong')
+        self.submit(self.user1_token, self.chall1, 'also wrong')
+        self.assertFalse(Submission.objects.exists())
+        
+        # existing challenges, users and teams, one insert
+        with self.assertNumQueries(4):
+            self.assertEqual(self.submission_buffer.flush(), 2)
+        self.assertEqual(list(Submission.objects.order_by('id').values_list('flag', 'status')), [('wrong', 'incorrect'), ('also wrong', 'incorrect')])
+    
+    def test_correct_attempt_is_written_with_the_solve(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.assertEqual(list(Submission.objects.values_list('flag', 'status')), [('flag{one}', 'correct')])
+    
+    def test_full_batch_is_flushed_without_waiting(self):
+        buffer = SubmissionBuffer(flush_ms=0, batch_size=2)
+        for flag in ('one', 'two'):
+            buffer.add(Submission(challenge=self.chall1, submitted_by=self.user1, flag=flag, status='incorrect'))
+        self.assertEqual(Submission.objects.count(), 2)
+    
+    def test_rows_of_deleted_users_are_dropped(self):
+        self.submit(self.user1_token, self.chall1, 'wrong')
+        self.submit(self.user2_token, self.chall1, 'wrong')
+        self.user2.delete()
+        self.assertEqual(self.submission_buffer.flush(), 1)
+        self.assertEqual(Submission.objects.get().submitted_by, self.user1)
@@ -0,0 +1,71 @@
+from leaderboard.tests.test_setup import TestSetUp
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from log.models import Submission
+
+class SubmissionsApiTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.admin_token = self.login(self.admin)
+        start = timezone.now() - timedelta(hours=1)
+        for minute, (user, challenge, status) in enumerate([
+            (self.user1, self.chall1, 'incorrect'),
+            (self.user2, self.chall1, 'incorrect'),
+            (self.user1, self.chall2, 'correct'),
+            (self.user2, self.chall2, 'incorrect'),
+            (self.user3, self.chall1, 'incorrect'),
+        ]):
+            Submission.objects.create(challenge=challenge, submitted_by=user, team=user.team, flag=f'try{minute}', status=status, submittion_time=start + timedelta(minutes=minute))
+        self.start = start
+    
+    def get_log(self, **params):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token)
+        return self.client.get(reverse('submissions'), params)
+    
+    def test_pages_newest_first_with_flat_rows(self):
+        res = self.get_log(limit=2)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([row['flag'] for row in res.json()['results']], ['try4', 'try3'])
+        row = res.json()['results'][1]
+        self.assertEqual((row['challenge_name'], row['username'], row['team_name']), ('chall2', 'testuser2', 'teamtwo'))
+        
+        flags = []
+        cursor = res.json()['next']
+        while cursor:
+            res = self.get_log(limit=2, cursor=cursor)
+            flags += [row['flag'] for row in res.json()['results']]
+            cursor = res.json()['next']
+        self.assertEqual(flags, ['try2', 'try1', 'try0'])
+    
+    def test_filters(self):
+        flags = lambda **params: [row['flag'] for row in self.get_log(**params).json()['results']]
+        self.assertEqual(flags(challenge=self.chall2.id), ['try3', 'try2'])
+        self.assertEqual(flags(user=self.user1.id), ['try2', 'try0'])
+        self.assertEqual(flags(team=self.team2.id), ['try3', 'try1'])
+        self.assertEqual(flags(status='correct'), ['try2'])
+        self.assertEqual(flags(since=(self.start + timedelta(minutes=1)).isoformat(), until=(self.start + timedelta(minutes=3)).isoformat()), ['try2', 'try1'])
+    
+    def test_team_is_the_one_at_submission_time(self):
+        self.submit(self.user1_token, self.chall2, 'wrong')
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submission_buffer.flush()
+        self.user1.team = self.team2
+        self.user1.save()
+        
+        rows = self.get_log(team=self.team1.id).json()['results']
+        self.assertEqual([(row['flag'], row['team_name']) for row in rows], [('flag{one}', 'teamone'), ('wrong', 'teamone'), ('try2', 'teamone'), ('try0', 'teamone')])
+    
+    def test_query_count_does_not_grow_with_rows(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token)
+        # knox token lookup and renewal check, one page query
+        with self.assertNumQueries(3):
+            self.client.get(reverse('submissions'))
+    
+    def test_bad_parameters_are_rejected(self):
+        for params in ({'challenge': 'x'}, {'status': 'maybe'}, {'since': 'yesterday'}, {'cursor': 'nope'}, {'limit': 'all'}):
+            self.assertEqual(self.get_log(**params).status_code, 400, params)
+    
+    def test_players_cannot_read_the_log(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user1_token)
+        self.assertEqual(self.client.get(reverse('submissions')).status_code, 403)
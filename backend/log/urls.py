@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path('submissions/', views.submissions, name='submissions'),
+    # GET streamed CSV/NDJSON dump: submissions | solves
+    path('export/<str:name>/', views.export, name='export_log'),
 ]
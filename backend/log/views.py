@@ -1,19 +1,102 @@
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from rest_framework import status
+from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 
-from .models import Submission
-from .serializers import SubmissionSerlializers
+from .pagination import decode_cursor, page
+from .export import FORMATS, async_chunks, export_chunks, export_filename
 
 ### ==== Authentication & Authorization
 from rest_framework.decorators import authentication_classes, permission_classes
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
+PAGE_DEFAULT_LIMIT = 100
+PAGE_MAX_LIMIT = 500
+
+# query parameter -> lookup, ids unless noted. Each has its (field, time, id) index on Submission.
+ID_FILTERS = {
+    'challenge': 'challenge',
+    'user': 'submitted_by',
+    'team': 'team',
+}
+
+def parse_filters(params):
+    """Q for the filter query parameters, ValueError on a malformed one."""
+    filters = Q()
+    for param, lookup in ID_FILTERS.items():
+        if param in params:
+            try:
+                filters &= Q(**{lookup: int(params[param])})
+            except ValueError:
+                raise ValueError(f"{param} must be an integer.")
+    
+    if 'status' in params:
+        if params['status'] not in ('correct', 'incorrect'):
+            raise ValueError("status must be 'correct' or 'incorrect'.")
+        filters &= Q(status=params['status'])
+    
+    for param, lookup in (('since', 'submittion_time__gte'), ('until', 'submittion_time__lt')):
+        if param in params:
+            value = parse_datetime(params[param])
+            if value is None:
+                raise ValueError(f"{param} must be an ISO 8601 datetime.")
+            filters &= Q(**{lookup: value})
+    return filters
+
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def submissions(request):
-    submissions = Submission.objects.all()
-    serializer = SubmissionSerlializers(submissions, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+    """
+    Submissions log, newest first, as flat rows (ids, names, flag, status, time).
+    ?limit=N[&cursor=...]                    -> {"results": [...], "next": cursor or null}
+    ?challenge=&user=&team=                  -> ids, team is the submitter's team at the time
+    ?status=correct|incorrect
+    ?since=&until=                           -> ISO 8601, since inclusive, until exclusive
+    """
+    try:
+        filters = parse_filters(request.query_params)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        limit = int(request.query_params.get('limit', PAGE_DEFAULT_LIMIT))
+    except ValueError:
+        return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, PAGE_MAX_LIMIT))
+    
+    cursor = request.query_params.get('cursor')
+    try:
+        cursor_key = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    rows, next_cursor = page(filters, cursor_key, limit)
+    return Response({'results': rows, 'next': next_cursor}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def export(request, name):
+    """
+    Full dump of the submissions log (name=submissions) or of the solves (name=solves), streamed.
+    ?output=csv|ndjson (default csv), ?gzip=1 to compress.
+    (not ?format=, DRF reserves it to pick a renderer)
+    """
+    format = request.query_params.get('output', 'csv')
+    gzip = request.query_params.get('gzip') in ('1', 'true')
+    try:
+        chunks = export_chunks(name, format, gzip)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if isinstance(request._request, ASGIRequest):
+        chunks = async_chunks(chunks)
+    
+    response = StreamingHttpResponse(chunks, content_type='application/gzip' if gzip else FORMATS[format])
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(name, format, gzip)}"'
+    return response
@@ -5,8 +5,18 @@ class Team(models.Model):
     name = models.CharField(max_length=50, unique=True)
     institute = models.TextField(max_length=50, null=True)
     token = models.CharField(max_length=100, null=False)
+    
+    # Materialized scoreboard columns, maintained by leaderboard.scoring
     total_point = models.IntegerField(default=0)
+    solve_count = models.IntegerField(default=0)
+    last_solve = models.DateTimeField(null=True, blank=True)
+    
     leader = models.OneToOneField('user.User', on_delete=models.CASCADE, related_name='leader', null=False)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_point', 'last_solve'], name='team_scoreboard_idx'),
+        ]
+    
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
@@ -3,7 +3,8 @@ from .models import Team
 from challenge.models import ChallengeSolve
 from challenge.serializers import ChallengeSolveSerializer
 from user.serializers import UserListSerializer
-from django.db.models import Sum
+from leaderboard.ranking import resolve_rank
+from leaderboard.freeze import frozen_for_serializer, frozen_team_row, total_point_args
 import uuid
 
 class TeamRegistrationSerializer(serializers.ModelSerializer):
@@ -37,58 +38,33 @@ class TeamRegistrationSerializer(serializers.ModelSerializer):
         return team
 
 class TeamListSerializer(serializers.ModelSerializer):
-    solve_count = serializers.SerializerMethodField()
-    total_point = serializers.SerializerMethodField()
     rank = serializers.SerializerMethodField()
     class Meta:
         model = Team
-        fields = ['id', 'name', 'total_point', 'solve_count', 'rank']
+        fields = ['id', 'name', 'total_point', 'solve_count', 'last_solve', 'rank']
+        read_only_fields = ['total_point', 'solve_count', 'last_solve']
     
-    def get_solve_count(self, instance):
-        return ChallengeSolve.objects.filter(user__in=instance.members.all()).count()
-    
-    def get_total_point(self, instance):
-        return (
-            ChallengeSolve.objects
-            .filter(user__in=instance.members.all())
-            .aggregate(total=Sum('challenge__point'))['total'] or 0
-        )
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        frozen = frozen_team_row(self, instance)
+        if frozen:
+            data['total_point'], data['solve_count'] = frozen['total_point'], frozen['solve_count']
+            last_solve = frozen['last_solve']
+            data['last_solve'] = last_solve and self.fields['last_solve'].to_representation(last_solve)
+        return data
     
     def get_rank(self, instance):
-        from django.db.models import Sum
-
-      
-        team_points = []
-        for team in Team.objects.all():
-            total_point = (
-                ChallengeSolve.objects
-                .filter(user__in=team.members.all())
-                .aggregate(total=Sum('challenge__point'))['total'] or 0
-            )
-            team_points.append((team.id, total_point))
-
-      
-        team_points.sort(key=lambda x: x[1], reverse=True)
-
-     
-        sorted_team_ids = [team_id for team_id, _ in team_points]
-
-        try:
-            rank = sorted_team_ids.index(instance.id) + 1  # 1-based index
-        except ValueError:
-            return None
-
-        return rank
+        frozen = frozen_team_row(self, instance)
+        return frozen['rank'] if frozen else resolve_rank(self, instance)
 
 class TeamDetailSerializer(serializers.ModelSerializer):
-    members = UserListSerializer(many=True, read_only=True)
-    solve_count = serializers.SerializerMethodField()
-    total_point = serializers.SerializerMethodField()
+    members = serializers.SerializerMethodField()
     rank = serializers.SerializerMethodField()
     solves = serializers.SerializerMethodField()
     class Meta:
         model = Team
         fields = ['id', 'name', 'institute', 'total_point', 'solve_count', 'rank',  'leader', 'token', 'members', 'solves']
+        read_only_fields = ['total_point', 'solve_count']
     
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -100,47 +76,28 @@ class TeamDetailSerializer(serializers.ModelSerializer):
                 data.pop('token', None)
         else:
             data.pop('token', None)
+        
+        frozen = frozen_team_row(self, instance)
+        if frozen:
+            data['total_point'], data['solve_count'] = frozen['total_point'], frozen['solve_count']
 
         return data
 
-    def get_solve_count(self, instance):
-        return ChallengeSolve.objects.filter(user__in=instance.members.all()).count()
-    
-    def get_total_point(self, instance):
-        return (
-            ChallengeSolve.objects
-            .filter(user__in=instance.members.all())
-            .aggregate(total=Sum('challenge__point'))['total'] or 0
-        )
-    
     def get_rank(self, instance):
-        from django.db.models import Sum
-
-        # Build a list of (team_id, total_point) pairs
-        team_points = []
-        for team in Team.objects.all():
-            total_point = (
-                ChallengeSolve.objects
-                .filter(user__in=team.members.all())
-                .aggregate(total=Sum('challenge__point'))['total'] or 0
-            )
-            team_points.append((team.id, total_point))
-
-        # Sort the list by total_point descending
-        team_points.sort(key=lambda x: x[1], reverse=True)
-
-        # Extract the ordered team IDs
-        sorted_team_ids = [team_id for team_id, _ in team_points]
-
-        try:
-            rank = sorted_team_ids.index(instance.id) + 1  # 1-based index
-        except ValueError:
-            return None
-
-        return rank
+        frozen = frozen_team_row(self, instance)
+        return frozen['rank'] if frozen else resolve_rank(self, instance)
+    
+    def get_members(self, instance):
+        members = instance.members.with_total_point(**total_point_args(frozen_for_serializer(self)))
+        return UserListSerializer(members, many=True).data
     
     def get_solves(self, instance):
-        return ChallengeSolveSerializer(ChallengeSolve.objects.filter(user__in=instance.members.all()), many=True).data
+        # The serializer nests each solve's user, challenge and category
+        solves = ChallengeSolve.objects.filter(user__in=instance.members.all()).select_related('user', 'challenge__category')
+        frozen = frozen_for_serializer(self)
+        if frozen:
+            solves = solves.filter(solved_at__lte=frozen.freeze_time)
+        return ChallengeSolveSerializer(solves, many=True).data
 
 class TeamUpdateSerializer(serializers.ModelSerializer):
     class Meta:
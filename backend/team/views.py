@@ -5,17 +5,19 @@ from rest_framework.decorators import api_view
 ### ==== Models & Serializers
 from .models import Team
 from .serializers import TeamRegistrationSerializer, TeamListSerializer, TeamDetailSerializer, TeamUpdateSerializer
+from leaderboard.scoring import recompute_teams
+from leaderboard.ranking import with_rank
 
 ### ==== Authentication & Authorization
 from rest_framework.decorators import authentication_classes, permission_classes
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 # =====================
 # ==== CREATE TEAM ====
 # =====================
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def create_team(request):
     serializer = TeamRegistrationSerializer(data=request.data, context={'request':request})
@@ -23,6 +25,8 @@ def create_team(request):
         return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
     
     team = serializer.save()
+    # The leader may bring solves from a previous team
+    recompute_teams([team.id])
     
     return Response(TeamRegistrationSerializer(team).data, status=status.HTTP_201_CREATED)
 
@@ -30,12 +34,12 @@ def create_team(request):
 # ====== TEAM LIST =======
 # ========================
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_teams(request):
     try:
-        team = Team.objects.all()
-        serializer = TeamListSerializer(team, many=True)
+        team = with_rank(Team.objects.all())
+        serializer = TeamListSerializer(team, many=True, context={'request':request})
         return Response(serializer.data)
     except Team.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
@@ -44,7 +48,7 @@ def get_all_teams(request):
 # ===== TEAM DETAILS BY ID =====
 # ==============================
 @api_view(['GET', 'PUT'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_update_team(request, pk):
     try:
@@ -70,7 +74,7 @@ def get_update_team(request, pk):
 # ===== MY TEAM DETAILS =====
 # ===========================
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def me(request):
     if request.user.team is None:
@@ -82,7 +86,7 @@ def me(request):
 # ======== JOIN TEAM ========
 # ===========================
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def join_team(request, token):
     if request.user.team is not None:
@@ -95,6 +99,8 @@ def join_team(request, token):
     
     request.user.team = team
     request.user.save()
+    recompute_teams([team.id])
+    team.refresh_from_db()
     
     return Response({"success": "Successfully joining a team", "team": TeamDetailSerializer(team, context={'request':request}).data}, status=status.HTTP_200_OK)
 
@@ -102,22 +108,26 @@ def join_team(request, token):
 # ======== LEAVE TEAM =======
 # ===========================
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def leave_team(request):
     if request.user.team is None:
         return Response({"message": "You haven't joined a team"}, status=status.HTTP_400_BAD_REQUEST)
     
     team = request.user.team
+    team_deleted = False
     if team.leader == request.user:
         new_leader = team.members.exclude(id=request.user.id).first()
         if new_leader is None:
             team.delete()
+            team_deleted = True
         else:
             team.leader = new_leader
             team.save()
 
     request.user.team = None
     request.user.save()
+    if not team_deleted:
+        recompute_teams([team.id])
     return Response({"message": "You have successfully left the team."}, status=status.HTTP_200_OK)
     
\ No newline at end of file
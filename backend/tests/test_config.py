@@ -0,0 +1,111 @@
+import os
+import tempfile
+from datetime import datetime
+from django.test import SimpleTestCase
+from unittest import mock
+import pytz
+import utils
+
+CONFIG = """
+ctf:
+  name: "Test CTF"
+  start_time: "01-06-2025 12:00"
+  end_time: "03-06-2025 12:00"
+  freeze_time: "{freeze}"
+  time_zone: "Asia/Jakarta"
+rate_limit:
+  submit:
+    user: {{ burst: 10, per_minute: 10 }}
+"""
+
+class EventConfigTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'config.yml')
+        self.write(freeze='')
+        for patcher in (mock.patch('utils.CONFIG_PATH', self.path), mock.patch('utils._config', None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def write(self, freeze, mtime=None):
+        with open(self.path, 'w') as f:
+            f.write(CONFIG.format(freeze=freeze))
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+    
+    def test_parses_typed_aware_times(self):
+        config = utils.get_config()
+        self.assertEqual(config.start_time, pytz.timezone('Asia/Jakarta').localize(datetime(2025, 6, 1, 12, 0)))
+        self.assertIsNone(config.freeze_time)
+        self.assertTrue(config.is_started(now=config.start_time))
+        self.assertFalse(config.is_finished(now=config.end_time))
+        self.assertEqual(utils.get_scoring_config(), {})
+        
+        with self.assertRaises(TypeError):
+            config.rate_limit['submit']['user']['burst'] = 1000
+    
+    def test_file_is_parsed_again_only_when_its_mtime_changes(self):
+        self.write(freeze='', mtime=1000)
+        with mock.patch('utils.yaml.safe_load', wraps=utils.yaml.safe_load) as safe_load:
+            first = utils.get_config()
+            self.assertIs(utils.get_config(), first)
+            self.assertEqual(safe_load.call_count, 1)
+            
+            self.write(freeze='02-06-2025 12:00', mtime=2000)
+            self.assertEqual(utils.get_freeze_time().day, 2)
+            self.assertEqual(safe_load.call_count, 2)
+    
+    def test_missing_file(self):
+        os.remove(self.path)
+        self.assertIsNone(utils.get_freeze_time())
+        self.assertEqual(utils.get_rate_limit_config(), {})
+        with self.assertRaises(FileNotFoundError):
+            utils.check_if_ctf_is_started()
+
+class RateLimitValidationTest(SimpleTestCase):
+    def test_valid_sections_pass(self):
+        utils.validate_rate_limit({})
+        utils.validate_rate_limit({'backend': 'memory', 'submit': {'user': {'burst': 10, 'per_minute': 0.5}, 'team': None}})
+    
+    def test_bad_values_are_rejected(self):
+        for section, message in (
+            ({'submit': {'user': {'burst': 10, 'per_minute': 0}}}, "rate_limit.submit.user.per_minute must be a number > 0, got 0."),
+            ({'submit': {'team': {'per_minute': 10}}}, "rate_limit.submit.team.burst must be a number > 0, got None."),
+            ({'submit': {'user': {'burst': 0.5, 'per_minute': 10}}}, "rate_limit.submit.user.burst must be at least 1, got 0.5."),
+            ({'submit': {'user': {'burst': '10', 'per_minute': 10}}}, "rate_limit.submit.user.burst must be a number > 0, got '10'."),
+            ({'submit': {'users': {'burst': 10, 'per_minute': 10}}}, "rate_limit.submit.users is not a bucket, expected one of user, team, challenge."),
+            ({'backend': 'memcached'}, "rate_limit.backend must be one of memory, redis, not 'memcached'."),
+            ({'backend': 'redis'}, "rate_limit.redis_url is required with the redis backend."),
+        ):
+            with self.subTest(section=section), self.assertRaisesMessage(ValueError, message):
+                utils.validate_rate_limit(section)
+    
+    def test_config_with_a_bad_section_is_not_loaded(self):
+        raw = {'ctf': {'start_time': '01-06-2025 12:00', 'end_time': '03-06-2025 12:00', 'time_zone': 'UTC'}, 'rate_limit': {'submit': {'user': {'burst': 10, 'per_minute': 0}}}}
+        with self.assertRaises(ValueError):
+            utils.parse_config(raw)
+
+class ScoringValidationTest(SimpleTestCase):
+    def test_valid_sections_pass(self):
+        utils.validate_scoring({})
+        utils.validate_scoring({'function': 'linear', 'minimum_point': 100, 'decay': 50})
+    
+    def test_names_match_the_scoring_functions(self):
+        from challenge.scoring import SCORING_FUNCTIONS
+        self.assertEqual(set(utils.SCORING_FUNCTIONS), set(SCORING_FUNCTIONS))
+    
+    def test_bad_values_are_rejected(self):
+        for section, message in (
+            ({'function': 'linera'}, "scoring.function must be one of static, linear, logarithmic, not 'linera'."),
+            ({'function': 'linear', 'decay': '50'}, "scoring.decay must be a whole number >= 0, got '50'."),
+            ({'minimum_point': -1}, "scoring.minimum_point must be a whole number >= 0, got -1."),
+            ({'decay': True}, "scoring.decay must be a whole number >= 0, got True."),
+        ):
+            with self.subTest(section=section), self.assertRaisesMessage(ValueError, message):
+                utils.validate_scoring(section)
+    
+    def test_config_with_a_bad_section_is_not_loaded(self):
+        raw = {'ctf': {'start_time': '01-06-2025 12:00', 'end_time': '03-06-2025 12:00', 'time_zone': 'UTC'}, 'scoring': {'function': 'linera'}}
+        with self.assertRaises(ValueError):
+            utils.parse_config(raw)
@@ -1,7 +1,7 @@
 from channels.middleware import BaseMiddleware
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from knox.models import AuthToken
 from django.contrib.auth import get_user_model
 
@@ -25,7 +25,7 @@ class TokenAuthMiddleware(BaseMiddleware):
     def get_user(self, token):
         try:
             
-            auth = TokenAuthentication()
+            auth = CachedTokenAuthentication()
             user, auth_token = auth.authenticate_credentials(token.encode())
             return user
         except Exception:
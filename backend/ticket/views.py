@@ -11,13 +11,13 @@ from datetime import timedelta
 
 ### ==== Authentication & Authorization
 from rest_framework.decorators import authentication_classes, permission_classes
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 User = get_user_model()
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_tickets(request):
     """Get all tickets for the current user"""
@@ -37,7 +37,7 @@ def get_tickets(request):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_ticket(request, ticket_id):
     """Get a specific ticket by ID"""
@@ -55,7 +55,7 @@ def get_ticket(request, ticket_id):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def create_ticket(request):
     """Create a new ticket"""
@@ -117,7 +117,7 @@ def create_ticket(request):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['PUT'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def close_ticket(request, ticket_id):
     """Close a ticket"""
@@ -142,7 +142,7 @@ def close_ticket(request, ticket_id):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_messages(request, ticket_id):
     """Get all messages for a ticket"""
@@ -163,7 +163,7 @@ def get_messages(request, ticket_id):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def create_message(request, ticket_id):
     """Create a new message for a ticket"""
@@ -0,0 +1,144 @@
+import binascii
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from knox.auth import TokenAuthentication
+from knox.crypto import hash_token
+from knox.models import AuthToken
+
+from .models import User
+
+'''
+Knox token authentication with an in-process cache.
+
+knox looks a token up with two queries (the token with its user, then the user's other
+tokens to purge expired ones). The cache maps the token digest to the field values of the
+user and the token for AUTH_TOKEN_CACHE_TTL seconds, never past the token's expiry, and keeps
+at most AUTH_TOKEN_CACHE_SIZE entries (least recently used go first). A hit rebuilds both
+instances without touching the database.
+
+Entries are dropped by user.signals when a token is deleted (login, logout, user delete),
+when a user is saved or deleted (role, team, is_active) and when a team is deleted. Other
+processes only see those changes once their entry expires.
+'''
+
+class TokenCache:
+    def __init__(self, ttl=None, size=None):
+        self.ttl = settings.AUTH_TOKEN_CACHE_TTL if ttl is None else ttl
+        self.size = settings.AUTH_TOKEN_CACHE_SIZE if size is None else size
+        self.lock = threading.Lock()
+        # digest -> (expires_at, db, user values, token values)
+        self.entries = OrderedDict()
+        # user id -> digests, team id -> user ids, to invalidate without scanning
+        self.by_user = {}
+        self.by_team = {}
+        # Bumped by every invalidation, so a lookup that raced one is not cached
+        self.generation = 0
+
+    def get(self, digest):
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._discard(digest)
+                return None
+            self.entries.move_to_end(digest)
+        expires_at, db, user_values, token_values = entry
+        user = User.from_db(db, USER_FIELDS, user_values)
+        auth_token = AuthToken.from_db(db, TOKEN_FIELDS, token_values)
+        auth_token.user = user
+        return user, auth_token
+
+    def set(self, digest, user, auth_token, generation):
+        """generation: the value read before the database lookup that produced user and auth_token."""
+        if not self.ttl or not self.size:
+            return
+        expires_at = time.time() + self.ttl
+        if auth_token.expiry is not None:
+            expires_at = min(expires_at, auth_token.expiry.timestamp())
+        entry = (
+            expires_at,
+            auth_token._state.db,
+            tuple(getattr(user, name) for name in USER_FIELDS),
+            tuple(getattr(auth_token, name) for name in TOKEN_FIELDS),
+        )
+        with self.lock:
+            if generation != self.generation:
+                return
+            self._discard(digest)
+            self.entries[digest] = entry
+            self.by_user.setdefault(user.pk, set()).add(digest)
+            if user.team_id is not None:
+                self.by_team.setdefault(user.team_id, set()).add(user.pk)
+            while len(self.entries) > self.size:
+                self._discard(next(iter(self.entries)))
+
+    def _discard(self, digest):
+        entry = self.entries.pop(digest, None)
+        if entry is None:
+            return
+        user_values = entry[2]
+        user_id, team_id = user_values[USER_PK], user_values[USER_TEAM]
+        digests = self.by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self.by_user[user_id]
+                members = self.by_team.get(team_id)
+                if members is not None:
+                    members.discard(user_id)
+                    if not members:
+                        del self.by_team[team_id]
+
+    def invalidate_token(self, digest):
+        with self.lock:
+            self.generation += 1
+            self._discard(digest)
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            self.generation += 1
+            for digest in list(self.by_user.get(user_id, ())):
+                self._discard(digest)
+
+    def invalidate_team(self, team_id):
+        with self.lock:
+            self.generation += 1
+            for user_id in list(self.by_team.get(team_id, ())):
+                for digest in list(self.by_user.get(user_id, ())):
+                    self._discard(digest)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.by_user.clear()
+            self.by_team.clear()
+
+# Concrete columns, as from_db expects them
+USER_FIELDS = tuple(field.attname for field in User._meta.concrete_fields)
+TOKEN_FIELDS = tuple(field.attname for field in AuthToken._meta.concrete_fields)
+USER_PK = USER_FIELDS.index(User._meta.pk.attname)
+USER_TEAM = USER_FIELDS.index('team_id')
+
+token_cache = TokenCache()
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, token):
+        try:
+            digest = hash_token(token.decode("utf-8"))
+        except (TypeError, binascii.Error, UnicodeDecodeError):
+            # Malformed, let knox reject it
+            return super().authenticate_credentials(token)
+
+        cached = token_cache.get(digest)
+        if cached is not None:
+            return cached
+
+        generation = token_cache.generation
+        user, auth_token = super().authenticate_credentials(token)
+        token_cache.set(digest, user, auth_token, generation)
+        return user, auth_token
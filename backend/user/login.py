@@ -0,0 +1,106 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher
+
+'''
+Password verification for login, off the request threads.
+
+Hashing a password costs hundreds of ms of CPU with the default hasher, so when every player
+logs in at the start of the event, doing it on daphne's threads starves every other request.
+LoginPool runs the verification in LOGIN_WORKERS processes, in the order logins arrive. At most
+LOGIN_MAX_PENDING verifications are queued or running; past that a login is refused right away
+and told when to retry, from the average verification time and the queue length.
+LOGIN_WORKERS = 0 verifies on the request thread, without a limit.
+'''
+
+class LoginBusy(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Login queue is full, retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+def _init_worker():
+    # Spawned workers (no fork) start without Django configured, the hashers need the settings
+    django.setup()
+
+def verify(password, encoded):
+    """(valid, must_update) for password against the stored hash, run in a pool worker."""
+    if not check_password(password, encoded):
+        return False, False
+    return True, identify_hasher(encoded).must_update(encoded)
+
+def timed_verify(password, encoded):
+    start = time.perf_counter()
+    return verify(password, encoded), time.perf_counter() - start
+
+class LoginPool:
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = settings.LOGIN_WORKERS if workers is None else workers
+        self.max_pending = settings.LOGIN_MAX_PENDING if max_pending is None else max_pending
+        self.lock = threading.Lock()
+        self.pending = 0
+        # Moving average of one verification in a worker, seconds; seeded so the first Retry-After is sane
+        self.average = 0.25
+        self.executor = None
+        self.pid = os.getpid()
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            return self.executor
+
+    def retry_after(self):
+        """Seconds until the current queue has drained, rounded up."""
+        return max(1, math.ceil(self.pending / max(self.workers, 1) * self.average))
+
+    def admit(self):
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked process: the parent's workers and queue are not ours
+                self.executor, self.pending, self.pid = None, 0, os.getpid()
+            if self.pending >= self.max_pending:
+                raise LoginBusy(self.retry_after())
+            self.pending += 1
+
+    def release(self, elapsed=None):
+        with self.lock:
+            self.pending -= 1
+            if elapsed is not None:
+                self.average += (elapsed - self.average) * 0.1
+
+    def verify(self, password, encoded):
+        """(valid, must_update); raises LoginBusy without queueing when the pool is saturated."""
+        if not self.workers:
+            return verify(password, encoded)
+        self.admit()
+        executor = None
+        try:
+            executor = self.get_executor()
+            result, elapsed = executor.submit(timed_verify, password, encoded).result()
+        except BrokenProcessPool:
+            # A worker died, start a new pool for the next logins and answer this one here
+            with self.lock:
+                if self.executor is executor:
+                    self.executor = None
+            self.release()
+            return verify(password, encoded)
+        except BaseException:
+            self.release()
+            raise
+        self.release(elapsed)
+        return result
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown()
+
+login_pool = LoginPool()
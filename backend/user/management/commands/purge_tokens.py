@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from user.tokens import PURGE_BATCH_SIZE, purge_expired_tokens, token_stats
+
+
+class Command(BaseCommand):
+    help = "Delete expired knox auth tokens in bounded batches. Meant to be run periodically, e.g. from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE, help="Tokens examined per batch.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument('--stats', action='store_true', help="Report the table size and token lookup latency before and after.")
+
+    def report(self, label):
+        count, latency = token_stats()
+        latency = "n/a" if latency is None else f"{latency:.3f} ms"
+        self.stdout.write(f"{label}: {count} token(s), lookup {latency}")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.report("Before")
+        deleted, batches = purge_expired_tokens(options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired token(s) in {batches} batch(es)."))
+        if options['stats']:
+            self.report("After")
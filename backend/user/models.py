@@ -1,8 +1,38 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.contrib.auth.models import AbstractUser, UserManager
 
 from team.models import Team
 
+class UserQuerySet(models.QuerySet):
+    def with_total_point(self, until=None, points=None):
+        """
+        Annotate each user's total_point in the same query.
+        A correlated subquery rather than Sum over a join, so it stays correct when the
+        queryset is later filtered through solves (e.g. prefetching Challenge.solved_by).
+        until only counts the solves made by then, points ({challenge id: value}) overrides
+        the challenges' current values: both come from the frozen scoreboard (see
+        leaderboard.freeze.total_point_args).
+        """
+        from challenge.models import ChallengeSolve
+        from challenge.scoring import solve_value
+        
+        solves = ChallengeSolve.objects.filter(user=OuterRef('pk'))
+        if until is not None:
+            solves = solves.filter(solved_at__lte=until)
+        totals = (
+            solves
+            .order_by()
+            .values('user')
+            .annotate(total=Sum(solve_value(points)))
+            .values('total')
+        )
+        return self.annotate(total_point=Coalesce(Subquery(totals), 0))
+
+class UserWithPointsManager(UserManager.from_queryset(UserQuerySet)):
+    pass
+
 class User(AbstractUser):
     username = models.CharField(max_length=100, unique=True)
     password = models.CharField(max_length=100)
@@ -14,6 +44,8 @@ class User(AbstractUser):
     # One-to-many: one team, many users
     team = models.ForeignKey(Team, on_delete=models.SET_NULL, null=True, blank=True, related_name='members')
     
+    objects = UserWithPointsManager()
+    
     # USERNAME_FIELD = 'email' # if we want to login with email and password, use username_field = 'email'
     
     def __str__(self):
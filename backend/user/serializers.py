@@ -25,6 +25,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data)
         return user
 
+def total_point_of(user):
+    # Querysets built with User.objects.with_total_point() already carry it
+    if hasattr(user, 'total_point'):
+        return user.total_point
+    return (
+        ChallengeSolve.objects
+        .filter(user=user)
+        .aggregate(total=Sum('challenge__point'))['total'] or 0
+    )
+
 class UserListSerializer(serializers.ModelSerializer):
     total_point = serializers.SerializerMethodField()
     class Meta:
@@ -32,11 +42,7 @@ class UserListSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'total_point']
         
     def get_total_point(self, instance):
-        return (
-            ChallengeSolve.objects
-            .filter(user=instance)
-            .aggregate(total=Sum('challenge__point'))['total'] or 0
-        )
+        return total_point_of(instance)
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -67,11 +73,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
         return data
     
     def get_total_point(self, instance):
-        return (
-            ChallengeSolve.objects
-            .filter(user=instance)
-            .aggregate(total=Sum('challenge__point'))['total'] or 0
-        )
+        return total_point_of(instance)
 
 class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
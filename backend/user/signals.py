@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from knox.models import AuthToken
+
+from team.models import Team
+from .models import User
+from .authentication import token_cache
+
+# Cached authentications (see user.authentication) carry the user's role, team and is_active.
+# Login deletes the user's old tokens, and deleting a user cascades to its tokens.
+@receiver(post_delete, sender=AuthToken)
+def token_deleted(sender, instance, **kwargs):
+    token_cache.invalidate_token(instance.digest)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
+
+# Members lose the team through an on_delete=SET_NULL update, which sends no User signal
+@receiver(post_delete, sender=Team)
+def team_deleted(sender, instance, **kwargs):
+    token_cache.invalidate_team(instance.pk)
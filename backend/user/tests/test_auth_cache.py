@@ -0,0 +1,71 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.urls import reverse
+from knox.models import AuthToken
+from unittest import mock
+from user.authentication import CachedTokenAuthentication, TokenCache
+
+class AuthTokenCacheTest(TestSetUp):
+    def me(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        # reverse('me') resolves to the team app's route of the same name
+        return self.client.get(reverse('get_all_users') + 'me/')
+    
+    def test_cached_token_needs_no_queries(self):
+        self.authenticate(self.user1_token)
+        with self.assertNumQueries(0):
+            user, auth_token = CachedTokenAuthentication().authenticate_credentials(self.user1_token.encode())
+        self.assertEqual(user, self.user1)
+        self.assertEqual(user.team_id, self.team1.id)
+        self.assertEqual(auth_token.user, user)
+        self.assertEqual(self.me(self.user1_token).json()['username'], 'testuser1')
+    
+    def test_login_revokes_the_cached_token(self):
+        self.assertEqual(self.me(self.user1_token).status_code, 200)
+        new_token = self.login(self.user1)
+        self.assertEqual(self.me(self.user1_token).status_code, 401)
+        self.assertEqual(self.me(new_token).status_code, 200)
+    
+    def test_role_and_team_changes_are_seen(self):
+        self.authenticate(self.user3_token)
+        self.user3.role = 'admin'
+        self.user3.team = self.team1
+        self.user3.save()
+        res = self.me(self.user3_token).json()
+        self.assertEqual(res['role'], 'admin')
+        self.assertEqual(res['team']['id'], self.team1.id)
+    
+    def test_team_delete_drops_its_members(self):
+        self.authenticate(self.user2_token)
+        self.team2.delete()
+        self.assertIsNone(self.me(self.user2_token).json()['team'])
+    
+    def test_deleted_user_is_rejected(self):
+        self.authenticate(self.user3_token)
+        self.user3.delete()
+        self.assertFalse(AuthToken.objects.filter(user_id=self.user3.id).exists())
+        self.assertEqual(self.me(self.user3_token).status_code, 401)
+
+class TokenCacheTest(TestSetUp):
+    def lookup(self, token):
+        return CachedTokenAuthentication().authenticate_credentials(token.encode())
+    
+    def test_entries_expire_after_ttl(self):
+        cache = TokenCache(ttl=60, size=10)
+        with mock.patch('user.authentication.token_cache', cache), mock.patch('user.authentication.time.time', return_value=1000):
+            self.lookup(self.user1_token)
+            with self.assertNumQueries(0):
+                self.lookup(self.user1_token)
+        with mock.patch('user.authentication.token_cache', cache), mock.patch('user.authentication.time.time', return_value=1061):
+            with self.assertNumQueries(2):
+                self.lookup(self.user1_token)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TokenCache(ttl=60, size=2)
+        with mock.patch('user.authentication.token_cache', cache):
+            self.lookup(self.user1_token)
+            self.lookup(self.user2_token)
+            self.lookup(self.user1_token)
+            self.lookup(self.user3_token)
+            self.assertEqual(set(cache.by_user), {self.user1.id, self.user3.id})
+            with self.assertNumQueries(0):
+                self.lookup(self.user1_token)
@@ -0,0 +1,46 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.urls import reverse
+from unittest import mock
+from user.login import LoginBusy, LoginPool
+
+class LoginPoolTest(TestSetUp):
+    def use_pool(self, pool):
+        patcher = mock.patch('user.views.login_pool', pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(pool.shutdown)
+        return pool
+    
+    def post_login(self, password='Password123#!@'):
+        return self.client.post(reverse('login'), {'username': 'testuser1', 'password': password}, format="json")
+    
+    def test_passwords_are_checked_in_the_pool(self):
+        pool = self.use_pool(LoginPool(workers=1, max_pending=4))
+        self.assertEqual(self.post_login().status_code, 200)
+        self.assertEqual(self.post_login('wrong').status_code, 404)
+        self.assertIsNotNone(pool.executor)
+        self.assertEqual(pool.pending, 0)
+    
+    def test_saturated_pool_refuses_without_queueing(self):
+        pool = self.use_pool(LoginPool(workers=2, max_pending=4))
+        pool.pending, pool.average = 4, 1.5
+        res = self.post_login()
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res['Retry-After'], '3')
+        self.assertIsNone(pool.executor)
+        self.assertEqual(pool.pending, 4)
+    
+    def test_admission_is_bounded(self):
+        pool = LoginPool(workers=1, max_pending=2)
+        pool.admit()
+        pool.admit()
+        with self.assertRaises(LoginBusy) as busy:
+            pool.admit()
+        self.assertEqual(busy.exception.retry_after, 1)
+        pool.release(0.5)
+        pool.admit()
+    
+    def test_no_workers_checks_inline(self):
+        pool = self.use_pool(LoginPool(workers=0, max_pending=0))
+        self.assertEqual(self.post_login().status_code, 200)
+        self.assertIsNone(pool.executor)
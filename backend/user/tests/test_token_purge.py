@@ -0,0 +1,31 @@
+from leaderboard.tests.test_setup import TestSetUp
+import io
+from datetime import timedelta
+from django.core.management import call_command
+from knox.models import AuthToken
+from user.tokens import purge_expired_tokens
+
+class TokenPurgeTest(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        # the three logins in TestSetUp are live, add expired ones next to them
+        for user in (self.user1, self.user2, self.user3, self.admin):
+            AuthToken.objects.create(user, expiry=timedelta(hours=-1))
+        AuthToken.objects.create(self.admin, expiry=timedelta(minutes=-5))
+    
+    def test_expired_tokens_are_deleted_in_batches(self):
+        self.assertEqual(purge_expired_tokens(batch_size=2), (5, 4))
+        self.assertEqual(AuthToken.objects.count(), 3)
+        self.assertEqual(self.submit(self.user1_token, self.chall1, 'flag{one}').status_code, 200)
+    
+    def test_nothing_left_to_purge(self):
+        purge_expired_tokens()
+        self.assertEqual(purge_expired_tokens(), (0, 1))
+    
+    def test_command_reports_stats(self):
+        out = io.StringIO()
+        call_command('purge_tokens', '--batch-size', '3', '--stats', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("Before: 8 token(s), lookup "))
+        self.assertEqual(lines[1], "Deleted 5 expired token(s) in 3 batch(es).")
+        self.assertTrue(lines[2].startswith("After: 3 token(s), lookup "))
@@ -0,0 +1,40 @@
+from leaderboard.tests.test_setup import TestSetUp
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from user.models import User
+
+class UserTotalsTest(TestSetUp):
+    def count_queries(self, url, token=None):
+        self.authenticate(token or self.user3_token)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+    
+    def test_annotated_total_matches_solves(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        totals = dict(User.objects.with_total_point().values_list('username', 'total_point'))
+        self.assertEqual(totals['testuser1'], 400)
+        self.assertEqual(totals['testuser2'], 0)
+    
+    def test_challenge_list_queries_do_not_grow_with_solvers(self):
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        before = self.count_queries(reverse('get_all_challenges'))
+        self.submit(self.user2_token, self.chall1, 'flag{one}')
+        self.submit(self.user2_token, self.chall2, 'flag{two}')
+        self.assertEqual(self.count_queries(reverse('get_all_challenges')), before)
+    
+    def test_team_detail_queries_do_not_grow_with_members(self):
+        url = reverse('get_update_team', kwargs={'pk': self.team1.pk})
+        before = self.count_queries(url)
+        User.objects.create_user(username='testuser4', email='testuser4@example.com', password='Password123#!@', team=self.team1)
+        self.assertEqual(self.count_queries(url), before)
+    
+    def test_team_views_queries_do_not_grow_with_solves(self):
+        urls = [reverse('get_update_team', kwargs={'pk': self.team1.pk}), '/teams/me/', reverse('solved_by_team'), reverse('solved_by_me')]
+        self.submit(self.user1_token, self.chall1, 'flag{one}')
+        before = [self.count_queries(url, self.user1_token) for url in urls]
+        self.submit(self.user1_token, self.chall2, 'flag{two}')
+        self.assertEqual([self.count_queries(url, self.user1_token) for url in urls], before)
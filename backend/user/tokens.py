@@ -0,0 +1,49 @@
+import random
+import time
+
+from django.utils import timezone
+from knox.models import AuthToken
+
+'''
+Purging expired knox tokens.
+
+knox only deletes an expired token when it is presented again, or when another token of the
+same user authenticates. The purge walks the table in primary key order, one bounded batch at a
+time, and deletes the expired rows of each batch. knox's table has no index on expiry, the walk
+only needs its primary key.
+'''
+
+PURGE_BATCH_SIZE = 1000
+
+def purge_expired_tokens(batch_size=PURGE_BATCH_SIZE, pause=0, now=None):
+    """Delete every token that expired before now. Returns (deleted, batches)."""
+    now = now or timezone.now()
+    deleted = batches = 0
+    last = ''
+    while True:
+        rows = list(AuthToken.objects.filter(digest__gt=last).order_by('digest').values_list('digest', 'expiry')[:batch_size])
+        if not rows:
+            break
+        batches += 1
+        last = rows[-1][0]
+        expired = [digest for digest, expiry in rows if expiry is not None and expiry < now]
+        if expired:
+            # expiry is checked again in case the token was renewed in between (knox AUTO_REFRESH)
+            deleted += AuthToken.objects.filter(digest__in=expired, expiry__lt=now).delete()[1].get(AuthToken._meta.label, 0)
+        if len(rows) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted, batches
+
+def token_stats(samples=200):
+    """Token count, and the mean time in ms of knox's token_key lookup over sampled tokens."""
+    count = AuthToken.objects.count()
+    keys = list(AuthToken.objects.values_list('token_key', flat=True)[:10000])
+    if not keys:
+        return count, None
+    keys = random.sample(keys, min(samples, len(keys)))
+    start = time.perf_counter()
+    for key in keys:
+        list(AuthToken.objects.filter(token_key=key).select_related('user'))
+    return count, (time.perf_counter() - start) / len(keys) * 1000
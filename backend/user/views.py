@@ -5,11 +5,16 @@ from rest_framework.decorators import api_view
 ### ==== Models & Serializers
 from knox.models import AuthToken
 from .models import User
+from .login import LoginBusy, login_pool
 from .serializers import UserRegistrationSerializer, UserListSerializer, UserDetailSerializer, UserUpdateSerializer, UserSerializer
+from leaderboard.scoring import recompute_teams
+from leaderboard.freeze import frozen_scoreboard_for, total_point_args
+from challenge.scoring import refresh_challenge_value
+from django.db import transaction
 
 ### ==== Authentication & Authorization
 from rest_framework.decorators import authentication_classes, permission_classes
-from knox.auth import TokenAuthentication
+from .authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 
@@ -19,9 +24,20 @@ def login(request):
         return Response({"error":"Please provide username and password."}, status=status.HTTP_400_BAD_REQUEST)
     
     user = User.objects.filter(username=request.data.get('username')).first()
-    if user == None or not user.check_password(request.data.get('password')):
+    if user == None:
         return Response({"error":"Username not found or password is invalid."}, status=status.HTTP_404_NOT_FOUND)
     
+    try:
+        valid, must_update = login_pool.verify(request.data.get('password'), user.password)
+    except LoginBusy as e:
+        return Response({"error": "Too many logins right now, please retry shortly."}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": str(e.retry_after)})
+    if not valid:
+        return Response({"error":"Username not found or password is invalid."}, status=status.HTTP_404_NOT_FOUND)
+    if must_update:
+        # What check_password does on the model when the hasher settings changed
+        user.set_password(request.data.get('password'))
+        user.save(update_fields=['password'])
+    
     
     AuthToken.objects.filter(user=user).delete()
     token_instance, token = AuthToken.objects.create(user)
@@ -39,22 +55,23 @@ def register(request):
     return Response({"success": "User successfully registered.", "user": UserRegistrationSerializer(user).data}, status=status.HTTP_201_CREATED)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_users(request):
     users = User.objects.all()
     if request.user.role == 'admin':
         serializer = UserSerializer(users, many=True)
     else:
-        serializer = UserListSerializer(users, many=True)
+        # While frozen, players only see the points the frozen scoreboard counts
+        serializer = UserListSerializer(users.with_total_point(**total_point_args(frozen_scoreboard_for(request.user))), many=True)
     return Response(serializer.data)
 
 @api_view(['GET', 'PUT', 'DELETE'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_update_delete_user(request, pk):
     try:
-        user = User.objects.get(pk=pk)
+        user = User.objects.with_total_point(**total_point_args(frozen_scoreboard_for(request.user))).get(pk=pk)
     except User.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
     
@@ -91,11 +108,20 @@ def get_update_delete_user(request, pk):
                         status=status.HTTP_403_FORBIDDEN)
         
     if request.method == 'DELETE':
-        user.delete()
+        team_id = user.team_id
+        solved_challenges = list(user.solved_challenges.all())
+        with transaction.atomic():
+            user.delete()
+            if team_id is not None:
+                recompute_teams([team_id])
+            # Losing a solve can raise a dynamic challenge's value again
+            for challenge in solved_challenges:
+                refresh_challenge_value(challenge)
         return Response({"success": "User deleted."},status=status.HTTP_204_NO_CONTENT)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def me(request):
-    return Response(UserDetailSerializer(request.user, context={'request':request}).data, status=status.HTTP_200_OK)
+    user = User.objects.with_total_point(**total_point_args(frozen_scoreboard_for(request.user))).get(pk=request.user.pk)
+    return Response(UserDetailSerializer(user, context={'request':request}).data, status=status.HTTP_200_OK)
@@ -1,33 +1,174 @@
-import yaml
+import os
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, Optional
+
 import pytz
+import yaml
+from django.utils.http import parse_etags, parse_http_date_safe
 
-def check_if_ctf_is_started():
-    with open("config.yml", "r") as f:
-        config = yaml.safe_load(f)
+CONFIG_PATH = "config.yml"
+TIME_FORMAT = "%d-%m-%Y %H:%M"
+RATE_LIMIT_BACKENDS = ('memory', 'redis')
+RATE_LIMIT_BUCKETS = ('user', 'team', 'challenge')
+# Names of challenge.scoring.SCORING_FUNCTIONS
+SCORING_FUNCTIONS = ('static', 'linear', 'logarithmic')
+
+@dataclass(frozen=True)
+class EventConfig:
+    """
+    config.yml, parsed once. Times are aware datetimes in the configured time zone,
+    the optional sections are read-only mappings ({} when absent).
+    """
+    name: str
+    start_time: datetime
+    end_time: datetime
+    freeze_time: Optional[datetime]
+    time_zone: pytz.BaseTzInfo
+    scoring: Mapping = field(default_factory=lambda: MappingProxyType({}))
+    rate_limit: Mapping = field(default_factory=lambda: MappingProxyType({}))
 
-    start_time_str = config['ctf']['start_time']
-    time_zone = config['ctf']['time_zone']
-    time_format = "%d-%m-%Y %H:%M"
+    def is_started(self, now=None):
+        return (now or datetime.now(pytz.utc)) >= self.start_time
 
-    # Parse and localize start and end times
-    tz = pytz.timezone(time_zone)
-    start_time = tz.localize(datetime.strptime(start_time_str, time_format))
+    def is_finished(self, now=None):
+        return (now or datetime.now(pytz.utc)) > self.end_time
+
+def freeze(value):
+    """Read-only copy of nested YAML mappings and lists."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def validate_scoring(section):
+    """Check the `scoring` section, ValueError naming the first bad key."""
+    if not isinstance(section, dict):
+        raise ValueError("scoring must be a mapping.")
+    function = section.get('function', 'static')
+    if function not in SCORING_FUNCTIONS:
+        raise ValueError(f"scoring.function must be one of {', '.join(SCORING_FUNCTIONS)}, not '{function}'.")
+    for key in ('minimum_point', 'decay'):
+        value = section.get(key, 0)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(f"scoring.{key} must be a whole number >= 0, got {value!r}.")
+
+def validate_rate_limit(section):
+    """Check the `rate_limit` section, ValueError naming the first bad key."""
+    if not isinstance(section, dict):
+        raise ValueError("rate_limit must be a mapping.")
+    backend = section.get('backend', 'memory')
+    if backend not in RATE_LIMIT_BACKENDS:
+        raise ValueError(f"rate_limit.backend must be one of {', '.join(RATE_LIMIT_BACKENDS)}, not '{backend}'.")
+    if backend == 'redis' and not isinstance(section.get('redis_url'), str):
+        raise ValueError("rate_limit.redis_url is required with the redis backend.")
+    if not isinstance(section.get('message', ''), str):
+        raise ValueError("rate_limit.message must be a string.")
     
-    now = datetime.now(tz)
-    return now >= start_time
+    submit = section.get('submit') or {}
+    if not isinstance(submit, dict):
+        raise ValueError("rate_limit.submit must be a mapping.")
+    for bucket, limit in submit.items():
+        if bucket not in RATE_LIMIT_BUCKETS:
+            raise ValueError(f"rate_limit.submit.{bucket} is not a bucket, expected one of {', '.join(RATE_LIMIT_BUCKETS)}.")
+        if not limit:
+            # An empty entry disables that limit
+            continue
+        if not isinstance(limit, dict):
+            raise ValueError(f"rate_limit.submit.{bucket} must have burst and per_minute.")
+        for key in ('burst', 'per_minute'):
+            value = limit.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"rate_limit.submit.{bucket}.{key} must be a number > 0, got {value!r}.")
+        # A bucket that never holds a whole token would reject every submission
+        if limit['burst'] < 1:
+            raise ValueError(f"rate_limit.submit.{bucket}.burst must be at least 1, got {limit['burst']!r}.")
+
+def parse_config(raw):
+    """EventConfig from the loaded YAML, ValueError when a section is invalid."""
+    ctf = raw['ctf']
+    scoring = raw.get('scoring') or {}
+    validate_scoring(scoring)
+    rate_limit = raw.get('rate_limit') or {}
+    validate_rate_limit(rate_limit)
+    tz = pytz.timezone(ctf['time_zone'])
+    parse = lambda value: tz.localize(datetime.strptime(value, TIME_FORMAT))
+    return EventConfig(
+        name=ctf.get('name', ''),
+        start_time=parse(ctf['start_time']),
+        end_time=parse(ctf['end_time']),
+        freeze_time=parse(ctf['freeze_time']) if ctf.get('freeze_time') else None,
+        time_zone=tz,
+        scoring=freeze(scoring),
+        rate_limit=freeze(rate_limit),
+    )
+
+# (mtime_ns, EventConfig) of the last parse
+_config = None
+_config_lock = threading.Lock()
+
+def get_config():
+    """
+    The parsed config.yml. Only a stat() per call, the file is parsed again when its mtime changes.
+    FileNotFoundError when there is no config.yml.
+    """
+    global _config
+    mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    cached = _config
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _config_lock:
+        if _config is None or _config[0] != mtime:
+            with open(CONFIG_PATH, "r") as f:
+                _config = (mtime, parse_config(yaml.safe_load(f) or {}))
+        return _config[1]
+
+def check_if_ctf_is_started():
+    return get_config().is_started()
 
 def check_if_ctf_is_finished():
-    with open("config.yml", "r") as f:
-        config = yaml.safe_load(f)
+    return get_config().is_finished()
 
-    end_time_str = config['ctf']['end_time']
-    time_zone = config['ctf']['time_zone']
-    time_format = "%d-%m-%Y %H:%M"
+def get_freeze_time():
+    """Aware datetime at which the public scoreboard freezes, None when no freeze_time is set."""
+    try:
+        return get_config().freeze_time
+    except FileNotFoundError:
+        return None
 
-    # Parse and localize start and end times
-    tz = pytz.timezone(time_zone)
-    end_time = tz.localize(datetime.strptime(end_time_str, time_format))
-    now = datetime.now(tz)
-    
-    return now > end_time
+def get_scoring_config():
+    """The optional `scoring` section of config.yml, {} (static scoring) when absent."""
+    try:
+        return get_config().scoring
+    except FileNotFoundError:
+        return {}
+
+def get_rate_limit_config():
+    """The optional `rate_limit` section of config.yml, {} (no limits) when absent."""
+    try:
+        return get_config().rate_limit
+    except FileNotFoundError:
+        return {}
+
+def etag_matches(request, etag):
+    """True when the request's If-None-Match already names this ETag (or '*')."""
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in etags
+
+def not_modified(request, etag, last_modified=None):
+    """
+    True when the client's copy is current: If-None-Match names this ETag, or, without
+    If-None-Match, If-Modified-Since is not older than last_modified (second precision).
+    """
+    if request.headers.get('If-None-Match'):
+        return etag_matches(request, etag)
+    if last_modified is None:
+        return False
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and int(last_modified.timestamp()) <= since
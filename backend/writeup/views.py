@@ -4,7 +4,7 @@ from rest_framework import status
 
 ### ==== Authentication & Authorization
 from rest_framework.decorators import authentication_classes, permission_classes
-from knox.auth import TokenAuthentication
+from user.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from .models import Writeup
@@ -20,7 +20,7 @@ def get_user_team(user):
 
 # 1. Submit a writeup (auto assign team)
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def submit_writeup(request):
     serializer = WriteupSerializer(data=request.data)
@@ -37,7 +37,7 @@ def submit_writeup(request):
 
 # 2. Get all writeups
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_writeups(request):
     writeups = Writeup.objects.all()
@@ -47,7 +47,7 @@ def get_all_writeups(request):
 
 # 3. Get, update, or delete a writeup by ID
 @api_view(['GET', 'PUT', 'DELETE'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_update_delete_writeup(request, pk):
     writeup = get_object_or_404(Writeup, pk=pk)
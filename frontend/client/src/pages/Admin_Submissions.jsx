@@ -1,75 +1,53 @@
 import React, { useState } from "react";
-import { useQuery } from "@tanstack/react-query";
-import { getAllSubmissions } from "../services/apiCTF";
+import { useInfiniteQuery, useQuery } from "@tanstack/react-query";
+import { getAllSubmissions, getChallenges } from "../services/apiCTF";
 import "../styles/global.css";
 
 const Admin_Submissions = () => {
   const [searchTerm, setSearchTerm] = useState("");
   const [filterStatus, setFilterStatus] = useState("all");
   const [filterChallenge, setFilterChallenge] = useState("all");
-  const [sortBy, setSortBy] = useState("submittion_time");
-  const [sortOrder, setSortOrder] = useState("desc");
 
-  // Fetch all submissions
+  // Status and challenge are filtered by the server, so they cover the whole log
+  const filters = {
+    ...(filterStatus !== "all" && { status: filterStatus }),
+    ...(filterChallenge !== "all" && { challenge: filterChallenge }),
+  };
+
+  // Pages of 500 submissions, newest first, following the server's cursor
   const {
-    data: submissions,
+    data,
     isLoading,
     isError,
     error,
     refetch,
-  } = useQuery({
-    queryKey: ["admin-submissions"],
-    queryFn: getAllSubmissions,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
+    queryKey: ["admin-submissions", filters],
+    queryFn: ({ pageParam }) =>
+      getAllSubmissions({ filters, cursor: pageParam }),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.next,
     staleTime: 2 * 60 * 1000, // 2 minutes
   });
 
-  // Get unique challenges for filter
-  const uniqueChallenges = submissions
-    ? [...new Set(submissions.map((sub) => sub.challenge.title))]
-    : [];
-
-  // Filter and sort submissions
-  const filteredSubmissions =
-    submissions?.filter((submission) => {
-      const matchesSearch =
-        submission.submitted_by?.username
-          ?.toLowerCase()
-          .includes(searchTerm.toLowerCase()) ||
-        submission.challenge?.title
-          ?.toLowerCase()
-          .includes(searchTerm.toLowerCase()) ||
-        submission.flag?.toLowerCase().includes(searchTerm.toLowerCase());
-
-      const matchesStatus =
-        filterStatus === "all" || submission.status === filterStatus;
-      const matchesChallenge =
-        filterChallenge === "all" ||
-        submission.challenge?.title === filterChallenge;
-
-      return matchesSearch && matchesStatus && matchesChallenge;
-    }) || [];
-
-  // Sort submissions
-  const sortedSubmissions = [...filteredSubmissions].sort((a, b) => {
-    let aValue = a[sortBy];
-    let bValue = b[sortBy];
+  const { data: challenges } = useQuery({
+    queryKey: ["admin-challenges"],
+    queryFn: getChallenges,
+  });
 
-    if (sortBy === "submittion_time") {
-      aValue = new Date(aValue);
-      bValue = new Date(bValue);
-    } else if (sortBy === "challenge.point") {
-      aValue = a.challenge?.point || 0;
-      bValue = b.challenge?.point || 0;
-    } else if (sortBy === "challenge.difficulty") {
-      aValue = a.challenge?.difficulty || 0;
-      bValue = b.challenge?.difficulty || 0;
-    }
+  const submissions = data?.pages.flatMap((page) => page.results) || [];
 
-    if (sortOrder === "asc") {
-      return aValue > bValue ? 1 : -1;
-    } else {
-      return aValue < bValue ? 1 : -1;
-    }
+  // The search only looks at the pages loaded so far
+  const searchedSubmissions = submissions.filter((submission) => {
+    const term = searchTerm.toLowerCase();
+    return (
+      submission.submitted_by?.username?.toLowerCase().includes(term) ||
+      submission.challenge?.title?.toLowerCase().includes(term) ||
+      submission.flag?.toLowerCase().includes(term)
+    );
   });
 
   // Format date
@@ -96,33 +74,6 @@ const Admin_Submissions = () => {
     return <span className={`badge ${config.className}`}>{config.text}</span>;
   };
 
-  // Get difficulty badge
-  const getDifficultyBadge = (difficulty) => {
-    const difficultyConfig = {
-      1: { className: "badge-blue", text: "Easy" },
-      2: { className: "badge-purple", text: "Medium" },
-      3: { className: "badge-red", text: "Hard" },
-      4: { className: "badge-red", text: "Expert" },
-      5: { className: "badge-red", text: "Master" },
-    };
-
-    const config = difficultyConfig[difficulty] || {
-      className: "badge",
-      text: `Level ${difficulty}`,
-    };
-
-    return <span className={`badge ${config.className}`}>{config.text}</span>;
-  };
-
-  // Get category badge
-  const getCategoryBadge = (category) => {
-    return (
-      <span className="badge badge-blue">
-        {category?.toUpperCase() || "Unknown"}
-      </span>
-    );
-  };
-
   if (isLoading) {
     return (
       <div className="page-container">
@@ -172,21 +123,23 @@ const Admin_Submissions = () => {
             </div>
             <div className="text-right">
               <div className="text-2xl font-bold text-terminal-green">
-                {sortedSubmissions.length}
+                {searchedSubmissions.length}
+              </div>
+              <div className="text-muted">
+                submissions loaded{hasNextPage && ", more available"}
               </div>
-              <div className="text-muted">submissions found</div>
             </div>
           </div>
 
           {/* Search and Filters */}
-          <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
+          <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
             <div>
               <label className="block text-sm font-medium text-muted mb-2">
                 Search
               </label>
               <input
                 type="text"
-                placeholder="Username, challenge, or flag..."
+                placeholder="Username, challenge, or flag (loaded rows)..."
                 value={searchTerm}
                 onChange={(e) => setSearchTerm(e.target.value)}
                 className="challenge-search-input"
@@ -204,7 +157,6 @@ const Admin_Submissions = () => {
                 <option value="all">All Status</option>
                 <option value="correct">Correct</option>
                 <option value="incorrect">Incorrect</option>
-                <option value="pending">Pending</option>
               </select>
             </div>
             <div>
@@ -217,42 +169,13 @@ const Admin_Submissions = () => {
                 className="challenge-search-input"
               >
                 <option value="all">All Challenges</option>
-                {uniqueChallenges.map((challenge) => (
-                  <option key={challenge} value={challenge}>
-                    {challenge}
+                {challenges?.map?.((challenge) => (
+                  <option key={challenge.id} value={challenge.id}>
+                    {challenge.title}
                   </option>
                 ))}
               </select>
             </div>
-            <div>
-              <label className="block text-sm font-medium text-muted mb-2">
-                Sort By
-              </label>
-              <select
-                value={`${sortBy}-${sortOrder}`}
-                onChange={(e) => {
-                  const [field, order] = e.target.value.split("-");
-                  setSortBy(field);
-                  setSortOrder(order);
-                }}
-                className="challenge-search-input"
-              >
-                <option value="submittion_time-desc">Newest First</option>
-                <option value="submittion_time-asc">Oldest First</option>
-                <option value="challenge.point-desc">
-                  Points (High to Low)
-                </option>
-                <option value="challenge.point-asc">
-                  Points (Low to High)
-                </option>
-                <option value="challenge.difficulty-desc">
-                  Difficulty (High to Low)
-                </option>
-                <option value="challenge.difficulty-asc">
-                  Difficulty (Low to High)
-                </option>
-              </select>
-            </div>
           </div>
         </div>
 
@@ -283,7 +206,7 @@ const Admin_Submissions = () => {
                 </tr>
               </thead>
               <tbody>
-                {sortedSubmissions.map((submission) => (
+                {searchedSubmissions.map((submission) => (
                   <tr
                     key={submission.id}
                     className="border-b border-border-color interactive-row hover:bg-secondary-bg transition-colors duration-200"
@@ -298,17 +221,8 @@ const Admin_Submissions = () => {
                       </div>
                     </td>
                     <td className="p-4">
-                      <div>
-                        <div className="font-bold text-lg mb-2">
-                          {submission.challenge?.title}
-                        </div>
-                        <div className="flex gap-2 mb-2">
-                          {getCategoryBadge(submission.challenge?.category)}
-                          {getDifficultyBadge(submission.challenge?.difficulty)}
-                        </div>
-                        <div className="text-lg font-bold text-terminal-green">
-                          {submission.challenge?.point || 0} points
-                        </div>
+                      <div className="font-bold text-lg">
+                        {submission.challenge?.title}
                       </div>
                     </td>
                     <td className="p-4">
@@ -317,7 +231,7 @@ const Admin_Submissions = () => {
                           {submission.submitted_by?.username}
                         </div>
                         <div className="text-sm text-muted">
-                          {submission.submitted_by?.total_point || 0} pts
+                          {submission.team_name || "No team"}
                         </div>
                       </div>
                     </td>
@@ -344,7 +258,19 @@ const Admin_Submissions = () => {
             </table>
           </div>
 
-          {sortedSubmissions.length === 0 && (
+          {hasNextPage && (
+            <div className="text-center py-6">
+              <button
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+                className="filter-button"
+              >
+                {isFetchingNextPage ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
+
+          {searchedSubmissions.length === 0 && !hasNextPage && (
             <div className="text-center py-12">
               <div className="text-muted text-lg mt-2">
                 No submissions found
@@ -360,25 +286,25 @@ const Admin_Submissions = () => {
         <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
           <div className="card text-center hover:bg-secondary-bg transition-colors duration-200">
             <div className="text-3xl font-bold text-terminal-green mb-2">
-              {submissions?.length || 0}
+              {submissions.length}
             </div>
-            <div className="text-muted">Total Submissions</div>
+            <div className="text-muted">Loaded Submissions</div>
           </div>
           <div className="card text-center hover:bg-secondary-bg transition-colors duration-200">
             <div className="text-3xl font-bold text-accent-blue mb-2">
-              {submissions?.filter((s) => s.status === "correct").length || 0}
+              {submissions.filter((s) => s.status === "correct").length}
             </div>
             <div className="text-muted">Correct</div>
           </div>
           <div className="card text-center hover:bg-secondary-bg transition-colors duration-200">
             <div className="text-3xl font-bold text-accent-red mb-2">
-              {submissions?.filter((s) => s.status === "incorrect").length || 0}
+              {submissions.filter((s) => s.status === "incorrect").length}
             </div>
             <div className="text-muted">Incorrect</div>
           </div>
           <div className="card text-center hover:bg-secondary-bg transition-colors duration-200">
             <div className="text-3xl font-bold text-accent-purple mb-2">
-              {uniqueChallenges.length}
+              {new Set(submissions.map((s) => s.challenge_id)).size}
             </div>
             <div className="text-muted">Challenges</div>
           </div>
@@ -37,10 +37,21 @@ export async function getAllUsers(data) {
   }
 }
 
-export async function getAllSubmissions(data) {
+export async function getAllSubmissions({ filters = {}, cursor } = {}) {
   try {
-    const response = await api.get("/api/logs/submissions/");
-    return response.data;
+    // One page of flat rows, newest first, filtered on the server; next is the cursor of the
+    // following page (null on the last one). Rows are shaped like the nested rows the page renders
+    const response = await api.get("/api/logs/submissions/", {
+      params: { ...filters, limit: 500, ...(cursor ? { cursor } : {}) },
+    });
+    return {
+      next: response.data.next,
+      results: response.data.results.map((row) => ({
+        ...row,
+        challenge: { id: row.challenge_id, title: row.challenge_name },
+        submitted_by: { id: row.submitted_by_id, username: row.username },
+      })),
+    };
   } catch (err) {
     throw new Error(err);
   }